@@ -0,0 +1,428 @@
+import argparse
+import bisect
+import csv
+import itertools
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Optional
+import numpy as np
+import configParser
+import simulation
+from configParser import Settings
+from replay import Replay, summarize
+
+SWEEPS = {  # CLI option -> Settings field
+    "max_speed": "MS",
+    "acceleration": "ACC",
+    "wave_cooldown": "WC",
+    "initial_enemies": "IE",
+}
+
+class IdlePolicy:
+    """Never presses anything, the baseline every other policy should beat
+    """
+    def __init__(
+        self,
+        seed: int
+    ) -> None:
+        """Initiates the IdlePolicy
+
+        Args:
+            seed (int): Seed of the run (unused)
+        """
+
+    def __call__(
+        self,
+        world: simulation.World
+    ) -> int:
+        return 0
+
+class RandomPolicy:
+    """Holds a random direction for a random amount of ticks, like a very confused player
+    """
+    def __init__(
+        self,
+        seed: int,
+        minTicks: int = 4,
+        maxTicks: int = 30
+    ) -> None:
+        """Initiates the RandomPolicy
+
+        Args:
+            seed (int): Seed of the run, the policy gets its own generator from it
+            minTicks (int, optional): Fewest ticks a direction is held. Defaults to 4.
+            maxTicks (int, optional): Most ticks a direction is held. Defaults to 30.
+        """
+        self.rng = random.Random(seed ^ 0x5EED)
+        self.minTicks = minTicks
+        self.maxTicks = maxTicks
+        self.keys = 0
+        self.left = 0
+
+    def __call__(
+        self,
+        world: simulation.World
+    ) -> int:
+        if self.left <= 0:
+            self.keys = simulation.keysFromDirection(self.rng.randint(-1, 1), self.rng.randint(-1, 1))
+            self.left = self.rng.randint(self.minTicks, self.maxTicks)
+        self.left -= 1
+        return self.keys
+
+class FleePolicy:
+    """Runs away from the enemies, weighting close ones much more,
+    while the walls push back so it doesn't get stuck in a corner
+    """
+    def __init__(
+        self,
+        seed: int,
+        wallPush: float = 2.0
+    ) -> None:
+        """Initiates the FleePolicy
+
+        Args:
+            seed (int): Seed of the run (unused, fleeing is deterministic)
+            wallPush (float, optional): Weight of the push away from the walls. Defaults to 2.0.
+        """
+        self.wallPush = wallPush
+
+    def __call__(
+        self,
+        world: simulation.World
+    ) -> int:
+        enemies = world.enemies
+        x, y = world.player.pos
+        away = np.zeros(2)
+        if enemies.count:
+            delta = np.array((x, y)) - enemies.pos[:enemies.count]
+            distance = np.maximum((delta * delta).sum(axis=1), 1.0)
+            away = (delta / distance[:, None]).sum(axis=0)
+            away /= max(np.hypot(*away), 1e-9)
+        # 1 / distance to each wall, so it only matters close to one
+        margin = 50
+        away[0] += self.wallPush * margin * (1 / (x + margin) - 1 / (world.width - x + margin))
+        away[1] += self.wallPush * margin * (1 / (y + margin) - 1 / (world.height - y + margin))
+        # only press a key if that axis matters, so it can still go straight
+        threshold = 0.4 * np.hypot(*away)
+        return simulation.keysFromDirection(
+            int(np.sign(away[0])) if abs(away[0]) > threshold else 0,
+            int(np.sign(away[1])) if abs(away[1]) > threshold else 0
+        )
+
+class ScriptedPolicy:
+    """Plays the keys of a recorded replay, tick by tick, no matter what the enemies do
+    """
+    def __init__(
+        self,
+        seed: int,
+        inputs: list
+    ) -> None:
+        """Initiates the ScriptedPolicy
+
+        Args:
+            seed (int): Seed of the run (unused)
+            inputs (list): [tick, keys, ...] entries, sorted by tick
+        """
+        self.inputs = inputs
+        self.inputTicks = [entry[0] for entry in inputs]
+
+    def __call__(
+        self,
+        world: simulation.World
+    ) -> int:
+        index = bisect.bisect_right(self.inputTicks, world.ticks) - 1
+        return self.inputs[index][1] if index >= 0 else 0
+
+POLICIES = {
+    "idle": IdlePolicy,
+    "random": RandomPolicy,
+    "flee": FleePolicy,
+    "script": ScriptedPolicy,
+}
+
+def runGame(
+    job: dict
+) -> dict:
+    """Plays one game headless and as fast as possible
+
+    Args:
+        job (dict): seed, config (Settings), overrides, order, policy, seconds and optionally script
+
+    Returns:
+        dict: The job's parameters plus survival time, score, waves, peak enemy count and tick costs
+    """
+    config = job["config"].override(**job["overrides"])
+    world = simulation.World(config=config, seed=job["seed"])
+    world.waveOrder = job["order"]
+    player = world.createPlayer()
+    arguments = (job["script"],) if job["policy"] == "script" else ()
+    policy = POLICIES[job["policy"]](job["seed"], *arguments)
+
+    dt = 1 / config.TR
+    maxTicks = int(job["seconds"] * config.TR)
+    durations = []
+    peak = 0
+    clock = time.perf_counter
+    start = clock()
+    while player.active and world.ticks < maxTicks:
+        t0 = clock()
+        world.step(dt, policy(world))
+        durations.append(clock() - t0)
+        if world.enemies.count > peak:
+            peak = world.enemies.count
+    elapsed = clock() - start
+
+    tick = summarize(durations)
+    return {
+        "seed": job["seed"],
+        "overrides": job["overrides"],
+        "order": job["order"],
+        "policy": job["policy"],
+        "survived": player.active,
+        "survivalTime": round(world.time, 3),
+        "score": player.score,
+        "waves": world.waves.waves,
+        "peakEnemies": peak,
+        "ticks": world.ticks,
+        "tickMean": tick["mean"],
+        "tickP95": tick["p95"],
+        "wallTime": elapsed,
+    }
+
+def createJobs(
+    config: Settings,
+    sweep: dict,
+    orders: list,
+    policy: str,
+    runs: int,
+    seed: int = 0,
+    seconds: float = 60.0,
+    script: Optional[list] = None
+) -> list[dict]:
+    """Builds one job for every seed of every combination of the sweep
+
+    Every combination plays the same seeds, so their differences come
+    from the config and not from luckier enemy spawns.
+
+    Args:
+        config (Settings): Base config
+        sweep (dict): Settings field -> list of values to try
+        orders (list): Wave orders to try, None is the normal order
+        policy (str): Key of POLICIES
+        runs (int): Seeds per combination
+        seed (int, optional): First seed. Defaults to 0.
+        seconds (float, optional): Game time a run stops at if the player is still alive. Defaults to 60.0.
+        script (Optional[list], optional): Inputs of the "script" policy. Defaults to None.
+
+    Returns:
+        list[dict]: The jobs for runGame
+    """
+    keys = list(sweep)
+    jobs = []
+    for values in itertools.product(*(sweep[key] for key in keys)):
+        overrides = dict(zip(keys, values))
+        for order in orders:
+            for s in range(seed, seed + runs):
+                jobs.append({
+                    "seed": s,
+                    "config": config,
+                    "overrides": overrides,
+                    "order": order,
+                    "policy": policy,
+                    "seconds": seconds,
+                    "script": script,
+                })
+    return jobs
+
+def runBatch(
+    jobs: list[dict],
+    processes: Optional[int] = None
+) -> list[dict]:
+    """Plays every job, spread over a process pool
+
+    Args:
+        jobs (list[dict]): Jobs from createJobs
+        processes (Optional[int], optional): Worker processes, 1 plays them here. Defaults to every core.
+
+    Returns:
+        list[dict]: Results of runGame, in no particular order
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return [runGame(job) for job in jobs]
+    # a few chunks per worker, so one slow chunk doesn't keep the others waiting
+    chunksize = max(1, len(jobs) // (processes * 8))
+    with Pool(processes) as pool:
+        return list(pool.imap_unordered(runGame, jobs, chunksize))
+
+def groupKey(
+    result: dict
+) -> str:
+    """Gets the label of the combination a result belongs to
+
+    Args:
+        result (dict): Result of runGame
+
+    Returns:
+        str: e.g. "MS=15 WC=5000 order=0,1,2 random"
+    """
+    parts = [f"{key}={value}" for key, value in result["overrides"].items()]
+    if result["order"] is not None:
+        parts.append("order=" + ",".join(map(str, result["order"])))
+    parts.append(result["policy"])
+    return " ".join(parts)
+
+def aggregate(
+    results: list[dict]
+) -> list[dict]:
+    """Combines the runs of every combination
+
+    Args:
+        results (list[dict]): Results of runGame
+
+    Returns:
+        list[dict]: One row per combination, sorted by median survival time (best first)
+    """
+    groups: dict[str, list[dict]] = {}
+    for result in results:
+        groups.setdefault(groupKey(result), []).append(result)
+
+    rows = []
+    for name, runs in groups.items():
+        survival = np.array([run["survivalTime"] for run in runs])
+        score = np.array([run["score"] for run in runs])
+        peak = np.array([run["peakEnemies"] for run in runs])
+        ticks = sum(run["ticks"] for run in runs)
+        rows.append({
+            "group": name,
+            "runs": len(runs),
+            "survivedRate": sum(run["survived"] for run in runs) / len(runs),
+            "survivalMean": float(survival.mean()),
+            "survivalP50": float(np.percentile(survival, 50)),
+            "survivalP95": float(np.percentile(survival, 95)),
+            "scoreMean": float(score.mean()),
+            "scoreP50": float(np.percentile(score, 50)),
+            "scoreMax": float(score.max()),
+            "peakEnemiesMean": float(peak.mean()),
+            "peakEnemiesMax": int(peak.max()),
+            "tickMean": sum(run["tickMean"] * run["ticks"] for run in runs) / max(ticks, 1),
+            "tickP95": float(np.percentile([run["tickP95"] for run in runs], 95)),
+        })
+    rows.sort(key=lambda row: row["survivalP50"], reverse=True)
+    return rows
+
+def formatReport(
+    rows: list[dict]
+) -> str:
+    """Turns the aggregated rows into a table
+
+    Args:
+        rows (list[dict]): Result of aggregate
+
+    Returns:
+        str: Table text
+    """
+    width = max([len(row["group"]) for row in rows] + [5])
+    lines = [f"{'group':<{width}} {'runs':>5} {'alive':>6} {'surv p50':>9} {'surv p95':>9} "
+             f"{'score p50':>11} {'peak':>6} {'tick ms':>8} {'p95 ms':>7}"]
+    for row in rows:
+        lines.append(
+            f"{row['group']:<{width}} {row['runs']:>5} {row['survivedRate']:>6.0%} "
+            f"{row['survivalP50']:>8.1f}s {row['survivalP95']:>8.1f}s {row['scoreP50']:>11.2f} "
+            f"{row['peakEnemiesMax']:>6} {row['tickMean']:>8.3f} {row['tickP95']:>7.3f}"
+        )
+    return "\n".join(lines)
+
+def parseValues(
+    config: Settings,
+    key: str,
+    text: str
+) -> list:
+    """Parses a comma-separated list of values for a Settings field
+
+    Args:
+        config (Settings): Config whose field types are used
+        key (str): Name of the field, e.g. "MS"
+        text (str): e.g. "10,15,20"
+
+    Raises:
+        ValueError: If the field doesn't exist
+
+    Returns:
+        list: The values, converted to the field's type
+    """
+    if key not in config.asDict():
+        raise ValueError(f"Unknown config value {key}")
+    kind = type(getattr(config, key))
+    if kind is bool:
+        return [value.strip().lower() in ("1", "true", "yes") for value in text.split(",")]
+    return [kind(float(value)) if kind is int else kind(value) for value in text.split(",")]
+
+def loadScript(
+    path: str
+) -> list:
+    """Reads the inputs of the "script" policy
+
+    Args:
+        path (str): A replay written by --record, or a JSON list of [tick, keys]
+
+    Returns:
+        list: [tick, keys, ...] entries, sorted by tick
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="UTF-8") as file:
+            return sorted(json.load(file))
+    return Replay.load(path).inputs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays lots of seeded DotEXE games headless and compares configs")
+    parser.add_argument("--runs", type=int, default=100, help="seeds per combination")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--seconds", type=float, default=60.0, help="game time a run ends at if the player survives")
+    parser.add_argument("--policy", choices=POLICIES, default="flee")
+    parser.add_argument("--script", help="replay or JSON [[tick, keys], ...] for --policy script")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes, defaults to every core")
+    parser.add_argument("--config", default=None, help="config file, defaults to " + configParser.CONFIG_PATH)
+    for option, key in SWEEPS.items():
+        parser.add_argument("--" + option.replace("_", "-"), help=f"comma-separated values of {key}")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=A,B",
+                        help="sweep any other config value, e.g. --set EMS=8,10")
+    parser.add_argument("--order", action="append", default=[], metavar="I,J,...",
+                        help="wave order as indices into the wave patterns, can be given more than once")
+    parser.add_argument("--out", help="write the runs and the report as JSON")
+    parser.add_argument("--csv", help="write every run as a CSV row")
+    args = parser.parse_args()
+
+    config = configParser.load(args.config)
+    sweep = {}
+    for option, key in SWEEPS.items():
+        if getattr(args, option):
+            sweep[key] = parseValues(config, key, getattr(args, option))
+    for entry in args.set:
+        key, _, values = entry.partition("=")
+        sweep[key.strip().upper()] = parseValues(config, key.strip().upper(), values)
+    orders = [[int(i) for i in order.split(",")] for order in args.order] or [None]
+    if args.policy == "script" and not args.script:
+        parser.error("--policy script needs --script")
+    script = loadScript(args.script) if args.script else None
+
+    jobs = createJobs(config, sweep, orders, args.policy, args.runs, args.seed, args.seconds, script)
+    start = time.perf_counter()
+    results = runBatch(jobs, args.processes)
+    elapsed = time.perf_counter() - start
+    rows = aggregate(results)
+
+    print(formatReport(rows))
+    print(f"\n{len(results)} runs in {elapsed:.1f} s ({len(results) / elapsed * 60:.0f} runs/min, "
+          f"{sum(r['ticks'] for r in results) / elapsed:.0f} ticks/s) on {args.processes or os.cpu_count()} processes")
+    if args.out:
+        with open(args.out, "w", encoding="UTF-8") as file:
+            json.dump({"report": rows, "runs": results}, file, indent=4)
+    if args.csv:
+        with open(args.csv, "w", encoding="UTF-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
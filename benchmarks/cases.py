@@ -0,0 +1,156 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # has to happen before Qt is imported
+
+import itertools
+import simulation
+from typing import Callable, Optional
+from PyQt5 import QtWidgets
+
+CASES: dict[str, Callable[[], 'Case']] = {}
+WINDOWS: list = []  # every Window built, so their loops can be stopped at the end
+
+class Case:
+    """One prepared benchmark: the function to time and how often
+    """
+    def __init__(
+        self,
+        fn: Callable[[], None],
+        samples: int = 200,
+        reset: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Initiates the Case
+
+        Args:
+            fn (Callable[[], None]): The code being timed, one call per sample
+            samples (int, optional): Amount of timed calls. Defaults to 200.
+            reset (Optional[Callable[[], None]], optional): Called before every sample,
+                outside of the timing. Defaults to None.
+        """
+        self.fn = fn
+        self.samples = samples
+        self.reset = reset
+
+def case(name: str) -> Callable:
+    """Registers a function that prepares a Case under a name
+
+    Args:
+        name (str): Name of the case in the results
+
+    Returns:
+        Callable: Decorator
+    """
+    def register(setup: Callable[[], Case]) -> Callable[[], Case]:
+        CASES[name] = setup
+        return setup
+    return register
+
+_app: Optional[QtWidgets.QApplication] = None
+
+def application() -> QtWidgets.QApplication:
+    """Gets the QApplication, creating it on the first call
+    (and keeping it referenced, Qt dies if it gets collected)"""
+    global _app
+    if _app is None:
+        _app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return _app
+
+def window():
+    """Builds a real Window that ignores the keyboard, with an immortal player
+
+    Returns:
+        main.Window: The window
+    """
+    application()
+    import main
+    form = QtWidgets.QMainWindow()
+    ui = main.Window(form, seed=1, useKeyboard=False)
+    ui.form = form # keep the form alive as long as the window
+    ui.world.player.hp = float("inf")
+    WINDOWS.append(ui)
+    return ui
+
+def shutdown() -> None:
+    """Stops the game loop of every Window built so far
+    """
+    for ui in WINDOWS:
+        ui.loop.stop()
+    WINDOWS.clear()
+
+def world(enemies: int) -> simulation.World:
+    """Builds a headless world with a player in the center and random enemies
+
+    Args:
+        enemies (int): Amount of enemies
+
+    Returns:
+        simulation.World: The world
+    """
+    w = simulation.World(seed=1)
+    w.createPlayer()
+    w.player.hp = float("inf")
+    w.enemies.addMany([(w.rng.randint(0, w.width), w.rng.randint(0, w.height)) for _ in range(enemies)])
+    return w
+
+@case("DynamicPoint.move")
+def dynamicPointMove() -> Case:
+    player = window().player
+    directions = itertools.cycle([(1, 0), (0, 1), (-1, 0), (0, -1)])
+    return Case(lambda: player.move(*next(directions)), samples=2000)
+
+@case("DynamicPoint.addTrajectory")
+def dynamicPointAddTrajectory() -> Case:
+    player = window().player
+    return Case(player.addTrajectory, samples=2000)
+
+for amount in (10, 100, 1000, 10000):
+    @case(f"DPAI.chasePlayer[{amount}]")
+    def dpaiChasePlayer(amount: int = amount) -> Case:
+        ui = window()
+        for _ in range(amount):
+            ui.spawnEnemy("RANDOM", "RANDOM")
+        views = ui.enemies
+
+        def chase() -> None:
+            for view in views:
+                view.chasePlayer()
+        return Case(chase, samples=max(5, 20000 // amount))
+
+    @case(f"EnemyStore.chase[{amount}]")
+    def enemyStoreChase(amount: int = amount) -> Case:
+        w = world(amount)
+        target = w.player.pos
+        return Case(lambda: w.enemies.chase(target[0], target[1]), samples=500)
+
+    @case(f"Player.checkCollisions[{amount}]")
+    def playerCheckCollisions(amount: int = amount) -> Case:
+        w = world(amount)
+        return Case(w.player.checkCollisions, samples=2000)
+
+@case("Window.spawnEnemy+killEnemy")
+def windowSpawnKill() -> Case:
+    ui = window()
+    for _ in range(100):
+        ui.spawnEnemy("RANDOM", "RANDOM") # churn next to an existing horde
+
+    def churn() -> None:
+        ui.spawnEnemy("RANDOM", "RANDOM")
+        ui.killEnemy(ui.enemies[-1])
+    return Case(churn, samples=1000)
+
+for waveType, pattern in enumerate(simulation.WAVE_PATTERNS):
+    @case(f"EnemyWave.{pattern.__name__}[100]")
+    def enemyWave(waveType: int = waveType) -> Case:
+        w = world(0)
+        w.waveType, w.enemyCount = waveType, 100
+
+        def spawn() -> None:
+            w.scheduleWave()
+            w.waveType, w.enemyCount = waveType, 100 # same wave every sample
+            for kind, positions in w.waves.due(float("inf")):
+                if kind == "spawn":
+                    w.spawnEnemies(positions)
+
+        def clear() -> None:
+            for enemy in list(w.enemies):
+                w.removeEnemy(enemy)
+        return Case(spawn, samples=200, reset=clear)
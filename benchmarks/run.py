@@ -0,0 +1,121 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from benchmarks.cases import CASES, Case, shutdown
+
+DEFAULT_THRESHOLD = 0.25    # allowed slowdown against the baseline before we fail
+
+def measure(
+    case: Case,
+    warmup: int = 10
+) -> dict:
+    """Times every call of a case on its own
+
+    Args:
+        case (Case): The prepared case
+        warmup (int, optional): Untimed calls first. Defaults to 10.
+
+    Returns:
+        dict: median, min and mean in microseconds plus the amount of samples
+    """
+    for _ in range(warmup):
+        if case.reset:
+            case.reset()
+        case.fn()
+
+    durations = []
+    for _ in range(case.samples):
+        if case.reset:
+            case.reset()
+        t0 = time.perf_counter()
+        case.fn()
+        durations.append(time.perf_counter() - t0)
+    return {
+        "median": statistics.median(durations) * 1e6,
+        "min": min(durations) * 1e6,
+        "mean": statistics.fmean(durations) * 1e6,
+        "samples": len(durations),
+    }
+
+def run(
+    pattern: str = ""
+) -> dict:
+    """Prepares and measures every case whose name contains the pattern
+
+    Args:
+        pattern (str, optional): Substring filter. Defaults to "" (everything).
+
+    Returns:
+        dict: Case name -> result of measure()
+    """
+    results = {}
+    for name, setup in CASES.items():
+        if pattern not in name:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()): # the game likes to print
+            case = setup()
+            results[name] = measure(case)
+            shutdown()
+        print(f"{name:<40} {results[name]['median']:>12.2f} µs  (min {results[name]['min']:.2f})", file=sys.stderr)
+    return results
+
+def regressions(
+    baseline: dict,
+    results: dict,
+    threshold: float
+) -> list[str]:
+    """Finds every case whose median got slower than the threshold allows
+
+    Args:
+        baseline (dict): Results of an earlier run
+        results (dict): Results of this run
+        threshold (float): Allowed slowdown, 0.25 means 25 %
+
+    Returns:
+        list[str]: One line per regressed case
+    """
+    lines = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        if ratio > 1 + threshold:
+            lines.append(f"{name}: {old['median']:.2f} µs -> {result['median']:.2f} µs ({ratio:.2f}x)")
+    return lines
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks of DotEXE's hot paths")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against results written by --save")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown against the baseline (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    results = run(args.filter)
+
+    if args.save:
+        data = {
+            "meta": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.save, "w", encoding="UTF-8") as file:
+            json.dump(data, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding="UTF-8") as file:
+            baseline = json.load(file)["results"]
+        slower = regressions(baseline, results, args.threshold)
+        for line in slower:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if slower:
+            sys.exit(1)
@@ -1,4 +1,108 @@
+import os
 from configparser import ConfigParser
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional
+
+CONFIG_PATH = "_player.cfg"
+DISPLAY_REFRESH = -1    # TARGET_FPS = display
+
+@dataclass(frozen=True)
+class Settings:
+    """One immutable snapshot of the config file.
+
+    It's loaded once and shared by everything, so spawning an enemy
+    never touches the disk. Values that are derived from other values
+    (like how far a square may move before leaving the arena) are
+    computed once here instead of on every move.
+    """
+    # UI
+    FPSLS: int = 16             # FPS_LABEL_FONT_SIZE
+    FI: int = 0                 # FRAME_INTERVAL, only used without a target frame rate
+    TFPS: int = DISPLAY_REFRESH # TARGET_FPS, 0 for as fast as FRAME_INTERVAL allows
+    RM: str = "items"           # RENDER_MODE: items, batched, raster or opengl
+    PO: bool = False            # PROFILER_OVERLAY
+    QG: bool = True             # QUALITY_GOVERNOR
+    QB: float = 0               # QUALITY_BUDGET in ms, 0 for a whole frame at the target frame rate
+    DR: bool = True             # DIRTY_REGIONS
+    SI: str = "none"            # SCENE_INDEX: bsp or none
+    SB: int = 1000              # STARTUP_BUDGET in ms from launch to the first painted frame, 0 for none
+    # Player
+    MS: int = 15                # MAX_SPEED
+    ACC: float = 1.6            # ACCELERATION
+    FA: float = 0.5             # FRICTION_AMPLIFIER
+    SIZE: int = 6               # SIZE
+    MST: float = 0.01           # MIN_SPEED_THRESHOLD
+    TL: int = 3                 # TRAIL_LENGTH
+    TA: int = 25                # TRAIL_AMOUNT
+    HP: int = 100               # HP
+    MHP: int = 100              # MAX_HP
+    # Input
+    IB: str = "qt"              # BACKEND
+    # Enemy
+    EMS: int = 10               # MAX_SPEED
+    EA: float = 1.2             # ACCELERATION
+    ES: int = 10                # SIZE
+    EPS: int = 256              # POOL_SIZE
+    # Flocking
+    FL: bool = False            # ENABLED
+    FR: int = 40                # RADIUS
+    FS: float = 1.5             # SEPARATION
+    FAL: float = 0.5            # ALIGNMENT
+    FCO: float = 0.3            # COHESION
+    # Game
+    DC: float = 0.25            # DAMAGE_COOLDOWN
+    WC: int = 10000             # WAVE_COOLDOWN
+    IE: int = 1                 # INITIAL_ENEMIES
+    IW: int = 0                 # INITIAL_WAVE
+    TR: int = 50                # TICK_RATE, the player moves once per tick
+    CS: int = 64                # GRID_CELL_SIZE
+    AW: int = 1000              # ARENA_WIDTH
+    AH: int = 640               # ARENA_HEIGHT
+
+    # derived, not read from the file
+    PMAXX: int = field(init=False)  # right-most x of the player
+    PMAXY: int = field(init=False)  # bottom-most y of the player
+    EMAXX: int = field(init=False)  # right-most x of an enemy
+    EMAXY: int = field(init=False)  # bottom-most y of an enemy
+
+    def __post_init__(self) -> None:
+        # frozen dataclasses have to sneak past their own __setattr__
+        object.__setattr__(self, "PMAXX", self.AW - self.SIZE)
+        object.__setattr__(self, "PMAXY", self.AH - self.SIZE)
+        object.__setattr__(self, "EMAXX", self.AW - self.ES)
+        object.__setattr__(self, "EMAXY", self.AH - self.ES)
+
+    def override(self, **values) -> 'Settings':
+        """Gets a copy with some values changed (derived values follow)
+
+        Returns:
+            Settings: The new snapshot
+        """
+        return replace(self, **values)
+
+    def asDict(self) -> dict:
+        """Gets every value that comes from the file
+
+        Returns:
+            dict: Attribute name -> value
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    @classmethod
+    def fromDict(
+        cls,
+        values: dict
+    ) -> 'Settings':
+        """Builds a snapshot from asDict, skipping values that no longer exist
+
+        Args:
+            values (dict): Attribute name -> value
+
+        Returns:
+            Settings: The snapshot
+        """
+        known = {f.name for f in fields(cls) if f.init}
+        return cls(**{name: value for name, value in values.items() if name in known})
 
 class Config(ConfigParser):
     """Loads the config of the configfile
@@ -6,44 +110,114 @@ class Config(ConfigParser):
     Args:
         ConfigParser (_type_): uhh.. it's a Configparser
     """
-    def __init__(self, *types: str) -> None:
+    def __init__(self, path: str = CONFIG_PATH) -> None:
         super().__init__()
-        self.read("_player.cfg")
-        
-        self.configtype = {
-            'UI': self.UI,
-            'PLAYER': self.player,
-            'ENEMY': self.enemy,
-            'GAME': self.game
-        }
-        for t in types:
-            self.configtype[t.upper()]()
-    
-    def UI(self) -> None:
-        self.FPSLS = self.getint("UI", "FPS_LABEL_FONT_SIZE", fallback=16)
-    
-    def player(self) -> None:
-        self.MS = self.getint("Player", "MAX_SPEED", fallback=15)
-        self.ACC = self.getfloat("Player", "ACCELERATION", fallback=1.6)
-        self.FA = self.getfloat("Player", "FRICTION_AMPLIFIER", fallback=0.5)
-        self.SIZE = self.getint("Player", "SIZE", fallback=6)
-        self.MST = self.getfloat("Player", "MIN_SPEED_THRESHOLD", fallback=0.01)
-        self.TL = self.getint("Player", "TRAIL_LENGTH", fallback=3)
-        self.TA = self.getint("Player", "TRAIL_AMOUNT", fallback=25)
-        self.TOUT = self.getfloat("Input", "TIMEOUT", fallback=0.05)
-        self.HP = self.getint("Player", "HP", fallback=100)
-        self.MHP = self.getint("Player", "MAX_HP", fallback=100)
-        
-    def enemy(self) -> None:
-        self.EMS = self.getint("Enemy", "MAX_SPEED", fallback=10)
-        self.EA = self.getfloat("Enemy", "ACCELERATION", fallback=1.2)
-        self.ES = self.getint("Enemy", "SIZE", fallback=10)
-    
-    def game(self) -> None:
-        self.DC = self.getfloat("Game", "DAMAGE_COOLDOWN", fallback=0.25)
-        self.WC = self.getint("Game", "WAVE_COOLDOWN", fallback=10000)
-        self.IE = self.getint("Game", "INITIAL_ENEMIES", fallback=1)
-        self.IW = self.getint("Game", "INITIAL_WAVE", fallback=0)
+        self.read(path)
+
+    def targetFps(self, fallback: int) -> int:
+        """Reads TARGET_FPS, which is a number or "display"
+
+        Args:
+            fallback (int): Value if it's missing
+
+        Returns:
+            int: Frames per second, or DISPLAY_REFRESH
+        """
+        value = self.get("UI", "TARGET_FPS", fallback=None)
+        if value is None:
+            return fallback
+        if value.strip().lower() == "display":
+            return DISPLAY_REFRESH
+        return int(value)
+
+    def settings(self) -> Settings:
+        """Parses every section into one Settings snapshot
+
+        Returns:
+            Settings: The parsed snapshot
+        """
+        defaults = Settings()
+        return Settings(
+            FPSLS=self.getint("UI", "FPS_LABEL_FONT_SIZE", fallback=defaults.FPSLS),
+            FI=self.getint("UI", "FRAME_INTERVAL", fallback=defaults.FI),
+            TFPS=self.targetFps(defaults.TFPS),
+            RM=self.get("UI", "RENDER_MODE", fallback=defaults.RM),
+            PO=self.getboolean("UI", "PROFILER_OVERLAY", fallback=defaults.PO),
+            QG=self.getboolean("UI", "QUALITY_GOVERNOR", fallback=defaults.QG),
+            QB=self.getfloat("UI", "QUALITY_BUDGET", fallback=defaults.QB),
+            DR=self.getboolean("UI", "DIRTY_REGIONS", fallback=defaults.DR),
+            SI=self.get("UI", "SCENE_INDEX", fallback=defaults.SI),
+            SB=self.getint("UI", "STARTUP_BUDGET", fallback=defaults.SB),
+            MS=self.getint("Player", "MAX_SPEED", fallback=defaults.MS),
+            ACC=self.getfloat("Player", "ACCELERATION", fallback=defaults.ACC),
+            FA=self.getfloat("Player", "FRICTION_AMPLIFIER", fallback=defaults.FA),
+            SIZE=self.getint("Player", "SIZE", fallback=defaults.SIZE),
+            MST=self.getfloat("Player", "MIN_SPEED_THRESHOLD", fallback=defaults.MST),
+            TL=self.getint("Player", "TRAIL_LENGTH", fallback=defaults.TL),
+            TA=self.getint("Player", "TRAIL_AMOUNT", fallback=defaults.TA),
+            HP=self.getint("Player", "HP", fallback=defaults.HP),
+            MHP=self.getint("Player", "MAX_HP", fallback=defaults.MHP),
+            IB=self.get("Input", "BACKEND", fallback=defaults.IB),
+            EMS=self.getint("Enemy", "MAX_SPEED", fallback=defaults.EMS),
+            EA=self.getfloat("Enemy", "ACCELERATION", fallback=defaults.EA),
+            ES=self.getint("Enemy", "SIZE", fallback=defaults.ES),
+            EPS=self.getint("Enemy", "POOL_SIZE", fallback=defaults.EPS),
+            FL=self.getboolean("Flocking", "ENABLED", fallback=defaults.FL),
+            FR=self.getint("Flocking", "RADIUS", fallback=defaults.FR),
+            FS=self.getfloat("Flocking", "SEPARATION", fallback=defaults.FS),
+            FAL=self.getfloat("Flocking", "ALIGNMENT", fallback=defaults.FAL),
+            FCO=self.getfloat("Flocking", "COHESION", fallback=defaults.FCO),
+            DC=self.getfloat("Game", "DAMAGE_COOLDOWN", fallback=defaults.DC),
+            WC=self.getint("Game", "WAVE_COOLDOWN", fallback=defaults.WC),
+            IE=self.getint("Game", "INITIAL_ENEMIES", fallback=defaults.IE),
+            IW=self.getint("Game", "INITIAL_WAVE", fallback=defaults.IW),
+            TR=self.getint("Game", "TICK_RATE", fallback=defaults.TR),
+            CS=self.getint("Game", "GRID_CELL_SIZE", fallback=defaults.CS),
+            AW=self.getint("Game", "ARENA_WIDTH", fallback=defaults.AW),
+            AH=self.getint("Game", "ARENA_HEIGHT", fallback=defaults.AH),
+        )
+
+_snapshot: Optional[Settings] = None
+_mtime: Optional[float] = None
+_path: str = CONFIG_PATH
+
+def mtime(path: str) -> Optional[float]:
+    """Gets the modification time of a file, None if it doesn't exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+def load(path: Optional[str] = None) -> Settings:
+    """Gets the shared snapshot, parsing the file only the first time
+    (or when a different file is asked for)
+
+    Args:
+        path (Optional[str], optional): Config file. Defaults to the last one loaded.
+
+    Returns:
+        Settings: The shared snapshot
+    """
+    global _snapshot, _mtime, _path
+    if _snapshot is None or (path is not None and path != _path):
+        _path = path or _path
+        _mtime = mtime(_path)
+        _snapshot = Config(_path).settings()
+    return _snapshot
+
+def reload() -> Optional[Settings]:
+    """Parses the file again if it changed on disk since it was loaded
+
+    Returns:
+        Optional[Settings]: The new snapshot, or None if nothing changed
+    """
+    global _snapshot, _mtime
+    current = mtime(_path)
+    if _snapshot is not None and current == _mtime:
+        return None
+    _mtime = current
+    _snapshot = Config(_path).settings()
+    return _snapshot
 
 if __name__ == "__main__":
-    a = Config()
\ No newline at end of file
+    print(load())
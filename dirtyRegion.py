@@ -0,0 +1,130 @@
+import time
+from PyQt5.QtWidgets import (
+    QGraphicsScene,
+    QGraphicsView
+)
+from PyQt5.QtGui import QRegion
+from PyQt5.QtCore import (
+    QObject,
+    QRectF,
+    Qt
+)
+from models import TrailItem
+
+MAX_RECTS = 8   # more separate rects than this are repainted as the rect around all of them
+
+INDEX_METHODS = {
+    "bsp": QGraphicsScene.BspTreeIndex,
+    "none": QGraphicsScene.NoIndex,
+}
+
+def setIndexMethod(
+    scene: QGraphicsScene,
+    method: str
+) -> None:
+    """Picks how the scene finds the items in an area.
+
+    "bsp" keeps a BSP tree, quick to query but rebalanced whenever an
+    item moves. "none" just looks at every item, which is cheaper when
+    nearly everything moves every tick. Trails already in the scene
+    switch their bounding rect to suit the new index.
+
+    Args:
+        scene (QGraphicsScene): The scene
+        method (str): Key of INDEX_METHODS
+
+    Raises:
+        ValueError: If the method doesn't exist
+    """
+    if method not in INDEX_METHODS:
+        raise ValueError(f"Unknown scene index {method!r}, use one of {', '.join(INDEX_METHODS)}")
+    scene.setItemIndexMethod(INDEX_METHODS[method])
+    for item in scene.items():
+        if isinstance(item, TrailItem):
+            item.setFixedBounds(method == "bsp")
+
+class DirtyRegion(QObject):
+    """Repaints only what changed, with one viewport update per frame.
+
+    The view is switched to NoViewportUpdate, so it ignores changes on
+    its own. When the event loop gets control, the scene reports every
+    rect that changed since the last time in one `changed` signal.
+    Those rects are merged into one region (overlapping enemies of a
+    cluster collapse into few rects) and handed to the viewport at once.
+    """
+    def __init__(
+        self,
+        view: QGraphicsView,
+        countItems: bool = False
+    ) -> None:
+        """Initiates the DirtyRegion and takes over the updates of the view
+
+        Args:
+            view (QGraphicsView): The view to update
+            countItems (bool, optional): Also count the items in the invalidated area,
+                that's a scene query per update. Defaults to False.
+        """
+        super().__init__(view)
+        self.view = view
+        self.countItems = countItems
+        view.setViewportUpdateMode(QGraphicsView.NoViewportUpdate)
+        view.scene().changed.connect(self.onChanged)
+
+        self.updates = 0    # viewport updates sent
+        self.rects = 0      # changed rects reported by the scene
+        self.merged = 0     # rects left after merging
+        self.pixels = 0     # pixels invalidated
+        self.items = 0      # items inside the invalidated area
+        self.since = time.perf_counter()
+
+    def onChanged(
+        self,
+        rects: list[QRectF]
+    ) -> None:
+        """Merges the changed scene rects and updates the viewport once
+
+        Args:
+            rects (list[QRectF]): Changed areas in scene coordinates
+        """
+        if not rects:
+            return
+        self.rects += len(rects)
+        if len(rects) > MAX_RECTS:
+            bounds = rects[0]
+            for rect in rects:
+                bounds = bounds.united(rect)
+            rects = [bounds]
+
+        view = self.view
+        region = QRegion()
+        for rect in rects:
+            region += view.mapFromScene(rect).boundingRect().adjusted(-1, -1, 1, 1) # antialiased edges
+        if region.rectCount() > MAX_RECTS:
+            region = QRegion(region.boundingRect())
+        view.viewport().update(region)
+
+        self.updates += 1
+        for rect in region.rects():
+            self.pixels += rect.width() * rect.height()
+            if self.countItems:
+                self.items += len(view.items(rect, Qt.IntersectsItemBoundingRect))
+        self.merged += region.rectCount()
+
+    def report(self) -> dict:
+        """Gets the averages per update since the last report and starts over
+
+        Returns:
+            dict: updates per second, rects and merged rects, pixels and items per update
+        """
+        now = time.perf_counter()
+        updates = max(self.updates, 1)
+        report = {
+            "updatesPerSecond": self.updates / max(now - self.since, 1e-9),
+            "rects": self.rects / updates,
+            "merged": self.merged / updates,
+            "pixels": self.pixels / updates,
+            "items": self.items / updates if self.countItems else None,
+        }
+        self.updates = self.rects = self.merged = self.pixels = self.items = 0
+        self.since = now
+        return report
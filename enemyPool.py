@@ -0,0 +1,176 @@
+from PyQt5.QtWidgets import QGraphicsScene
+from typing import Callable, Optional
+from configParser import Settings
+from models import DPAI, DynamicPoint
+from simulation import EnemyState, World
+
+PREWARM_STEP = 32   # views built per frame while the pool fills up after the start
+
+class EnemyPool:
+    """Keeps the views of dead enemies around to reuse them for new ones.
+
+    A DPAI comes with a QObject, a rect item and a trail item, and
+    adding or removing items changes the scene's index. Pooled views
+    stay in the scene, hidden, and only get a new body when they're
+    handed out again. So once the pool is big enough, spawning and
+    killing enemies doesn't build or destroy anything.
+    """
+    def __init__(
+        self,
+        scene: QGraphicsScene,
+        world: World,
+        onRemove: Callable[[DPAI], None],
+        size: int = 0
+    ) -> None:
+        """Initiates the EnemyPool
+
+        Args:
+            scene (QGraphicsScene): Scene the views are drawn in
+            world (World): World the enemies live in
+            onRemove (Callable[[DPAI], None]): Connected to removeSelfSignal of every view
+            size (int, optional): Amount of views to build right away. Defaults to 0.
+        """
+        self.scene = scene
+        self.world = world
+        self.onRemove = onRemove
+        self.free: list[DPAI] = []
+        self.created = 0
+        self.inUse = 0
+        self.trailScale = 1.0   # part of TRAIL_AMOUNT the trails keep, see setTrailScale
+
+        self.hits = 0       # acquires served from the pool
+        self.misses = 0     # acquires that had to build a new view
+        self.highWater = 0  # most views in use at once
+        self.prewarm(size)
+
+    def create(self) -> DPAI:
+        """Builds a new, hidden view and adds its items to the scene
+
+        Returns:
+            DPAI: The view
+        """
+        view = DPAI(None, self.scene, None, world=self.world)
+        view.removeSelfSignal.connect(self.onRemove)
+        if self.trailScale != 1.0:
+            view.graphics['trail'].setLength(self.trailLength(view.config))
+        view.unbind()
+        self.scene.addItem(view.graphics['rect'])
+        self.scene.addItem(view.graphics['trail'])
+        self.created += 1
+        return view
+
+    def prewarm(
+        self,
+        size: int,
+        limit: Optional[int] = None
+    ) -> bool:
+        """Builds views until the pool holds at least `size` of them
+
+        Args:
+            size (int): Amount of views
+            limit (Optional[int], optional): Most views to build in this call. Defaults to no limit.
+
+        Returns:
+            bool: True once the pool holds `size` views
+        """
+        target = size if limit is None else min(size, self.created + limit)
+        while self.created < target:
+            self.free.append(self.create())
+        return self.created >= size
+
+    def acquire(
+        self,
+        body: EnemyState,
+        player: Optional[DynamicPoint]
+    ) -> DPAI:
+        """Gets a view for an enemy, reusing a pooled one if possible
+
+        Args:
+            body (EnemyState): The simulated enemy
+            player (Optional[DynamicPoint]): The player it chases
+
+        Returns:
+            DPAI: The visible view
+        """
+        if self.free:
+            view = self.free.pop()
+            self.hits += 1
+        else:
+            view = self.create()
+            self.misses += 1
+        view.player = player
+        view.bind(body)
+
+        self.inUse += 1
+        if self.inUse > self.highWater:
+            self.highWater = self.inUse
+        return view
+
+    def release(
+        self,
+        view: DPAI
+    ) -> None:
+        """Hides a view and puts it back into the pool
+
+        Args:
+            view (DPAI): The view of a removed enemy
+        """
+        view.unbind()
+        view.player = None
+        self.free.append(view)
+        self.inUse -= 1
+
+    def trailLength(
+        self,
+        config: Settings
+    ) -> int:
+        """Gets the length the trails of the views should have
+
+        Args:
+            config (Settings): The config to read TRAIL_AMOUNT from
+
+        Returns:
+            int: Amount of positions, at least 1
+        """
+        return max(1, round(config.TA * self.trailScale))
+
+    def applyConfig(
+        self,
+        config: Settings
+    ) -> None:
+        """Makes the pooled views follow a new config
+
+        Args:
+            config (Settings): The new snapshot
+        """
+        for view in self.free:
+            view.config = config
+            view.graphics['trail'].setLength(self.trailLength(config))
+
+    def setTrailScale(
+        self,
+        scale: float
+    ) -> None:
+        """Shortens or restores the trails of the pooled views
+
+        Args:
+            scale (float): Part of TRAIL_AMOUNT the trails keep
+        """
+        self.trailScale = scale
+        for view in self.free:
+            view.graphics['trail'].setLength(self.trailLength(view.config))
+
+    def stats(self) -> dict:
+        """Gets the numbers of the pool
+
+        Returns:
+            dict: hits, misses, highWater, inUse, free and created
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "highWater": self.highWater,
+            "inUse": self.inUse,
+            "free": len(self.free),
+            "created": self.created,
+        }
@@ -0,0 +1,492 @@
+import numpy as np
+from typing import TYPE_CHECKING, Optional
+import flocking
+from spatialHash import SpatialHash
+
+if TYPE_CHECKING:
+    from configParser import Settings
+    from simulation import Body, World
+
+WANDER = 0.25   # maximum random offset added to each direction component
+FAR_DISTANCE = 300  # enemies further away than this may think less often, see EnemyStore.farEvery
+
+class EnemyState:
+    """A handle to one enemy inside the EnemyStore.
+
+    It looks like a simulation.Body from the outside (pos, speed, size),
+    but the data lives in the store's arrays. The handle stays valid
+    while the enemy moves rows because it looks up its row by ID.
+    """
+    __slots__ = ("store", "id")
+
+    def __init__(
+        self,
+        store: 'EnemyStore',
+        id: int
+    ) -> None:
+        """Initiates the handle
+
+        Args:
+            store (EnemyStore): The store the enemy lives in
+            id (int): Stable ID of the enemy
+        """
+        self.store = store
+        self.id = id
+
+    @property
+    def row(self) -> int:
+        return self.store.index[self.id]
+
+    @property
+    def world(self) -> 'World':
+        return self.store.world
+
+    @property
+    def alive(self) -> bool:
+        return self.id in self.store.index
+
+    @property
+    def pos(self) -> list:
+        return self.store.pos[self.row].tolist()
+
+    @pos.setter
+    def pos(self, value: list) -> None:
+        self.store.pos[self.row] = value
+
+    @property
+    def prevPos(self) -> list:
+        return self.store.prevPos[self.row].tolist()
+
+    @property
+    def speed(self) -> list:
+        return self.store.speed[self.row].tolist()
+
+    @property
+    def size(self) -> int:
+        return int(self.store.size[self.row])
+
+    @property
+    def age(self) -> float:
+        return float(self.store.age[self.row])
+
+    def interpolate(
+        self,
+        alpha: float
+    ) -> tuple:
+        """Gets the position between the last two ticks for rendering
+
+        Args:
+            alpha (float): 0 is the previous tick, 1 the current one
+
+        Returns:
+            tuple: (x, y) position
+        """
+        row = self.row
+        x0, y0 = self.store.prevPos[row]
+        x1, y1 = self.store.pos[row]
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
+
+    def chase(
+        self,
+        target: 'Body'
+    ) -> None:
+        """Moves only this enemy one step towards a target
+
+        Args:
+            target (Body): Usually the player
+        """
+        row = self.row
+        self.store.chase(target.pos[0], target.pos[1], slice(row, row + 1))
+
+class EnemyStore:
+    """All enemies of a World as a struct of arrays.
+
+    Rows 0 to count-1 are alive and packed, so the whole horde is
+    advanced with a handful of NumPy operations. Removing an enemy
+    moves the last row into its place.
+
+    The store also keeps a SpatialHash of its enemies up to date,
+    so collision queries only look at enemies nearby.
+    """
+    def __init__(
+        self,
+        world: 'World',
+        grid: SpatialHash,
+        capacity: int = 64
+    ) -> None:
+        """Initiates the EnemyStore
+
+        Args:
+            world (World): The world, for its config, size and random generator
+            grid (SpatialHash): Broadphase index of the enemies
+            capacity (int, optional): Rows allocated up front. Defaults to 64.
+        """
+        self.world = world
+        self.grid = grid
+        self.applyConfig(world.config)
+
+        self.count = 0
+        self.nextId = 0
+        self.index: dict[int, int] = {}     # id -> row
+        self.farEvery = 1   # far enemies only steer every n-th move of the horde, in between they coast
+        self.moves = 0      # moves of the whole horde so far
+        self.allocate(capacity)
+
+    def applyConfig(
+        self,
+        config: 'Settings'
+    ) -> None:
+        """Takes the enemy values from a config snapshot.
+        Enemies alive now follow the new top speed, and the ones of
+        the default size the new size, within their new bounds.
+
+        Args:
+            config (Settings): The snapshot
+        """
+        oldSize = getattr(self, "defaultSize", None)
+        self.maxSpeed = config.EMS
+        self.acceleration = config.EA
+        self.frictionAmplifier = config.FA
+        self.minimumSpeed = config.MST
+        self.defaultSize = config.ES
+        self.defaultLimit = (config.EMAXX, config.EMAXY)
+        self.flocking = config.FL
+        self.flockingRadius = config.FR
+        self.flockingWeights = (config.FS, config.FAL, config.FCO) # separation, alignment, cohesion
+
+        count = getattr(self, "count", 0)
+        if not count:
+            return
+        size = self.size[:count]
+        limit = self.limit[:count]
+        if oldSize != config.ES:
+            default = size == oldSize
+            size[default] = config.ES
+            limit[default] = self.defaultLimit
+        custom = size != config.ES # spawned with their own size, bounded by the arena
+        limit[custom, 0] = self.world.width - size[custom]
+        limit[custom, 1] = self.world.height - size[custom]
+        for pos in (self.pos[:count], self.prevPos[:count]):
+            np.clip(pos, 0, limit, out=pos)
+        np.clip(self.speed[:count], -self.maxSpeed, self.maxSpeed, out=self.speed[:count])
+        self.reindex()
+
+    def allocate(
+        self,
+        capacity: int
+    ) -> None:
+        """Grows (or creates) the arrays to hold `capacity` enemies
+
+        Args:
+            capacity (int): New amount of rows
+        """
+        def grow(old: Optional[np.ndarray], shape: tuple, dtype) -> np.ndarray:
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.capacity = capacity
+        self.pos = grow(getattr(self, "pos", None), (capacity, 2), np.float64)
+        self.prevPos = grow(getattr(self, "prevPos", None), (capacity, 2), np.float64)
+        self.speed = grow(getattr(self, "speed", None), (capacity, 2), np.float64)
+        self.size = grow(getattr(self, "size", None), (capacity,), np.int32)
+        self.limit = grow(getattr(self, "limit", None), (capacity, 2), np.float64)
+        self.age = grow(getattr(self, "age", None), (capacity,), np.float64)
+        self.ids = grow(getattr(self, "ids", None), (capacity,), np.int64)
+        self.cell = grow(getattr(self, "cell", None), (capacity,), np.int64)
+        self.handles = grow(getattr(self, "handles", None), (capacity,), object)
+
+    def setGrid(
+        self,
+        grid: SpatialHash
+    ) -> None:
+        """Moves every enemy into another grid
+
+        Args:
+            grid (SpatialHash): The new, empty grid
+        """
+        self.grid = grid
+        count = self.count
+        cells = grid.cellKeys(self.pos[:count])
+        self.cell[:count] = cells
+        for id, cell in zip(self.ids[:count].tolist(), cells.tolist()):
+            grid.insert(id, cell)
+
+    def largest(self) -> int:
+        """Gets the size of the biggest enemy alive
+
+        Returns:
+            int: Size in pixels, 0 without enemies
+        """
+        return int(self.size[:self.count].max()) if self.count else 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return iter(self.handles[:self.count].tolist())
+
+    def __contains__(self, enemy: EnemyState) -> bool:
+        return enemy.store is self and enemy.alive
+
+    def add(
+        self,
+        x: float,
+        y: float,
+        size: Optional[int] = None
+    ) -> EnemyState:
+        """Adds one enemy
+
+        Args:
+            x (float): X-Position
+            y (float): Y-Position
+            size (Optional[int], optional): Size of the square. Defaults to the config's enemy size.
+
+        Returns:
+            EnemyState: Handle of the new enemy
+        """
+        return self.addMany([(x, y)], size)[0]
+
+    def addMany(
+        self,
+        positions: list[tuple],
+        size: Optional[int] = None
+    ) -> list[EnemyState]:
+        """Adds a batch of enemies with one copy per array.
+        Enemies bigger than the grid was built for rebuild it first.
+
+        Args:
+            positions (list[tuple]): List of (x, y) positions
+            size (Optional[int], optional): Size of the squares. Defaults to the config's enemy size.
+
+        Returns:
+            list[EnemyState]: Handles of the new enemies, in the same order
+        """
+        amount = len(positions)
+        if amount == 0:
+            return []
+        if size is not None and size > self.grid.maxSize:
+            self.world.rebuildGrid(size) # queries have to widen by the new largest size
+        if self.count + amount > self.capacity:
+            self.allocate(max(self.capacity * 2, self.count + amount))
+
+        start, end = self.count, self.count + amount
+        ids = range(self.nextId, self.nextId + amount)
+        handles = [EnemyState(self, id) for id in ids]
+
+        self.pos[start:end] = positions
+        self.prevPos[start:end] = self.pos[start:end]
+        self.speed[start:end] = 0
+        self.size[start:end] = size or self.defaultSize
+        if size is None:
+            self.limit[start:end] = self.defaultLimit
+        else:
+            self.limit[start:end] = (self.world.width - size, self.world.height - size)
+        self.age[start:end] = 0
+        self.ids[start:end] = ids
+        self.handles[start:end] = handles
+        self.index.update(zip(ids, range(start, end)))
+
+        cells = self.grid.cellKeys(self.pos[start:end])
+        self.cell[start:end] = cells
+        for id, cell in zip(ids, cells.tolist()):
+            self.grid.insert(id, cell)
+
+        self.nextId += amount
+        self.count = end
+        return handles
+
+    def remove(
+        self,
+        enemy: EnemyState
+    ) -> None:
+        """Removes an enemy by moving the last row into its place
+
+        Args:
+            enemy (EnemyState): Handle of the enemy
+        """
+        row = self.index.pop(enemy.id, None)
+        if row is None:
+            return
+        self.grid.remove(enemy.id, int(self.cell[row]))
+
+        last = self.count - 1
+        if row != last:
+            for array in (self.pos, self.prevPos, self.speed, self.size, self.limit, self.age, self.ids, self.cell, self.handles):
+                array[row] = array[last]
+            self.index[int(self.ids[row])] = row
+        self.handles[last] = None
+        self.count = last
+
+    def chase(
+        self,
+        targetX: float,
+        targetY: float,
+        rows: slice = None
+    ) -> None:
+        """Moves every enemy one step towards a target, all at once.
+
+        Same rules as the old per-enemy DPAI.chasePlayer: normalized
+        direction plus wander, acceleration clamped to the max speed,
+        friction when standing on the target, clamped to the arena and rounded.
+        With flocking enabled, moving the whole horde also steers every
+        enemy by its neighbours (see flocking.steering). With `farEvery`
+        above 1, enemies further than FAR_DISTANCE away only steer every
+        n-th move and keep their speed in between, and flocking only runs
+        on those moves.
+
+        Args:
+            targetX (float): X-Position of the target
+            targetY (float): Y-Position of the target
+            rows (slice, optional): Only move these rows. Defaults to every enemy.
+        """
+        if rows is None:
+            rows = slice(0, self.count)
+            self.moves += 1
+        pos = self.pos[rows]
+        speed = self.speed[rows]
+        if len(pos) == 0:
+            return
+
+        delta = np.array((targetX, targetY)) - pos
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        moving = distance > 0
+
+        steering = moving
+        thinking = self.farEvery <= 1 or self.moves % self.farEvery == 0
+        if not thinking:
+            steering = moving & (distance <= FAR_DISTANCE)
+
+        direction = np.zeros_like(delta)
+        np.divide(delta, distance[:, None], out=direction, where=moving[:, None])
+        direction += self.world.npRng.uniform(-WANDER, WANDER, size=direction.shape) * moving[:, None]
+        if self.flocking and thinking and rows == slice(0, self.count):
+            direction += flocking.steering(
+                pos, speed, self.world.width, self.world.height, self.flockingRadius, *self.flockingWeights
+            ) * moving[:, None]
+
+        np.clip(speed + direction * self.acceleration, -self.maxSpeed, self.maxSpeed, out=speed, where=steering[:, None])
+
+        standing = ~moving
+        if standing.any():
+            still = speed[standing]
+            still -= np.sign(still) * self.frictionAmplifier
+            still[np.abs(still) < self.minimumSpeed] = 0
+            speed[standing] = still
+
+        np.clip(pos + speed, 0, self.limit[rows], out=pos)
+        np.round(pos, out=pos)
+        self.reindex(rows)
+
+    def reindex(
+        self,
+        rows: slice = None
+    ) -> None:
+        """Moves enemies that changed cells to their new bucket.
+        Only those rows touch the hash, everyone else is just compared.
+
+        Args:
+            rows (slice, optional): Rows that may have moved. Defaults to every enemy.
+        """
+        if rows is None:
+            rows = slice(0, self.count)
+        offset = rows.start or 0
+        old = self.cell[rows]
+        new = self.grid.cellKeys(self.pos[rows])
+        changed = np.flatnonzero(old != new)
+        if len(changed) == 0:
+            return
+
+        grid = self.grid
+        ids = self.ids[rows][changed].tolist()
+        for id, oldCell, newCell in zip(ids, old[changed].tolist(), new[changed].tolist()):
+            grid.move(id, oldCell, newCell)
+        self.cell[changed + offset] = new[changed]
+
+    def overlapping(
+        self,
+        rows: np.ndarray,
+        x: float,
+        y: float,
+        size: float
+    ) -> np.ndarray:
+        """Exact AABB test of some rows against one box
+
+        Args:
+            rows (np.ndarray): Rows to test
+            x (float): X-Position of the box
+            y (float): Y-Position of the box
+            size (float): Width and height of the box
+
+        Returns:
+            np.ndarray: The rows that overlap
+        """
+        pos = self.pos[rows]
+        sizes = self.size[rows]
+        hit = ((x < pos[:, 0] + sizes) & (x + size > pos[:, 0]) &
+               (y < pos[:, 1] + sizes) & (y + size > pos[:, 1]))
+        return rows[hit]
+
+    def collide(
+        self,
+        body: 'Body'
+    ) -> list[EnemyState]:
+        """Gets every enemy overlapping a body, using the grid as broadphase
+
+        Args:
+            body (Body): Usually the player
+
+        Returns:
+            list[EnemyState]: Overlapping enemies
+        """
+        x, y = body.pos
+        index = self.index
+        rows = np.fromiter(
+            (index[id] for id in self.grid.query(x, y, x + body.size, y + body.size)),
+            dtype=np.int64
+        )
+        if len(rows) == 0:
+            return []
+        return self.handles[self.overlapping(rows, x, y, body.size)].tolist()
+
+    def pairs(self) -> list[tuple]:
+        """Gets every pair of enemies overlapping each other
+
+        Returns:
+            list[tuple]: (EnemyState, EnemyState) pairs
+        """
+        index = self.index
+        pairs = []
+        for bucket, neighbours in self.grid.neighbourCells():
+            own = np.fromiter((index[id] for id in bucket), dtype=np.int64)
+            others = np.fromiter((index[id] for other in neighbours for id in other), dtype=np.int64)
+            for i, row in enumerate(own.tolist()):
+                # later rows of the own cell plus all neighbouring cells
+                rows = np.concatenate((own[i + 1:], others))
+                if len(rows) == 0:
+                    continue
+                x, y = self.pos[row]
+                for hit in self.overlapping(rows, x, y, self.size[row]).tolist():
+                    pairs.append((self.handles[row], self.handles[hit]))
+        return pairs
+
+    def advanceAge(
+        self,
+        dt: float,
+        lifetime: float
+    ) -> list[EnemyState]:
+        """Ages every enemy and removes those that lived too long
+
+        Args:
+            dt (float): Seconds to add
+            lifetime (float): Seconds an enemy may live
+
+        Returns:
+            list[EnemyState]: Handles of the removed enemies
+        """
+        self.age[:self.count] += dt
+        expired = self.handles[:self.count][self.age[:self.count] >= lifetime].tolist()
+        for enemy in expired:
+            self.remove(enemy)
+        return expired
@@ -1,167 +1,79 @@
-import time
-import random
-import utils
-from PyQt5.QtCore import (
-    QThread,
-    pyqtSignal
+import simulation
+from PyQt5.QtWidgets import (
+    QGraphicsEllipseItem,
+    QGraphicsScene
 )
-from PyQt5.QtWidgets import QGraphicsEllipseItem
 from PyQt5.QtGui import (
-    QBrush, 
+    QBrush,
     QColor
 )
-from configParser import Config
-from typing import TYPE_CHECKING
+from waveScheduler import WaveScheduler
 
-if TYPE_CHECKING:
-    from main import Window
+class WaveWarnings:
+    """Draws the circles that warn the player of where enemies are going to be spawned at.
 
-class EnemyWave(QThread):
-    """Defines all the enemy waves in the game
-
-    Args:
-        QThread (QObject): Inherits everything from QThread
+    The waves themselves live on the world's WaveScheduler, this only
+    reacts to its "warning" and "warningDone" events on the GUI thread.
     """
-    spawnedEnemy = pyqtSignal(int, int) # (x, y)
-    spawnCircle = pyqtSignal(object) # circle object
-    removeCircle = pyqtSignal(object) # circle object
-    
     def __init__(
-        self, 
-        window: 'Window', 
-        waveType: int, 
-        enemyCount: int
+        self,
+        scene: QGraphicsScene,
+        circleSize: int = 200,
+        color: QColor = QColor(255, 0, 0, 100)
     ) -> None:
-        """Initializes the enemy waves
+        """Initiates the WaveWarnings
 
         Args:
-            window (Window): The window class, to access GUI elements
-            waveType (int): Type of enemy wave
-            enemyCount (int): Amount of enemies
-        """
-        super().__init__()
-        self.window = window
-        self.waveType = waveType
-        self.enemyCount = enemyCount
-        
-        self.types = [self.corners, self.horizontalLine, self.center, self.top, self.seperate, self.random]
-    
-    def run(self) -> None:
-        """Spawns a specific wave of enemies
+            scene (QGraphicsScene): Scene to draw the circles in
+            circleSize (int, optional): Diameter of a circle. Defaults to 200.
+            color (QColor, optional): Color of the circles. Defaults to QColor(255, 0, 0, 100).
         """
-        print(f"Wave {self.waveType} started")
-        self.types[self.waveType]()
-        self.waveType += 1 # if we do this in the SpawnWave() function, it will increment before the wave spawns
-    
+        self.scene = scene
+        self.circleSize = circleSize
+        self.brush = QBrush(color)
+        self.circles: dict[int, list[QGraphicsEllipseItem]] = {}
+
     def showWarning(
-        self, 
-        xPositions: list[int], 
-        yPositions: list[int]
+        self,
+        wave: int,
+        centers: list[tuple]
     ) -> None:
-        """Shows circles that warn the player of where
-        enemies are going to be spawned at.
+        """Shows the circles of a wave
 
         Args:
-            xPositions (list[int]): Positions on the x-axis
-            yPositions (list[int]): Positions on the y-axis
+            wave (int): ID of the wave from the WaveScheduler
+            centers (list[tuple]): List of (x, y) centers
         """
-        circleSize = 200
+        size = self.circleSize
         circles = []
-        
-        zipped = list(zip(xPositions, yPositions))
-        for tup in zipped:
-            x_pos = round(tup[0])
-            y_pos = round(tup[1])
-            
-            circle = QGraphicsEllipseItem(x_pos - circleSize / 2, y_pos - circleSize / 2, circleSize, circleSize)
-            circle.setBrush(QBrush(QColor(255, 0, 0, 100)))
+        for x, y in centers:
+            circle = QGraphicsEllipseItem(round(x) - size / 2, round(y) - size / 2, size, size)
+            circle.setBrush(self.brush)
+            self.scene.addItem(circle)
             circles.append(circle)
-            self.spawnCircle.emit(circle)
-        
-        time.sleep(1.5)
-        for circle in circles:
-            self.removeCircle.emit(circle)
-    
-    def corners(self) -> None:
-        """Spawns enemies in the corners.
-        """
-        x = [0, self.window.scene.width()] * 2
-        y = [0, self.window.scene.height(), self.window.scene.height(), 0]
-        self.showWarning(x, y)
-        
-        for i in range(self.enemyCount):
-            x_pos = round(x[i % len(x)])
-            y_pos = round(y[i % len(y)]) # fuck floats
-            print(f"Spawning enemy at ({x_pos}, {y_pos})")
-            self.spawnedEnemy.emit(x_pos, y_pos)
-            time.sleep(0.25)
-    
-    def horizontalLine(self) -> None:
-        """Spawns enemies in a horizontal line in the middle of the screen
-        """
-        sceneWidth = self.window.scene.width()
-        y = self.window.scene.height() / 2
-        spacing = sceneWidth / (self.enemyCount + 1)
-        
-        xList = [(i + 1) * spacing for i in range(self.enemyCount)]
-        yList = [y] * self.enemyCount
-        
-        self.showWarning(xList, yList)
-        
-        for x in xList:
-            self.spawnedEnemy.emit(int(x), int(y))
-            time.sleep(0.15)
-    
-    def center(self) -> None:
-        """Spawns enemies in the center of the screen
-        """
-        x = [int(self.window.scene.width() / 2)]
-        y = [int(self.window.scene.height() / 2)]
-        self.showWarning(x, y)
-        
-        for _ in range(self.enemyCount):
-            xPos = random.randint(x[0] - 100, x[0] + 100)
-            yPos = random.randint(y[0] - 100, y[0] + 100)
-            self.spawnedEnemy.emit(int(xPos), int(yPos))
-            time.sleep(0.5)
-    
-    def top(self) -> None:
-        """Spawns enemies at the top of the screen in a
-        horizontal line
+        self.circles[wave] = circles
+
+    def removeWarning(
+        self,
+        wave: int
+    ) -> None:
+        """Removes the circles of a wave
+
+        Args:
+            wave (int): ID of the wave from the WaveScheduler
         """
-        sceneWidth = self.window.scene.width()
-        y = 0
-        spacing = sceneWidth / (self.enemyCount + 1)
-        
-        xList = [(i + 1) * spacing for i in range(self.enemyCount)]
-        yList = [y] * self.enemyCount
-        
-        self.showWarning(xList, yList)
-        
-        for x in xList:
-            self.spawnedEnemy.emit(int(x), int(y))
-            time.sleep(0.15)
-    
-    def seperate(self) -> None:
-        """Spawns enemies in a tilted line from the top to bottom
+        for circle in self.circles.pop(wave, []):
+            self.scene.removeItem(circle)
+
+    def clear(self) -> None:
+        """Removes every circle
         """
-        x = utils.rangespace(self.window.scene.width() / 2 - 100, self.window.scene.width() / 2 + 100, self.enemyCount)
-        y = utils.rangespace(self.window.scene.height(), 0, self.enemyCount)
-        self.showWarning(x, y)
-        
-        for pos in list(zip(x, y)):
-            self.spawnedEnemy.emit(int(pos[0]), int(pos[1]))
-    
-    def random(self) -> None:
-        x = [random.randint(0, int(self.window.scene.width())) for i in range(self.enemyCount)] 
-        y = [random.randint(0, int(self.window.scene.height())) for i in range(self.enemyCount)]
-        
-        self.showWarning(x, y)
-        
-        for pos in list(zip(x, y)):
-            self.spawnedEnemy.emit(int(pos[0]), int(pos[1]))
+        for wave in list(self.circles):
+            self.removeWarning(wave)
 
 if __name__ == "__main__":
-    a = EnemyWave("", 0, 1)
-    
-    a.seperate()
\ No newline at end of file
+    for waveType, pattern in enumerate(simulation.WAVE_PATTERNS):
+        positions = simulation.wavePositions(waveType, 4, 1000, 640, simulation.random.Random(0))
+        timeline = WaveScheduler()
+        timeline.compile(0.0, positions, simulation.waveWarnings(waveType, positions, 1000, 640), simulation.WAVE_DELAYS[waveType])
+        print(pattern.__name__, [(round(time, 2), kind, payload) for time, _, kind, payload in sorted(timeline.entries)])
@@ -0,0 +1,202 @@
+from typing import Any, Iterator, Optional
+
+PLAYER = "player"
+ENEMY = "enemy"
+
+class EntityView:
+    """All entities of one kind, straight from the registry without copying.
+    Iterating it is safe while entities spawn or die, see EntityRegistry.
+    """
+    def __init__(
+        self,
+        registry: 'EntityRegistry',
+        kind: str
+    ) -> None:
+        """Initiates the EntityView
+
+        Args:
+            registry (EntityRegistry): The registry to read from
+            kind (str): Kind of the entities, e.g. PLAYER or ENEMY
+        """
+        self.registry = registry
+        self.kind = kind
+        self.items = registry.kinds.setdefault(kind, [])
+
+    def __len__(self) -> int:
+        return len(self.items) - self.registry.pendingCount(self.kind)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self.registry.iterate(self.items)
+
+    def __getitem__(self, index: int) -> Any:
+        pending = self.registry.pending
+        if not pending:
+            return self.items[index]
+        # removed mid-iteration but still in the list, skipped like __iter__ does
+        return [entity for entity in self.items if entity.entityId not in pending][index]
+
+class EntityRegistry:
+    """Every entity of the window under a stable integer ID.
+
+    Each kind is one dense list. Removing an entity moves the last one
+    of its kind into the gap (swap-remove), so adding and removing are
+    O(1) and nothing is ever copied. While somebody iterates, removals
+    are only marked and carried out once the last iteration is done,
+    and entities added meanwhile are appended behind the part that is
+    being iterated. That way an entity can spawn or die in the middle
+    of a tick without skipping or repeating anyone. Indexing and len()
+    of a view skip the marked entities just like iterating does, and an
+    entity that is added again before its removal went through simply
+    keeps its ID and slot.
+    """
+    def __init__(self) -> None:
+        """Initiates the EntityRegistry
+        """
+        self.nextId = 0
+        self.kinds: dict[str, list] = {}
+        self.entries: dict[int, list] = {}  # id -> [kind, entity, index]
+        self.iterating = 0
+        self.pending: set[int] = set()      # ids removed while iterating
+
+    def __len__(self) -> int:
+        return len(self.entries) - len(self.pending)
+
+    def __iter__(self) -> Iterator[Any]:
+        for items in list(self.kinds.values()):
+            yield from self.iterate(items)
+
+    def __contains__(self, entity: Any) -> bool:
+        entry = self.entries.get(getattr(entity, "entityId", None))
+        return entry is not None and entry[1] is entity and entity.entityId not in self.pending
+
+    def view(
+        self,
+        kind: str
+    ) -> EntityView:
+        """Gets a view of all entities of one kind
+
+        Args:
+            kind (str): Kind of the entities, e.g. PLAYER or ENEMY
+
+        Returns:
+            EntityView: Live view, no copy
+        """
+        return EntityView(self, kind)
+
+    def add(
+        self,
+        entity: Any,
+        kind: str
+    ) -> int:
+        """Registers an entity and gives it a new ID (as `entity.entityId`)
+
+        Args:
+            entity (Any): The entity
+            kind (str): Kind of the entity, e.g. PLAYER or ENEMY
+
+        Returns:
+            int: The ID
+
+        Raises:
+            ValueError: If the entity waits to be removed as another kind
+        """
+        id = getattr(entity, "entityId", None)
+        entry = self.entries.get(id)
+        if id in self.pending and entry[1] is entity:
+            # removed and added again during one iteration, it just stays where it is
+            if entry[0] != kind:
+                raise ValueError(f"Entity {id} is being removed as {entry[0]!r}, can't add it as {kind!r} yet")
+            self.pending.discard(id)
+            return id
+        id = self.nextId
+        self.nextId += 1
+        items = self.kinds.setdefault(kind, [])
+        self.entries[id] = [kind, entity, len(items)]
+        items.append(entity)
+        entity.entityId = id
+        return id
+
+    def get(
+        self,
+        id: int
+    ) -> Optional[Any]:
+        """Gets an entity by its ID
+
+        Args:
+            id (int): The ID
+
+        Returns:
+            Optional[Any]: The entity, None if it was removed
+        """
+        entry = self.entries.get(id)
+        return entry[1] if entry and id not in self.pending else None
+
+    def remove(
+        self,
+        entity: Any
+    ) -> None:
+        """Removes an entity, right away or once nobody iterates anymore
+
+        Args:
+            entity (Any): The entity
+        """
+        id = entity.entityId
+        if id not in self.entries or id in self.pending:
+            return
+        if self.iterating:
+            self.pending.add(id)
+        else:
+            self.swapRemove(id)
+
+    def swapRemove(
+        self,
+        id: int
+    ) -> None:
+        """Takes an entity out of its list by moving the last one into its slot
+
+        Args:
+            id (int): ID of the entity
+        """
+        kind, _, index = self.entries.pop(id)
+        items = self.kinds[kind]
+        last = items.pop()
+        if index < len(items):
+            items[index] = last
+            self.entries[last.entityId][2] = index
+
+    def pendingCount(
+        self,
+        kind: str
+    ) -> int:
+        """Gets how many entities of a kind are waiting to be removed
+        """
+        if not self.pending:
+            return 0
+        return sum(1 for id in self.pending if self.entries[id][0] == kind)
+
+    def iterate(
+        self,
+        items: list
+    ) -> Iterator[Any]:
+        """Yields the entities of a list that existed when iterating started
+        and haven't been removed since
+
+        Args:
+            items (list): Dense list of one kind
+
+        Yields:
+            Any: The entities
+        """
+        self.iterating += 1
+        try:
+            pending = self.pending
+            for i in range(len(items)):
+                entity = items[i]
+                if not pending or entity.entityId not in pending:
+                    yield entity
+        finally:
+            self.iterating -= 1
+            if not self.iterating and self.pending:
+                for id in self.pending:
+                    self.swapRemove(id)
+                self.pending.clear()
@@ -0,0 +1,157 @@
+import csv
+import time
+import numpy as np
+
+# phases of one frame, in the order they happen
+PHASES = ("input", "enemyAI", "playerMove", "collision", "trails", "render", "hud")
+WINDOW = 600    # frames the rolling statistics look back on
+
+class RollingStats:
+    """The last `size` samples of one value in a ring buffer.
+    Percentiles are only computed when somebody asks for them.
+    """
+    def __init__(
+        self,
+        size: int = WINDOW
+    ) -> None:
+        """Initiates the RollingStats
+
+        Args:
+            size (int, optional): Amount of samples kept. Defaults to WINDOW.
+        """
+        self.samples = np.zeros(size)
+        self.head = 0
+        self.count = 0
+
+    def add(
+        self,
+        value: float
+    ) -> None:
+        """Adds a sample, dropping the oldest one if the buffer is full
+
+        Args:
+            value (float): The sample
+        """
+        self.samples[self.head] = value
+        self.head = (self.head + 1) % len(self.samples)
+        if self.count < len(self.samples):
+            self.count += 1
+
+    def summary(self) -> dict:
+        """Gets the statistics of the kept samples
+
+        Returns:
+            dict: p50, p95, p99, max and mean
+        """
+        if not self.count:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+        samples = self.samples[:self.count]
+        p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+        return {"p50": p50, "p95": p95, "p99": p99, "max": samples.max(), "mean": samples.mean()}
+
+class FrameProfiler:
+    """Splits every frame into PHASES and keeps rolling statistics of each.
+
+    It works like a stopwatch with laps: `lap(phase)` books the time
+    since the previous lap onto that phase. Ticks can run several times
+    per frame, so a phase adds up until `beginFrame` closes the frame.
+    All times are in milliseconds.
+    """
+    def __init__(
+        self,
+        window: int = WINDOW
+    ) -> None:
+        """Initiates the FrameProfiler
+
+        Args:
+            window (int, optional): Frames the statistics look back on. Defaults to WINDOW.
+        """
+        self.stats = {phase: RollingStats(window) for phase in PHASES + ("frame",)}
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+        self.frames = 0
+        self.lastFrame = 0.0    # total of the last closed frame
+
+    def mark(self) -> None:
+        """Restarts the stopwatch without booking the time anywhere,
+        e.g. after the event loop was idle
+        """
+        self.last = time.perf_counter()
+
+    def lap(
+        self,
+        phase: str
+    ) -> None:
+        """Books the time since the last lap onto a phase
+
+        Args:
+            phase (str): One of PHASES
+        """
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last) * 1000
+        self.last = now
+
+    def beginFrame(self) -> None:
+        """Closes the previous frame (if it did anything) and starts a new one
+        """
+        current = self.current
+        total = sum(current.values())
+        if total:
+            for phase, value in current.items():
+                self.stats[phase].add(value)
+                current[phase] = 0.0
+            self.stats["frame"].add(total)
+            self.frames += 1
+            self.lastFrame = total
+        self.mark()
+
+    def summary(self) -> dict:
+        """Gets the statistics of every phase
+
+        Returns:
+            dict: Phase (and "frame" for the sum) -> RollingStats.summary()
+        """
+        return {phase: stats.summary() for phase, stats in self.stats.items()}
+
+    def format(self) -> str:
+        """Gets the statistics as a small table for the overlay
+
+        Returns:
+            str: One line per phase
+        """
+        lines = [f"{'ms':<10}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+        for phase, s in self.summary().items():
+            lines.append(f"{phase:<10}{s['p50']:>7.2f}{s['p95']:>7.2f}{s['p99']:>7.2f}{s['max']:>7.2f}")
+        return "\n".join(lines)
+
+    def dumpCsv(
+        self,
+        path: str
+    ) -> None:
+        """Writes the statistics of every phase to a CSV file
+
+        Args:
+            path (str): File to write
+        """
+        with open(path, "w", newline="", encoding="UTF-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["phase", "p50_ms", "p95_ms", "p99_ms", "max_ms", "mean_ms", "frames"])
+            for phase, s in self.summary().items():
+                writer.writerow([phase] + [round(s[key], 4) for key in ("p50", "p95", "p99", "max", "mean")] + [self.stats[phase].count])
+
+class NullProfiler:
+    """Stands in for a FrameProfiler when nothing should be measured,
+    so the hot paths don't need to check for one
+    """
+    lastFrame = 0.0
+
+    def mark(self) -> None:
+        pass
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def beginFrame(self) -> None:
+        pass
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,120 @@
+import time
+from typing import Optional
+
+class RealTimeClock:
+    """Game time follows the wall clock, optionally sped up or slowed down.
+
+    Every clock answers two questions: how much game time passed since
+    the last frame (`elapsed`) and what the wall clock says (`real`,
+    for pacing and FPS). `paced` tells the game loop whether to wait
+    for the display between frames, `deterministic` whether the game
+    time doesn't depend on the wall clock, so none of it may be dropped.
+    """
+    paced = True
+    deterministic = False
+
+    def __init__(
+        self,
+        scale: float = 1.0
+    ) -> None:
+        """Initiates the RealTimeClock
+
+        Args:
+            scale (float, optional): Game seconds per real second. Defaults to 1.0.
+        """
+        self.scale = scale
+        self.last = self.real()
+        self.now = 0.0  # game seconds handed out so far
+
+    def real(self) -> float:
+        """Gets the wall clock
+
+        Returns:
+            float: Seconds from an arbitrary start
+        """
+        return time.perf_counter()
+
+    def start(self) -> None:
+        """Starts counting from now
+        """
+        self.last = self.real()
+
+    def elapsed(self) -> Optional[float]:
+        """Gets the game time since the last call
+
+        Returns:
+            Optional[float]: Game seconds, None for as much as a frame may run
+        """
+        now = self.real()
+        delta = (now - self.last) * self.scale
+        self.last = now
+        self.now += delta
+        return delta
+
+class FixedStepClock(RealTimeClock):
+    """Every frame is exactly `step` game seconds long, no matter how long it really took.
+
+    Unpaced, frames run back to back, so a run plays the same ticks
+    per frame on every machine, only faster or slower.
+    """
+    deterministic = True
+
+    def __init__(
+        self,
+        step: float = 1 / 60,
+        scale: float = 1.0,
+        paced: bool = False
+    ) -> None:
+        """Initiates the FixedStepClock
+
+        Args:
+            step (float, optional): Game seconds per frame before scaling. Defaults to 1 / 60.
+            scale (float, optional): Game seconds per clock second. Defaults to 1.0.
+            paced (bool, optional): Still wait for the display between frames. Defaults to False.
+        """
+        super().__init__(scale)
+        self.step = step
+        self.paced = paced
+
+    def elapsed(self) -> Optional[float]:
+        delta = self.step * self.scale
+        self.now += delta
+        return delta
+
+class FastClock(RealTimeClock):
+    """As fast as possible: every frame runs as many ticks as the game loop allows,
+    `scale` times that to render even less often
+    """
+    paced = False
+    deterministic = True
+
+    def elapsed(self) -> Optional[float]:
+        return None
+
+CLOCKS = {
+    "real": RealTimeClock,
+    "fixed": FixedStepClock,
+    "fast": FastClock,
+}
+
+def create(
+    name: str = "real",
+    scale: float = 1.0
+) -> RealTimeClock:
+    """Builds a clock by name
+
+    Args:
+        name (str, optional): Key of CLOCKS. Defaults to "real".
+        scale (float, optional): Time scale, multiplies the ticks per frame of "fast". Defaults to 1.0.
+
+    Raises:
+        ValueError: If the clock doesn't exist
+
+    Returns:
+        RealTimeClock: The clock
+    """
+    if name not in CLOCKS:
+        raise ValueError(f"Unknown clock {name!r}, use one of {', '.join(CLOCKS)}")
+    if name == "fixed":
+        return FixedStepClock(scale=scale)
+    return CLOCKS[name](scale)
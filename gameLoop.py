@@ -0,0 +1,304 @@
+import math
+import time
+from typing import Callable, Optional, Union
+from PyQt5.QtCore import (
+    QEvent,
+    QObject,
+    QTimer,
+    Qt,
+    pyqtSignal
+)
+from PyQt5.QtWidgets import QGraphicsView
+from simulation import World
+from frameProfiler import FrameProfiler, NullProfiler, NULL_PROFILER
+from gameClock import RealTimeClock, FastClock
+
+class FixedTimestep:
+    """Turns wall-clock time into a whole number of fixed simulation ticks.
+
+    Leftover time stays in the accumulator and is exposed as `alpha`,
+    the fraction of a tick the renderer should interpolate by.
+    """
+    def __init__(
+        self,
+        tickRate: float,
+        maxTicksPerFrame: int = 5
+    ) -> None:
+        """Initiates the FixedTimestep
+
+        Args:
+            tickRate (float): Simulation ticks per second
+            maxTicksPerFrame (int, optional): Upper limit of ticks run to catch up
+                after a long frame, so a stall can't snowball. Defaults to 5.
+        """
+        self.dt = 1 / tickRate
+        self.maxTicksPerFrame = maxTicksPerFrame
+        self.accumulator = 0.0
+
+    def advance(
+        self,
+        elapsed: float,
+        maxTicks: Optional[int] = None,
+        dropLate: bool = True
+    ) -> int:
+        """Adds elapsed time and returns how many ticks are due
+
+        Args:
+            elapsed (float): Seconds since the last call
+            maxTicks (Optional[int], optional): Upper limit of this call. Defaults to maxTicksPerFrame.
+            dropLate (bool, optional): Throw away the time beyond the limit instead of
+                running it in later calls. Defaults to True.
+
+        Returns:
+            int: Amount of ticks to run now
+        """
+        limit = self.maxTicksPerFrame if maxTicks is None else maxTicks
+        self.accumulator += elapsed
+        ticks = int(self.accumulator / self.dt)
+        if ticks > limit:
+            ticks = limit
+            if dropLate:
+                self.accumulator = 0.0 # drop the time we can't catch up on
+            else:
+                self.accumulator -= ticks * self.dt
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """How far we are into the next tick (0 to 1)
+        """
+        return min(self.accumulator / self.dt, 1.0)
+
+class FramePacer:
+    """Works out how long to sleep after a frame to hit a target frame rate.
+
+    Frames are scheduled against deadlines instead of fixed sleeps, so
+    a slow frame is caught up on by the next one. If we fall more than
+    a whole frame behind, the missed frames are dropped instead of
+    being rushed out back to back.
+    """
+    def __init__(
+        self,
+        fps: float,
+        clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        """Initiates the FramePacer
+
+        Args:
+            fps (float): Frames per second to aim for
+            clock (Callable[[], float], optional): Wall clock in seconds. Defaults to time.perf_counter.
+        """
+        self.clock = clock
+        self.period = 1 / fps
+        self.deadline: Optional[float] = None
+        self.started = 0.0
+        self.work = 0.0     # seconds spent inside frames
+        self.wait = 0.0     # seconds handed back to the OS
+        self.frames = 0
+        self.since = clock()
+
+    def begin(self) -> None:
+        """Marks the start of a frame
+        """
+        self.started = self.clock()
+        if self.deadline is None:
+            self.deadline = self.started
+
+    def end(self) -> float:
+        """Marks the end of a frame and gets the time until the next one
+
+        Returns:
+            float: Seconds to sleep, 0 to start the next frame right away
+        """
+        now = self.clock()
+        self.work += now - self.started
+        self.frames += 1
+
+        self.deadline += self.period
+        if now > self.deadline + self.period:
+            self.deadline = now # too far behind, drop the missed frames
+        delay = max(self.deadline - now, 0.0)
+        self.wait += delay
+        return delay
+
+    def report(self) -> dict:
+        """Gets the average split of a frame since the last report and starts a new one.
+        Whatever is neither work nor wait went to Qt, mostly painting.
+
+        Returns:
+            dict: work, wait and other in milliseconds per frame, and the frames counted
+        """
+        now = self.clock()
+        frames = max(self.frames, 1)
+        result = {
+            "work": self.work / frames * 1000,
+            "wait": self.wait / frames * 1000,
+            "other": max(now - self.since - self.work - self.wait, 0.0) / frames * 1000,
+            "frames": self.frames,
+        }
+        self.work = self.wait = 0.0
+        self.frames = 0
+        self.since = now
+        return result
+
+class GameLoop(QObject):
+    """The one and only timer of the game.
+
+    Every frame it runs all due simulation ticks in a single pass
+    and then asks the window to render with interpolation, so the
+    display rate and the tick rate don't depend on each other.
+    """
+    ticked = pyqtSignal(object) # list of events of one tick
+    frame = pyqtSignal(float)   # interpolation alpha
+
+    def __init__(
+        self,
+        world: World,
+        inputSource: Callable[[], int],
+        tickRate: float,
+        frameInterval: int = 0,
+        unlimited: bool = False,
+        profiler: Union[FrameProfiler, NullProfiler] = NULL_PROFILER,
+        targetFps: float = 0,
+        clock: Optional[RealTimeClock] = None
+    ) -> None:
+        """Initiates the GameLoop
+
+        Args:
+            world (World): The world to step
+            inputSource (Callable[[], int]): Returns the keys held for the next tick (simulation.KEY_*)
+            tickRate (float): Simulation ticks per second
+            frameInterval (int, optional): Milliseconds between frames. Defaults to 0.
+            unlimited (bool, optional): Shorthand for clock=FastClock(), for replays. Defaults to False.
+            profiler (Union[FrameProfiler, NullProfiler], optional): Gets the input phase of every tick
+                and the start of every frame. Defaults to measuring nothing.
+            targetFps (float, optional): Frames per second to pace to, sleeping in between.
+                0 runs a frame every frameInterval instead. Defaults to 0.
+            clock (Optional[RealTimeClock], optional): Where game time comes from, see gameClock.
+                Defaults to real time.
+        """
+        super().__init__()
+        self.world = world
+        self.inputSource = inputSource
+        self.timestep = FixedTimestep(tickRate)
+        self.clock = clock or (FastClock() if unlimited else RealTimeClock())
+        self.profiler = profiler
+
+        self.frameInterval = frameInterval
+        self.running = False
+
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.runFrame)
+        self.setTargetFps(targetFps)
+
+    def setClock(
+        self,
+        clock: RealTimeClock
+    ) -> None:
+        """Switches where game time comes from, keeps the frame rate target
+
+        Args:
+            clock (RealTimeClock): The new clock
+        """
+        self.clock = clock
+        clock.start()
+        self.setTargetFps(self.targetFps)
+
+    def setTargetFps(
+        self,
+        fps: float
+    ) -> None:
+        """Switches between pacing to a frame rate and the fixed frame interval.
+        Unpaced clocks, like the one of replays, always run every frameInterval.
+
+        Args:
+            fps (float): Frames per second, 0 for the fixed frame interval
+        """
+        self.targetFps = fps
+        self.pacer = FramePacer(fps, self.clock.real) if fps > 0 and self.clock.paced else None
+        self.timer.setSingleShot(self.pacer is not None) # paced frames schedule the next one themselves
+        self.timer.setInterval(0 if self.pacer else self.frameInterval)
+        if self.running:
+            self.timer.start()
+
+    def start(self) -> None:
+        """Starts the loop
+        """
+        self.running = True
+        self.clock.start()
+        self.timer.start()
+
+    def stop(self) -> None:
+        """Stops the loop
+        """
+        self.running = False
+        self.timer.stop()
+
+    def runFrame(self) -> None:
+        """Runs all due ticks and renders one frame
+        """
+        pacer = self.pacer
+        if pacer:
+            pacer.begin()
+        elapsed = self.clock.elapsed()
+        profiler = self.profiler
+        profiler.beginFrame()
+
+        # a scaled clock hands out more game time per frame, so it may run more ticks per frame
+        limit = max(math.ceil(self.timestep.maxTicksPerFrame * self.clock.scale), 1)
+        if elapsed is None:
+            ticks, alpha = limit, 1.0
+        else:
+            ticks = self.timestep.advance(elapsed, limit, dropLate=not self.clock.deterministic)
+            alpha = self.timestep.alpha
+        
+        for _ in range(ticks):
+            if not self.running:
+                break # stopped by a tick, e.g. the end of a replay
+            keys = self.inputSource()
+            profiler.lap("input")
+            events = self.world.step(self.timestep.dt, keys)
+            self.ticked.emit(events)
+        self.frame.emit(alpha)
+
+        if self.pacer and self.running:
+            # the event loop sleeps until the timer is due, Qt can paint meanwhile
+            delay = pacer.end() if self.pacer is pacer else 0.0 # 0 if the pace changed mid-frame
+            self.timer.start(int(delay * 1000))
+
+class PaintTimer(QObject):
+    """Books the time a view spends painting its scene onto the render phase.
+
+    Qt paints whenever the event loop gets to it, outside of any frame
+    callback, so the paint event of the viewport is caught and handled here.
+    """
+    def __init__(
+        self,
+        view: QGraphicsView,
+        profiler: FrameProfiler
+    ) -> None:
+        """Initiates the PaintTimer
+
+        Args:
+            view (QGraphicsView): The view to measure
+            profiler (FrameProfiler): Profiler to book the paint time onto
+        """
+        super().__init__(view)
+        self.view = view
+        self.profiler = profiler
+        view.viewport().installEventFilter(self)
+
+    def eventFilter(
+        self,
+        watched: QObject,
+        event: QEvent
+    ) -> bool:
+        if event.type() != QEvent.Paint:
+            return False
+        self.profiler.mark()
+        self.view.viewportEvent(event)
+        self.profiler.lap("render")
+        return True
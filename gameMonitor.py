@@ -1,24 +1,18 @@
-import time
-from PyQt5.QtCore import (
-    QThread,
-    pyqtSignal
-)
 from typing import TYPE_CHECKING
-from configParser import Config
 
 if TYPE_CHECKING:
     from main import Window
 
-class GameMonitor(QThread):
+class GameMonitor:
     """This class controls some of the GUI elements for the cool UI :)
 
-    Args:
-        QThread (QObject): It's another seperate QThread
+    Once per rendered frame the window has it read the current HP,
+    score and enemy count and apply them right after. Only values that
+    actually changed are marked dirty, so no label is touched from
+    another thread or more often than it has to be.
     """
-    triggerWave = pyqtSignal()
-    
     def __init__(
-        self, 
+        self,
         window: 'Window'
     ) -> None:
         """Initiates the GameMonitor
@@ -26,19 +20,49 @@ class GameMonitor(QThread):
         Args:
             window (Window): The Window class to access GUI elements
         """
-        super().__init__()
         self.window = window
-    
-    def run(self) -> None:
-        """This is what the game constantly runs in the background
+        self.values = {}
+        self.dirty = set()
+
+    def set(
+        self,
+        name: str,
+        value
+    ) -> None:
+        """Stores a HUD value and marks it dirty if it changed
+
+        Args:
+            name (str): "hp", "score" or "enemies"
+            value (Any): The new value
+        """
+        if name not in self.values or self.values[name] != value:
+            self.values[name] = value
+            self.dirty.add(name)
+
+    def update(self) -> None:
+        """Reads the current values from the world, once per frame
+        """
+        world = self.window.world
+        player = world.player
+        if player and player.active:
+            self.set("hp", (player.hp, player.maxHP))
+            self.set("score", player.score)
+        else:
+            self.set("hp", None)
+        self.set("enemies", len(world.enemies))
+
+    def apply(self) -> None:
+        """Writes the dirty values into the labels. Call this from the GUI thread once per frame
         """
-        time.sleep(1) # delay
-        while True:
-            if self.window.player:
-                self.window.labels['HPLabel'].setText(f"HP: {self.window.player.hp}/{self.window.player.maxHP}")
-                self.window.labels['BGLabel'].setText(f"{str(self.window.player.score)}")
-                self.window.player.score = round(self.window.player.score + self.window.player.step, 2)
-            else:
-                self.window.labels['HPLabel'].setText("Player died")
-            self.window.labels['enemyLabel'].setText(f"Enemies: {len(self.window.objects['dynamicObjects']) - 1}")
-            time.sleep(0.25)
\ No newline at end of file
+        if not self.dirty:
+            return
+        labels = self.window.labels
+        for name in self.dirty:
+            value = self.values[name]
+            if name == "hp":
+                labels['HPLabel'].setText("Player died" if value is None else f"HP: {value[0]}/{value[1]}")
+            elif name == "score":
+                labels['BGLabel'].setText(str(value))
+            elif name == "enemies":
+                labels['enemyLabel'].setText(f"Enemies: {value}")
+        self.dirty.clear()
@@ -0,0 +1,170 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # has to happen before Qt is imported
+
+import argparse
+import json
+import resource
+import sys
+import time
+from typing import Optional
+import numpy as np
+import PyQt5.QtWidgets as QtWidgets
+import configParser
+import batchSimulation
+import gameClock
+
+class HeadlessRun:
+    """Runs the real game (Window, models, waves, HUD) without a screen.
+
+    The Window is built on the offscreen Qt platform and driven by one
+    of the batchSimulation policies instead of the keyboard. An enemy
+    ramp keeps topping the horde up to a count that changes over game
+    time, with the same spawning as Window.testing2.
+    """
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        duration: float = 30.0,
+        policy: str = "flee",
+        script: Optional[list] = None,
+        ramp: Optional[list] = None,
+        spawn: int = 0,
+        invincible: bool = False,
+        clock: str = "real",
+        timeScale: float = 1.0,
+        renderMode: Optional[str] = None
+    ) -> None:
+        """Initiates the HeadlessRun and builds the window
+
+        Args:
+            seed (Optional[int], optional): Seed of the game. Defaults to a random one.
+            duration (float, optional): Seconds of game time to play. Defaults to 30.0.
+            policy (str, optional): Key of batchSimulation.POLICIES. Defaults to "flee".
+            script (Optional[list], optional): Inputs of the "script" policy. Defaults to None.
+            ramp (Optional[list], optional): (seconds, enemies) points, the enemy count
+                is topped up to the line between them. Defaults to None.
+            spawn (int, optional): Enemies spawned right at the start. Defaults to 0.
+            invincible (bool, optional): The player can't die. Defaults to False.
+            clock (str, optional): Key of gameClock.CLOCKS, "fast" runs as many ticks per frame as allowed. Defaults to "real".
+            timeScale (float, optional): Game seconds per second of the clock. Defaults to 1.0.
+            renderMode (Optional[str], optional): Render backend. Defaults to RENDER_MODE.
+        """
+        import main
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+        self.form = QtWidgets.QMainWindow()
+        self.window = window = main.Window(self.form, seed, useKeyboard=False, renderMode=renderMode,
+                                           clock=gameClock.create(clock, timeScale))
+        self.form.show()
+
+        window.keepScores = False # test runs don't belong in the highscores
+        window.governor = None
+        if invincible:
+            window.player.body.hp = float("inf")
+
+        arguments = (script,) if policy == "script" else ()
+        self.policy = batchSimulation.POLICIES[policy](window.world.seed, *arguments)
+        window.loop.inputSource = lambda: self.policy(window.world)
+        window.loop.frame.connect(self.onFrame)
+
+        self.duration = duration
+        self.ramp = sorted(ramp or [])
+        self.spawn = spawn
+        self.peakEnemies = 0
+        self.frames = 0
+
+    def onFrame(
+        self,
+        alpha: float
+    ) -> None:
+        """Follows the ramp, keeps the counters and stops once the duration is played
+        """
+        window = self.window
+        world = window.world
+        self.frames += 1
+        if self.ramp and window.player:
+            times, counts = zip(*self.ramp)
+            missing = int(np.interp(world.time, times, counts)) - len(world.enemies)
+            if missing > 0:
+                window.testing2(missing)
+        self.peakEnemies = max(self.peakEnemies, len(world.enemies))
+        if world.time >= self.duration:
+            window.loop.stop()
+            self.app.quit()
+
+    def run(self) -> dict:
+        """Plays until the duration is over
+
+        Returns:
+            dict: Game time, ticks, throughput and speedup, frame times, peak enemies and peak RSS
+        """
+        window = self.window
+        if self.spawn:
+            window.testing2(self.spawn)
+        start = time.perf_counter()
+        self.app.exec_()
+        elapsed = time.perf_counter() - start
+
+        frame = window.profiler.summary()["frame"]
+        world = window.world
+        return {
+            "seed": world.seed,
+            "gameTime": round(world.time, 3),
+            "ticks": world.ticks,
+            "frames": self.frames,
+            "wallTime": elapsed,
+            "ticksPerSecond": world.ticks / elapsed if elapsed else 0.0,
+            "speedup": world.time / elapsed if elapsed else 0.0, # game seconds per wall second
+            "fps": self.frames / elapsed if elapsed else 0.0,
+            "frameP50": float(frame["p50"]),
+            "frameP95": float(frame["p95"]),
+            "peakEnemies": self.peakEnemies,
+            "alive": world.player.active,
+            "score": world.player.score,
+            "peakRssMb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, # KiB on Linux
+        }
+
+def parseRamp(
+    text: str
+) -> tuple:
+    """Parses one ramp point
+
+    Args:
+        text (str): "seconds:enemies", e.g. "30:500"
+
+    Returns:
+        tuple: (seconds, enemies)
+    """
+    seconds, _, enemies = text.partition(":")
+    return float(seconds), int(enemies)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays the real DotEXE window headless on the offscreen Qt platform")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--config", help="config file, defaults to " + configParser.CONFIG_PATH)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of game time")
+    parser.add_argument("--policy", choices=batchSimulation.POLICIES, default="flee")
+    parser.add_argument("--script", help="replay or JSON [[tick, keys], ...] for --policy script")
+    parser.add_argument("--ramp", action="append", type=parseRamp, metavar="SECONDS:ENEMIES",
+                        help="enemy count to top up to at a game time, linear in between, can be given more than once")
+    parser.add_argument("--spawn", type=int, default=0, metavar="N", help="spawn N enemies at the start, like testing2")
+    parser.add_argument("--invincible", action="store_true", help="the player can't die")
+    parser.add_argument("--clock", choices=gameClock.CLOCKS, default="real",
+                        help="real time, a fixed step per frame or as many ticks as possible")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="game seconds per second of the clock")
+    parser.add_argument("--render", help="render backend, overrides RENDER_MODE")
+    parser.add_argument("--out", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    if args.policy == "script" and not args.script:
+        parser.error("--policy script needs --script")
+    if args.config:
+        configParser.load(args.config)
+    script = batchSimulation.loadScript(args.script) if args.script else None
+
+    result = HeadlessRun(args.seed, args.duration, args.policy, script, args.ramp, args.spawn,
+                         args.invincible, args.clock, args.time_scale, args.render).run()
+    if args.out:
+        with open(args.out, "w", encoding="UTF-8") as file:
+            json.dump(result, file, indent=4)
+    json.dump(result, sys.stdout, indent=4)
+    print()
@@ -1,52 +1,185 @@
-import keyboard
 import time
 from PyQt5.QtCore import (
-    QThread,
-    pyqtSignal
+    QEvent,
+    QObject,
+    Qt
 )
-from configParser import Config
+from PyQt5.QtWidgets import QWidget
+import simulation
 
-class KeyboardWorker(QThread):
-    """This checks the keyboard's inputs
+# Qt key -> simulation.KEY_* bit
+QT_KEYS = {
+    Qt.Key_W: simulation.KEY_UP,
+    Qt.Key_S: simulation.KEY_DOWN,
+    Qt.Key_A: simulation.KEY_LEFT,
+    Qt.Key_D: simulation.KEY_RIGHT,
+    Qt.Key_Q: simulation.KEY_QUIT,
+}
+# key name of the keyboard package -> simulation.KEY_* bit
+HOOK_KEYS = {
+    "w": simulation.KEY_UP,
+    "s": simulation.KEY_DOWN,
+    "a": simulation.KEY_LEFT,
+    "d": simulation.KEY_RIGHT,
+    "q": simulation.KEY_QUIT,
+}
 
-    Args:
-        QThread (QObject): It's yet another seperate QThread
+class KeyState:
+    """The keys held right now as a bitmask of simulation.KEY_* values.
+
+    Whatever feeds it calls `press` and `release` when keys change,
+    the game loop calls `sample` once per tick. A key that was pressed
+    and released between two samples still shows up in the next one,
+    so short taps aren't lost.
+    """
+    def __init__(self) -> None:
+        """Initiates the KeyState
+        """
+        self.held = 0
+        self.tapped = 0     # pressed since the last sample
+        self.pressedAt = {} # bit -> time.perf_counter() of the press
+        self.latency = 0.0  # seconds from the last new press until a tick saw it
+
+    def press(
+        self,
+        bit: int
+    ) -> None:
+        """Marks a key as held
+
+        Args:
+            bit (int): simulation.KEY_* value
+        """
+        if not self.held & bit:
+            self.pressedAt[bit] = time.perf_counter()
+        self.held |= bit
+        self.tapped |= bit
+
+    def release(
+        self,
+        bit: int
+    ) -> None:
+        """Marks a key as released
+
+        Args:
+            bit (int): simulation.KEY_* value
+        """
+        self.held &= ~bit
+
+    def sample(self) -> int:
+        """Gets the keys of the next tick
+
+        Returns:
+            int: Bitmask of simulation.KEY_* values
+        """
+        keys = self.held | self.tapped
+        if self.tapped:
+            now = time.perf_counter()
+            self.latency = now - min(pressed for bit, pressed in self.pressedAt.items() if self.tapped & bit)
+            self.tapped = 0
+        return keys
+
+class QtKeyboard(QObject):
+    """Feeds a KeyState from the key events of the game's window.
+    Keys the focused widget doesn't use bubble up to the window, so
+    only its events are filtered, not every event of the application.
+    Runs on the GUI thread, needs no extra permissions and no thread.
+    """
+    def __init__(
+        self,
+        state: KeyState,
+        widget: QWidget
+    ) -> None:
+        """Initiates the QtKeyboard
+
+        Args:
+            state (KeyState): The state to feed
+            widget (QWidget): The window that gets the key events
+        """
+        super().__init__(widget)
+        self.state = state
+        self.widget = widget
+        widget.installEventFilter(self)
+
+    def stop(self) -> None:
+        """Stops listening
+        """
+        self.widget.removeEventFilter(self)
+
+    def eventFilter(
+        self,
+        watched: QObject,
+        event: QEvent
+    ) -> bool:
+        kind = event.type()
+        if kind == QEvent.KeyPress or kind == QEvent.KeyRelease:
+            bit = QT_KEYS.get(event.key())
+            if bit and not event.isAutoRepeat():
+                if kind == QEvent.KeyPress:
+                    self.state.press(bit)
+                else:
+                    self.state.release(bit)
+        return False
+
+class HookKeyboard:
+    """Feeds a KeyState from the global hook of the keyboard package,
+    so the game gets keys even without focus. That package needs
+    root on Linux. Its callbacks come from its own thread, but they
+    only flip bits in the KeyState and never touch Qt.
     """
-    moving = pyqtSignal(int, int)
-    
     def __init__(
-        self, 
-        objects: list
+        self,
+        state: KeyState
     ) -> None:
-        """Initiates the KeyboardWorker
+        """Initiates the HookKeyboard
 
         Args:
-            objects (list): Uses the objects to see 
-                if it should even check for input
-        """
-        super().__init__()
-        self.config = Config("player")
-        self.objects = objects
-    
-    def run(self) -> None:
-        """Checks for WASD movement and emits a 8-bit direction vector
-        """
-        while True:
-            direction = [0, 0]
-            
-            if not self.objects['dynamicObjects']:
-                time.sleep(0.05)
-                continue
-            
-            if keyboard.is_pressed("w"):
-                direction[1] -= 1
-            if keyboard.is_pressed("s"):
-                direction[1] += 1
-            if keyboard.is_pressed("a"):
-                direction[0] -= 1
-            if keyboard.is_pressed("d"):
-                direction[0] += 1
-            if keyboard.is_pressed("q"):
-                self.moving.emit(-10, -10)
-            self.moving.emit(direction[0], direction[1])
-            time.sleep(self.config.TOUT)
\ No newline at end of file
+            state (KeyState): The state to feed
+        """
+        import keyboard # only needed for this backend
+        self.keyboard = keyboard
+        self.state = state
+        self.hook = keyboard.hook(self.onEvent)
+
+    def stop(self) -> None:
+        """Stops listening
+        """
+        self.keyboard.unhook(self.hook)
+
+    def onEvent(self, event) -> None:
+        bit = HOOK_KEYS.get((event.name or "").lower())
+        if bit:
+            if event.event_type == "down":
+                self.state.press(bit)
+            else:
+                self.state.release(bit)
+
+BACKENDS = {
+    "qt": QtKeyboard,
+    "hook": HookKeyboard,
+}
+
+def listen(
+    state: KeyState,
+    widget: QWidget,
+    backend: str = "qt"
+):
+    """Starts feeding a KeyState from a backend.
+    Falls back to Qt if the backend can't be started.
+
+    Args:
+        state (KeyState): The state to feed
+        widget (QWidget): The game's window, for the qt backend
+        backend (str, optional): "qt" or "hook". Defaults to "qt".
+
+    Returns:
+        Union[QtKeyboard, HookKeyboard]: The running backend
+    """
+    try:
+        if backend == "qt":
+            return QtKeyboard(state, widget)
+        return BACKENDS[backend](state)
+    except Exception as e:
+        if backend == "qt":
+            raise
+        print(f"Input backend {backend!r} not available ({e!r}), using qt")
+        return QtKeyboard(state, widget)
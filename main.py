@@ -1,29 +1,35 @@
+import startupProfiler # first, so it sees how long the other imports take
 import sys
-import platform
-if platform.system() == "Linux": raise RuntimeError("This game does not run on Linux. Sorry Luke & DNA, get a real OS. 😉")
 import random
+import platform
 import PyQt5.QtWidgets as QtWidgets
 import models
+import simulation
+import gameLoop
 import keyboardHandler
 import gameMonitor
 import enemyWaves
-from PyQt5.QtCore import (
-    QTimer,
-    QElapsedTimer,
-)
-from PyQt5.QtWidgets import (
-    QLabel, 
-    QGraphicsEllipseItem
-)
+import replay
+import frameProfiler
+import enemyPool
+import entityRegistry
+import scoreStore
+import qualityGovernor
+import renderBackends
+import dirtyRegion
+import gameClock
+from PyQt5.QtWidgets import QLabel
 from PyQt5.QtGui import (
     QFont, 
-    QBrush,
-    QColor
+    QGuiApplication,
+    QPainter
 )
-from typing import Union
-from configParser import Config
+from typing import Optional, Union
+import configParser
 from ui.ui_graphics import *
 
+startupProfiler.STARTUP.mark("imports")
+
 class Window(Ui_Frame):
     """The main Window of this application
 
@@ -32,52 +38,119 @@ class Window(Ui_Frame):
     """
     def __init__(
         self, 
-        form
+        form, 
+        seed: Optional[int] = None, 
+        recordPath: Optional[str] = None, 
+        replayPath: Optional[str] = None, 
+        useKeyboard: bool = True, 
+        profilePath: Optional[str] = None, 
+        renderMode: Optional[str] = None, 
+        clock: Optional[gameClock.RealTimeClock] = None
     ) -> None:
         """Initiates the whole Application
 
         Args:
             form (_type_): Form of Application
+            seed (Optional[int], optional): Seed of the game. Defaults to a random one.
+            recordPath (Optional[str], optional): Record the session to this replay file. Defaults to None.
+            replayPath (Optional[str], optional): Play this replay file instead of reading the keyboard. Defaults to None.
+            useKeyboard (bool, optional): Listen to the keyboard. Defaults to True.
+            profilePath (Optional[str], optional): Write the frame phase statistics to this CSV file on exit. Defaults to None.
+            renderMode (Optional[str], optional): Render backend, see renderBackends.BACKENDS. Defaults to RENDER_MODE.
+            clock (Optional[gameClock.RealTimeClock], optional): Where game time comes from. Defaults to real time,
+                as fast as possible for replays.
         """
         super().__init__()
         self.setupUi(form)
         self.scene = QtWidgets.QGraphicsScene(0, 0, self.graphicsView.width(), self.graphicsView.height())
         self.graphicsView.setScene(self.scene)
+        startupProfiler.STARTUP.mark("window")
         
-        self.objects = {
-            'dynamicObjects': [],
-        }
-        self.enemies = lambda: self.objects['dynamicObjects'][1:]
+        # every view under a stable ID, players and enemies as live views of it
+        self.entities = entityRegistry.EntityRegistry()
+        self.players = self.entities.view(entityRegistry.PLAYER)
+        self.enemies = self.entities.view(entityRegistry.ENEMY)
         self.player = None
-        self.config = Config("ui", "game")
         
-        self.keyboardWorker = keyboardHandler.KeyboardWorker(self.objects)
-        self.keyboardWorker.moving.connect(self.movePlayer)
-        self.keyboardWorker.start()
+        self.replay = replay.Replay.load(replayPath) if replayPath else None
+        self.config = self.replay.config if self.replay else configParser.load()
+        self.seeded = seed is not None # a known seed can be practiced, so it's never ranked
+        if self.replay:
+            seed = self.replay.seed
+        elif seed is None:
+            seed = random.SystemRandom().randrange(2 ** 32)
         
-        self.gameMonitor = gameMonitor.GameMonitor(self)
-        self.gameMonitor.triggerWave.connect(self.spawnWave) # triggerWave is a signal that is emitted when the game monitor wants to spawn a wave of enemies
-        self.gameMonitor.start()
+        startupProfiler.STARTUP.mark("config")
+        self.world = simulation.World(self.scene.width(), self.scene.height(), self.config, seed)
+        self.deterministic = bool(recordPath or replayPath)
+        self.views = {} # simulated body -> DynamicPoint drawing it
+        self.keys = keyboardHandler.KeyState() # simulation.KEY_* held right now
         
-        self.enemyTimer = QTimer()
-        self.enemyTimer.timeout.connect(self.gameMonitor.triggerWave.emit) # emit the signal to spawn a wave of enemies
-        self.enemyTimer.start(self.config.WC)
+        self.recordPath = recordPath
+        self.recorder = replay.ReplayRecorder(seed, self.world.config, self.config.TR) if recordPath else None
         
-        self.waves = enemyWaves.EnemyWave(self, 0, 1)
-        self.waves.spawnedEnemy.connect(self.spawnEnemy) # spawnMultipleEnemies spawns all the enemies for the current wave
-        self.waves.spawnCircle.connect(self.spawnCircle)
-        self.waves.removeCircle.connect(self.killCircle)
+        # key events fill self.keys as they come, the game loop samples it every tick
+        self.keyboard = None
+        if useKeyboard and not self.replay:
+            self.keyboard = keyboardHandler.listen(self.keys, self.graphicsView.window(), self.config.IB)
         
-        self.FPStimer = QTimer()
-        self.FPStimer.timeout.connect(self.displayFPS)
-        self.FPStimer.start(0)
+        self.gameMonitor = gameMonitor.GameMonitor(self)
         
-        self.elapsedTimer = QElapsedTimer()
-        self.elapsedTimer.start()
+        # finished runs go to the score database on their own thread, started by the first one
+        self.keepScores = not self.replay
+        self.scores = None
+        
+        # the waves themselves run on the world's timeline, this only draws their warnings
+        self.waves = None # built by the first warning
+        startupProfiler.STARTUP.mark("world")
+        
+        # every timing of the game goes through this clock, so tests can speed it up or make it exact
+        self.clock = clock or (gameClock.FastClock() if self.replay else gameClock.RealTimeClock())
+        self.fpsSince = self.clock.real()
         self.frameCount = 0
         
         self.constructUI()
+        startupProfiler.STARTUP.mark("ui")
+        
+        # "batched" and "raster" draw all enemies through one item instead of one item each
+        self.backend, self.horde = renderBackends.create(self, renderMode or self.config.RM)
+        
+        # every item moves every tick, so keeping a BSP tree balanced is usually wasted work
+        dirtyRegion.setIndexMethod(self.scene, self.config.SI)
+        self.dirty = None
+        if self.config.DR and not self.backend.fullRepaint:
+            self.dirty = dirtyRegion.DirtyRegion(self.graphicsView, countItems=self.config.PO)
+        startupProfiler.STARTUP.mark("render backend")
+        
         self.createPlayer()
+        startupProfiler.STARTUP.mark("player")
+        
+        # enemy views are reused instead of rebuilt, the horde doesn't need any.
+        # The pool fills up a few views per frame, so it doesn't hold up the first one
+        self.pool = None
+        if not self.horde:
+            self.pool = enemyPool.EnemyPool(self.scene, self.world, self.killEnemy)
+        
+        # measuring is a few clock reads per phase, so it's always on
+        self.profilePath = profilePath
+        self.profiler = frameProfiler.FrameProfiler()
+        self.world.profiler = self.profiler
+        self.paintTimer = gameLoop.PaintTimer(self.graphicsView, self.profiler)
+        
+        # gives up trails, far enemy AI and antialiasing step by step when frames get too slow
+        self.governor = None
+        if self.config.QG and not self.replay:
+            self.governor = qualityGovernor.QualityGovernor(self.qualityBudget())
+        self.trailEvery = 1
+        self.applyQuality()
+        
+        # one timer ticks every entity, instead of one per enemy
+        self.loop = gameLoop.GameLoop(self.world, self.readInput, self.config.TR, self.config.FI, profiler=self.profiler, targetFps=self.targetFps(), clock=self.clock)
+        self.loop.ticked.connect(self.onTick)
+        self.loop.frame.connect(self.renderFrame)
+        self.loop.start()
+        startupProfiler.STARTUP.mark("game")
+        startupProfiler.STARTUP.watch(self.graphicsView.viewport(), self.startupDone)
     
     def constructUI(self) -> None:
         """Constructs UI elements
@@ -104,14 +177,6 @@ class Window(Ui_Frame):
                 "style": "color: red; font-weight: bold; background-color: black;", 
                 "position": (0, 60)
             },
-            {
-                "name": "BGLabel", 
-                "text": "0", 
-                "font_size": self.config.FPSLS * 4, 
-                "style": "color: white; font-weight: bold; background-color: black;", 
-                "geometry": (round((self.scene.width() / 2) - 500), round((self.scene.height() / 2) - 40), 1000, 80), 
-                "alignment": QtCore.Qt.AlignmentFlag.AlignCenter
-            },
         ]
         
         self.labels = {}
@@ -128,128 +193,306 @@ class Window(Ui_Frame):
                 label.setGeometry(*config["geometry"])
             if "alignment" in config:
                 label.setAlignment(config["alignment"])
-            self.scene.addWidget(label)
+            self.scene.addWidget(label).setZValue(-2) # below the trails and squares
             self.labels[config["name"]] = label
+        
+        # the big score changes a few times a second but is repainted every frame,
+        # so it keeps its text layout around instead of being a QLabel
+        font = QFont()
+        font.setPointSize(self.config.FPSLS * 4)
+        font.setBold(True)
+        score = models.StaticTextItem(QtCore.QRectF(round((self.scene.width() / 2) - 500), round((self.scene.height() / 2) - 40), 1000, 80), font)
+        score.setText("0")
+        score.setZValue(-2)
+        self.scene.addItem(score)
+        self.labels['BGLabel'] = score
+        
+        if self.config.PO:
+            overlay = QLabel()
+            font = QFont("Monospace")
+            font.setStyleHint(QFont.StyleHint.TypeWriter)
+            overlay.setFont(font)
+            overlay.setStyleSheet("color: yellow; background-color: black;")
+            overlay.move(0, 90)
+            self.scene.addWidget(overlay).setZValue(2) # above everything, it's for debugging
+            self.labels['profilerLabel'] = overlay
     
     def save(self) -> None:
-        """Saves your highscore in the _player.data file
+        """Queues the finished run for the score database, the writing happens on another thread
         """
-        with open("_player.data", "r", encoding="UTF-8") as file:
-            content = file.read().strip()
-            if content == "":
-                old = 0
-            else:
-                old = float(content)
-        
-        if old <= self.player.score:
-            with open("_player.data", "w", encoding="UTF-8") as file:
-                file.write(str(self.player.score))
+        if not self.keepScores:
+            return
+        if not self.scores:
+            self.scores = scoreStore.ScoreWriter()
+        hash = scoreStore.configHash(self.world.config)
+        self.scores.submit(scoreStore.RunRecord(
+            score=self.player.score,
+            duration=round(self.world.time, 3),
+            waves=self.world.waves.waves,
+            configHash=hash,
+            ranked=scoreStore.isRanked(self.world.config, self.seeded, self.deterministic, self.realTime()),
+            seed=self.world.seed
+        ))
+    
+    def realTime(self) -> bool:
+        """Checks if the game runs at the speed of the wall clock, only those runs can be ranked
+
+        Returns:
+            bool: True for an unscaled real time clock
+        """
+        return type(self.clock) is gameClock.RealTimeClock and self.clock.scale == 1.0
+    
+    def startupDone(
+        self, 
+        profiler: startupProfiler.StartupProfiler
+    ) -> None:
+        """Reports the startup once the first frame is painted, with every phase if it took too long
+
+        Args:
+            profiler (startupProfiler.StartupProfiler): The finished startup
+        """
+        total = profiler.report()["total"]
+        if self.config.SB > 0 and total > self.config.SB:
+            print(f"Startup took {total:.0f} ms, more than STARTUP_BUDGET ({self.config.SB} ms):")
+            print(profiler.format(self.config.SB))
+        elif self.config.PO:
+            print(f"Startup:\n{profiler.format(self.config.SB)}")
+        else:
+            print(f"First frame after {total:.0f} ms")
+    
+    def closeScores(self) -> None:
+        """Writes the runs that are still queued and stops the score writer
+        """
+        if self.scores:
+            self.scores.close()
     
     def displayFPS(self) -> None:
         """Counts and displays FPS if needed
         """
         self.frameCount += 1
-        elapsedTime = self.elapsedTimer.elapsed()
+        now = self.clock.real()
         
-        if elapsedTime >= 1000: # ms
+        if now - self.fpsSince >= 1.0:
             fps = self.frameCount
-            self.elapsedTimer.restart()
+            self.fpsSince = now
             self.frameCount = 0
-            self.labels['FPSLabel'].setText(f"FPS: {fps:,}")
+            text = f"FPS: {fps:,}"
+            if self.loop.pacer:
+                split = self.loop.pacer.report()
+                text += f" (work {split['work']:.1f} ms, wait {split['wait']:.1f} ms)"
+            if self.governor:
+                text += f" | {self.governor.describe()}"
+            self.labels['FPSLabel'].setText(text)
+            self.labels['FPSLabel'].adjustSize()
+            if 'profilerLabel' in self.labels:
+                text = self.profiler.format()
+                if self.pool:
+                    stats = self.pool.stats()
+                    text += f"\npool      hits {stats['hits']}, misses {stats['misses']}, high-water {stats['highWater']}"
+                if self.dirty:
+                    report = self.dirty.report()
+                    text += (f"\ndirty     {report['rects']:.0f} rects -> {report['merged']:.1f}, "
+                             f"{report['pixels']:,.0f} px, {report['items']:.0f} items per update")
+                self.labels['profilerLabel'].setText(text)
+                self.labels['profilerLabel'].adjustSize()
+            self.checkConfig()
+    
+    def checkConfig(self) -> None:
+        """Applies _player.cfg again if it was edited while the game runs
+        """
+        if self.deterministic:
+            return # a recording has to keep the config it started with
+        config = configParser.reload()
+        if config is None:
+            return
+        print("Config changed, reloading")
+        self.config = config
+        self.world.applyConfig(config)
+        for view in self.entities:
+            view.config = self.world.config
+            if view.body and view.graphics['rect'].rect().width() != view.body.size:
+                view.graphics['rect'].setRect(0, 0, view.body.size, view.body.size)
+                view.graphics['trail'].size = view.body.size
+            view.graphics['trail'].setLength(self.trailLength())
+        if self.pool:
+            self.pool.applyConfig(self.world.config)
+        if self.horde:
+            self.horde.setLength(self.trailLength())
+        self.loop.setTargetFps(self.targetFps())
+        if self.governor:
+            self.governor.budget = self.qualityBudget()
+    
+    def targetFps(self) -> float:
+        """Gets the frame rate the game loop should pace to
+
+        Returns:
+            float: Frames per second, 0 for no pacing
+        """
+        if self.config.TFPS == configParser.DISPLAY_REFRESH:
+            screen = QGuiApplication.primaryScreen()
+            return screen.refreshRate() if screen and screen.refreshRate() > 0 else 60.0
+        return self.config.TFPS
+    
+    def qualityBudget(self) -> float:
+        """Gets the milliseconds of work a frame may take before the quality goes down
+
+        Returns:
+            float: QUALITY_BUDGET, or a whole frame at the target frame rate (60 FPS without one)
+        """
+        if self.config.QB > 0:
+            return self.config.QB
+        fps = self.targetFps()
+        return 1000 / (fps if fps > 0 else 60)
+    
+    def trailLength(self) -> int:
+        """Gets the length of the trails at the current quality
+
+        Returns:
+            int: Amount of positions, at least 1
+        """
+        quality = self.governor.quality if self.governor else qualityGovernor.LEVELS[0]
+        return max(1, round(self.config.TA * quality.trailScale))
+    
+    def applyQuality(self) -> None:
+        """Makes trails, enemy AI and the view follow the current quality level
+        """
+        quality = self.governor.quality if self.governor else qualityGovernor.LEVELS[0]
+        length = self.trailLength()
+        for view in self.entities:
+            trail = view.graphics['trail']
+            if trail is not None and trail.length != length:
+                trail.setLength(length)
+        if self.pool:
+            self.pool.setTrailScale(quality.trailScale)
+        if self.horde:
+            self.horde.setLength(length)
+        self.trailEvery = quality.trailEvery
+        if not self.deterministic:
+            self.world.enemies.farEvery = quality.farEvery # recordings have to play the same every time
+        self.graphicsView.setRenderHint(QPainter.Antialiasing, quality.antialiasing)
+    
+    def onTick(
+        self, 
+        events: list[tuple]
+    ) -> None:
+        """Reacts to the events of one simulation tick and extends the trails
+
+        Args:
+            events (list[tuple]): Events returned by World.step
+        """
+        for event in events:
+            if event[0] == "died" and self.player:
+                self.player.died.emit()
+            elif event[0] == "expired":
+                if event[1] in self.views:
+                    self.killEnemy(self.views[event[1]])
+                else:
+                    self.world.removeEnemy(event[1]) # drawn by the horde, no view to kill
+            elif event[0] == "wave":
+                print(f"Wave {event[1]} started")
+            elif event[0] == "warning":
+                if not self.waves:
+                    self.waves = enemyWaves.WaveWarnings(self.scene)
+                self.waves.showWarning(event[1], event[2])
+            elif event[0] == "warningDone" and self.waves:
+                self.waves.removeWarning(event[1])
+            elif event[0] == "spawned":
+                self.addEnemyViews(event[1])
+        self.profiler.lap("enemyAI")
+        
+        if self.world.ticks % self.trailEvery == 0:
+            for view in self.entities:
+                view.addTrajectory()
+            if self.horde:
+                self.horde.record()
+        self.profiler.lap("trails")
+        if self.replay and self.world.ticks >= self.replay.ticks:
+            self.finishReplay()
+    
+    def renderFrame(
+        self, 
+        alpha: float
+    ) -> None:
+        """Draws every entity between its last two ticks
+
+        Args:
+            alpha (float): Interpolation factor from the game loop
+        """
+        self.backend.render(alpha)
+        self.profiler.lap("render")
+        self.gameMonitor.update()
+        self.gameMonitor.apply()
+        self.displayFPS()
+        self.profiler.lap("hud")
+        if self.pool and self.pool.created < self.config.EPS:
+            self.pool.prewarm(self.config.EPS, enemyPool.PREWARM_STEP)
+        if self.governor and self.governor.update(self.profiler.lastFrame):
+            self.applyQuality()
+            print(f"Frames took {self.governor.average:.1f} ms of {self.governor.budget:.1f} ms, now {self.governor.describe()}")
     
     def addObject(
         self, 
-        obj: Union[models.DynamicPoint, models.DPAI]
+        obj: Union[models.DynamicPoint, models.DPAI], 
+        kind: str = entityRegistry.ENEMY
     ) -> None:
-        """Adds Object to the scene and dynamicObjects section
+        """Adds Object to the scene and the entity registry
 
         Args:
             obj (Union[models.DynamicPoint, models.DPAI]): All sorts of dynamic Objects
+            kind (str, optional): Kind in the registry. Defaults to entityRegistry.ENEMY.
 
         Raises:
             RuntimeError: If it couldn't be added for some reason, call this error. Might happen
                             due to a wrong class being entered
         """
         try:
-            self.objects['dynamicObjects'].append(obj)
+            self.entities.add(obj, kind)
+            self.views[obj.body] = obj
             self.scene.addItem(obj.graphics['rect'])
-            if obj.graphics['trail']:
+            if obj.graphics['trail'] is not None:
                 self.scene.addItem(obj.graphics['trail'])
         except Exception as e:
             raise RuntimeError(f"Couldn't add Item! {e}")
     
     def createPlayer(self) -> None:
-        """Creates the player. The player should always be added first!
+        """Creates the player
         """
-        # this should always be the first object added to the scene
-        player = models.Player("CENTER", "CENTER", self.objects['dynamicObjects'], self.scene)
+        player = models.Player(self.world.createPlayer(), self.scene)
         player.died.connect(self.killPlayer)
-        self.addObject(player)
-        self.player = self.objects['dynamicObjects'][0]
+        self.addObject(player, entityRegistry.PLAYER)
+        self.player = player
+        self.backend.viewAdded(player)
     
     def killPlayer(self) -> None:
         """Kills the player by removing the graphics objects and other data related to it
         """
         if self.player:
             self.save()
-            self.player.active = False
+            self.world.killPlayer()
             
-            length = len(self.player.graphics['trail'])
-            for _ in range(length):
-                self.scene.removeItem(self.player.graphics['trail'][0])
-                self.player.graphics['trail'].remove(self.player.graphics['trail'][0])
+            self.scene.removeItem(self.player.graphics['trail'])
+            self.player.graphics['trail'] = None
             
             self.scene.removeItem(self.player.graphics['rect'])
             self.player.graphics['rect'] = None
-            self.objects['dynamicObjects'].remove(self.player)
+            self.entities.remove(self.player)
+            self.views.pop(self.player.body, None)
             self.player = None
     
     def killEnemy(
         self, 
         enemy: models.DPAI
     ) -> None:
-        """Kills a specific enemy by removing the graphics object
-        and stopping timers and deleting it off of the data in the app
+        """Kills a specific enemy by removing it from the world
+        and handing its graphics back to the pool
 
         Args:
             enemy (models.DPAI): AI Enemy
         """
-        print(f"Removing enemy {enemy} from scene")
-        enemy.destructionTimer.stop()
-        enemy.timer.stop()
-        
-        if enemy.graphics['rect']:
-            self.scene.removeItem(enemy.graphics['rect'])
-            enemy.graphics['rect'] = None
-        if enemy.graphics['trail']:
-            for point in enemy.graphics['trail']:
-                self.scene.removeItem(point)
-            enemy.graphics['trail'] = []
-        
-        self.objects['dynamicObjects'].remove(enemy)
-        del enemy
-    
-    def spawnCircle(
-        self, 
-        circle: QGraphicsEllipseItem
-    ) -> None:
-        """Adds a circle to the Scene
-
-        Args:
-            circle (QGraphicsEllipseItem): A certain EllipseItem
-        """
-        self.scene.addItem(circle)
-    
-    def killCircle(
-        self, 
-        circle: QGraphicsEllipseItem
-    ) -> None:
-        """Removes circle from the scene
-
-        Args:
-            circle (QGraphicsEllipseItem): A specific EllipseItem
-        """
-        self.scene.removeItem(circle)
+        self.world.removeEnemy(enemy.body)
+        self.entities.remove(enemy)
+        self.views.pop(enemy.body, None)
+        self.pool.release(enemy)
     
     def spawnEnemy(
         self, 
@@ -268,9 +511,37 @@ class Window(Ui_Frame):
         if self.player is None:
             raise RuntimeError("Player not created yet!")
         
-        ai = models.DPAI(x, y, self.scene, self.enemies(), self.player)
-        ai.removeSelfSignal.connect(self.killEnemy)
-        self.addObject(ai)
+        self.addEnemyView(self.world.spawnEnemy(x, y))
+    
+    def addEnemyView(
+        self, 
+        body: simulation.EnemyState
+    ) -> None:
+        """Creates the graphics of an enemy that already exists in the world
+
+        Args:
+            body (simulation.EnemyState): The simulated enemy
+        """
+        if self.horde:
+            return # the HordeItem reads the body straight from the world
+        
+        ai = self.pool.acquire(body, self.player)
+        self.entities.add(ai, entityRegistry.ENEMY)
+        self.views[body] = ai
+    
+    def addEnemyViews(
+        self, 
+        bodies: list[simulation.EnemyState]
+    ) -> None:
+        """Creates the graphics of a whole batch of enemies in one pass
+
+        Args:
+            bodies (list[simulation.EnemyState]): The simulated enemies
+        """
+        if self.horde:
+            return
+        for body in bodies:
+            self.addEnemyView(body)
     
     def spawnMultipleEnemies(
         self, 
@@ -287,50 +558,90 @@ class Window(Ui_Frame):
         if self.player is None:
             raise RuntimeError("Player not created yet!")
         
-        for pos in positions:
-            ai = models.DPAI(pos[0], pos[1], self.scene, self.enemies(), self.player)
-            self.addObject(ai)
+        self.addEnemyViews(self.world.spawnEnemies(positions))
     
     def spawnWave(self) -> None:
-        """Spawns a wave of enemies
+        """Starts the next wave right away instead of waiting for the wave timer
         """
-        if self.waves.waveType > len(self.waves.types) - 1:
-            self.waves.waveType = 0
-        self.waves.start()
-        
-        self.waves.enemyCount += 1
-        self.player.step *= 2
+        self.world.scheduleWave()
     
-    def movePlayer(
+    def readInput(self) -> int:
+        """Gives the game loop the keys of the next tick.
+        Comes from the replay when playing one, and gets recorded when recording.
+
+        Returns:
+            int: Bitmask of simulation.KEY_* values
+        """
+        tick = self.world.ticks
+        if self.replay:
+            keys = self.replay.keysAt(tick)
+        else:
+            keys = self.keys.sample()
+        if self.recorder:
+            self.recorder.record(tick, keys)
+        return keys
+    
+    def finishReplay(self) -> None:
+        """Stops the game when the replay ran out of ticks
+        """
+        if self.loop.running:
+            self.loop.stop()
+            print(f"Replay finished after {self.world.ticks:,} ticks, score {self.world.player.score}")
+    
+    def saveRecording(self) -> None:
+        """Writes the replay file if this session was recorded
+        """
+        if self.recorder:
+            self.recorder.save(self.recordPath)
+            print(f"Replay saved to {self.recordPath}")
+    
+    def saveProfile(self) -> None:
+        """Writes the frame phase statistics if a file was given
+        """
+        if self.profilePath:
+            self.profiler.dumpCsv(self.profilePath)
+            print(f"Frame profile saved to {self.profilePath}")
+    
+    def testing2(
         self, 
-        XDirection: int, 
-        YDirection: int
+        count: int = 10
     ) -> None:
-        """Moves the player graphically using a direction vector
+        """Spawns enemies at random positions, all in one batch
 
         Args:
-            XDirection (int): Direction on the x-axis
-            YDirection (int): Direction on the y-axis
+            count (int, optional): Amount of enemies. Defaults to 10.
         """
-        if XDirection == -10 and YDirection == -10: self.killPlayer()
-        if self.player and self.player.active:
-            self.player.playerMove(XDirection, YDirection)
-    
-    def testing2(self) -> None:
-        for _ in range(10):
-            ai = models.DPAI("RANDOM", "RANDOM", self.scene, self.enemies(), self.player)
-            self.addObject(ai)
+        self.spawnMultipleEnemies([self.world.resolvePosition("RANDOM", "RANDOM", self.config.ES) for _ in range(count)])
     
     def testing3(self) -> None:
-        self.player.setPosition(self.player.pos[0] + random.randint(-10, 10), self.player.pos[1] + random.randint(-10, 10))
+        self.player.setPosition(self.player.pos[0] + self.world.rng.randint(-10, 10), self.player.pos[1] + self.world.rng.randint(-10, 10))
 
 if __name__ == "__main__":
-    app = QtWidgets.QApplication(sys.argv)
+    if platform.system() == "Linux": raise RuntimeError("This game does not run on Linux. Sorry Luke & DNA, get a real OS. 😉")
+    
+    import argparse
+    parser = argparse.ArgumentParser(description="DotEXE")
+    parser.add_argument("--seed", type=int, help="seed of the game")
+    parser.add_argument("--record", metavar="FILE", help="record this session to a replay file")
+    parser.add_argument("--replay", metavar="FILE", help="play a replay file instead of reading the keyboard")
+    parser.add_argument("--profile", metavar="FILE", help="write the frame phase statistics to a CSV file on exit")
+    parser.add_argument("--render", choices=renderBackends.BACKENDS, help="render backend, overrides RENDER_MODE")
+    parser.add_argument("--clock", choices=gameClock.CLOCKS, help="real time, a fixed step per frame or as fast as possible")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="game seconds per second, unranked if not 1")
+    args, qtArgs = parser.parse_known_args()
+    
+    app = QtWidgets.QApplication(sys.argv[:1] + qtArgs)
+    startupProfiler.STARTUP.mark("qt")
     Form = QtWidgets.QMainWindow()
     
-    ui = Window(Form)
+    clock = gameClock.create(args.clock or "real", args.time_scale) if args.clock or args.time_scale != 1.0 else None
+    ui = Window(Form, args.seed, args.record, args.replay, profilePath=args.profile, renderMode=args.render, clock=clock)
+    app.aboutToQuit.connect(ui.saveRecording)
+    app.aboutToQuit.connect(ui.saveProfile)
+    app.aboutToQuit.connect(ui.closeScores)
     
     Form.show()
+    startupProfiler.STARTUP.mark("show")
     sys.exit(app.exec_())
 
 # TODO:     Split up Config into different sections for certain files
@@ -1,20 +1,30 @@
-import random
-import math
-from typing import Union
 from PyQt5.QtWidgets import (
+    QGraphicsItem,
     QGraphicsRectItem,
     QGraphicsScene,
 )
 from PyQt5.QtGui import (
     QColor, 
     QBrush,
+    QFont,
+    QImage,
+    QPainter,
+    QStaticText,
 )
+from PyQt5 import QtCore
 from PyQt5.QtCore import (
-    QTimer, 
     QObject,
+    QRectF,
     pyqtSignal
 )
-from configParser import Config
+from typing import Optional
+from enemyStore import EnemyStore
+from simulation import (
+    Body,
+    EnemyState,
+    PlayerState,
+    World,
+)
 
 class Position:
     """This is a goofy little class to save a position in a list
@@ -26,110 +36,538 @@ class Position:
     ) -> None:
         self.pos = [x, y]
 
-class DynamicPoint(Position):
-    """This is what the Player-class is based on.
-    A point, which inherits the position variable,
-    which is able to move, apply forces on like friction and other
-    stuff which could be beneficial for a player.
+class TrailItem(QGraphicsItem):
+    """The whole trail of one entity as a single graphics item.
+    
+    The last positions are kept in a fixed-size ring buffer and
+    painted oldest to newest, fading in towards the entity. Pushing a
+    position only overwrites one slot and schedules a repaint, the
+    scene never sees new items. The covered area is kept up to date
+    with every push and only searched again when the position that
+    falls out was on its edge.
 
-    Args:
-        Position (Position): Position class
+    Without a scene index the bounding rect is that area, so
+    repainting one spot of the arena doesn't repaint every trail. A
+    BSP index would have to re-insert the item whenever its bounding
+    rect changes, so in a BSP-indexed scene the bounding rect stays the
+    whole arena and pushes only repaint the covered area.
+    """
+    def __init__(
+        self, 
+        length: int, 
+        size: int, 
+        color: QColor, 
+        bounds: QRectF
+    ) -> None:
+        """Initiates the TrailItem
+
+        Args:
+            length (int): Amount of positions the trail remembers
+            size (int): Width and height of a trail square
+            color (QColor): Color of the newest square, older ones fade out
+            bounds (QRectF): Area the trail can ever be drawn in (the arena)
+        """
+        super().__init__()
+        self.length = length
+        self.size = size
+        self.color = QColor(color)
+        self.bounds = QRectF(bounds)
+        self.extent = QRectF()  # area covered by the stored positions
+        self.fixed = False      # bounding rect is the whole arena, see setFixedBounds
+        self.minX = self.minY = self.maxX = self.maxY = 0.0 # corners of the stored positions
+        
+        self.xs = [0.0] * length
+        self.ys = [0.0] * length
+        self.head = 0   # next slot to write
+        self.count = 0
+        self.setZValue(-1) # below the squares
+    
+    def boundingRect(self) -> QRectF:
+        return self.bounds if self.fixed else self.extent
+    
+    def itemChange(
+        self, 
+        change: QGraphicsItem.GraphicsItemChange, 
+        value
+    ):
+        if change == QGraphicsItem.ItemSceneHasChanged and value is not None:
+            self.setFixedBounds(value.itemIndexMethod() == QGraphicsScene.BspTreeIndex)
+        return super().itemChange(change, value)
+    
+    def setFixedBounds(
+        self, 
+        fixed: bool
+    ) -> None:
+        """Keeps the bounding rect at the whole arena (for BSP-indexed scenes)
+        or lets it follow the trail
+
+        Args:
+            fixed (bool): True for the whole arena
+        """
+        if fixed != self.fixed:
+            self.prepareGeometryChange()
+            self.fixed = fixed
+    
+    def setExtent(
+        self, 
+        extent: QRectF
+    ) -> None:
+        """Moves the covered area and repaints where the trail was and is now
+
+        Args:
+            extent (QRectF): The new area
+        """
+        if self.fixed:
+            if not self.extent.isEmpty(): # an empty rect would repaint the whole arena
+                self.update(self.extent)
+            self.extent = extent
+        elif extent != self.extent:
+            self.prepareGeometryChange() # repaints the old area
+            self.extent = extent
+        if not extent.isEmpty():
+            self.update(extent)
+    
+    def setLength(
+        self, 
+        length: int
+    ) -> None:
+        """Changes the length of the trail, keeping the newest positions
+
+        Args:
+            length (int): New amount of positions
+        """
+        positions = list(self.positions())[-length:]
+        self.length = length
+        self.xs = [0.0] * length
+        self.ys = [0.0] * length
+        self.head = 0
+        self.count = 0
+        for x, y in positions:
+            self.push(x, y)
+    
+    def clear(self) -> None:
+        """Forgets every position
+        """
+        self.head = 0
+        self.count = 0
+        self.setExtent(QRectF())
+    
+    def push(
+        self, 
+        x: float, 
+        y: float
+    ) -> None:
+        """Adds a position, overwriting the oldest one when full
+
+        Args:
+            x (float): X-Position
+            y (float): Y-Position
+        """
+        if self.length == 0:
+            return
+        head = self.head
+        full = self.count == self.length
+        oldX, oldY = self.xs[head], self.ys[head]
+        self.xs[head] = x
+        self.ys[head] = y
+        self.head = (head + 1) % self.length
+        if not full:
+            self.count += 1
+
+        if self.count == 1 or (full and (oldX in (self.minX, self.maxX) or oldY in (self.minY, self.maxY))):
+            self.measure() # the dropped position may have been holding up an edge
+        else:
+            self.minX, self.maxX = min(self.minX, x), max(self.maxX, x)
+            self.minY, self.maxY = min(self.minY, y), max(self.maxY, y)
+        # everything fades one step, so repaint where the trail was and where it is now
+        self.setExtent(self.dirtyRect().intersected(self.bounds))
+    
+    def positions(self):
+        """Yields the positions from oldest to newest
+        
+        Yields:
+            tuple: (x, y) position
+        """
+        start = (self.head - self.count) % self.length if self.length else 0
+        for i in range(self.count):
+            index = (start + i) % self.length
+            yield self.xs[index], self.ys[index]
+    
+    def measure(self) -> None:
+        """Finds the corners of the stored positions by looking at all of them
+        """
+        if self.count == self.length:
+            xs, ys = self.xs, self.ys
+        else:
+            xs, ys = zip(*self.positions())
+        self.minX, self.maxX = min(xs), max(xs)
+        self.minY, self.maxY = min(ys), max(ys)
+    
+    def dirtyRect(self) -> QRectF:
+        """Gets the rectangle around every stored position
+
+        Returns:
+            QRectF: Area covered by the trail
+        """
+        if self.count == 0:
+            return QRectF()
+        x, y = self.minX, self.minY
+        return QRectF(x, y, self.maxX - x + self.size, self.maxY - y + self.size)
+    
+    def paint(
+        self, 
+        painter: QPainter, 
+        option, 
+        widget=None
+    ) -> None:
+        """Paints the trail, computing the fade while painting
+        """
+        if self.count == 0:
+            return
+        painter.setPen(QtCore.Qt.NoPen)
+        color = QColor(self.color)
+        alpha = self.color.alpha()
+        size = self.size
+        for i, (x, y) in enumerate(self.positions()):
+            color.setAlpha(alpha * (i + 1) // self.count)
+            painter.fillRect(QRectF(x, y, size, size), color)
+
+class HordeItem(QGraphicsItem):
+    """Draws every enemy and its trail in one item with batched drawRects calls.
+    
+    Instead of one QGraphicsRectItem per enemy (and per trail point),
+    this reads the packed position arrays of the EnemyStore. The trail
+    is a ring buffer of whole-horde snapshots, one per tick, whose
+    rectangles are built once when recorded and reused by every paint.
     """
     def __init__(
         self, 
-        x: int,
-        y: int,
+        enemies: EnemyStore, 
+        trailLength: int, 
+        color: QColor = QColor(255, 0, 0), 
+        trailColor: QColor = QColor(255, 0, 0, 120)
+    ) -> None:
+        """Initiates the HordeItem
+
+        Args:
+            enemies (EnemyStore): The enemies to draw
+            trailLength (int): Amount of ticks the trail remembers
+            color (QColor, optional): Color of the enemies. Defaults to QColor(255, 0, 0).
+            trailColor (QColor, optional): Color of the newest trail snapshot. Defaults to QColor(255, 0, 0, 120).
+        """
+        super().__init__()
+        self.enemies = enemies
+        self.color = QColor(color)
+        self.trailColor = QColor(trailColor)
+        self.alpha = 1.0
+        self.bounds = QRectF()
+        
+        self.snapshots = [[] for _ in range(trailLength)]
+        self.snapshotBounds = [QRectF() for _ in range(trailLength)]
+        self.head = 0
+    
+    def boundingRect(self) -> QRectF:
+        return self.bounds
+    
+    def rects(
+        self, 
+        positions, 
+        sizes
+    ) -> list[QRectF]:
+        """Turns a packed position array into rectangles
+
+        Args:
+            positions (np.ndarray): Array of shape (n, 2)
+            sizes (np.ndarray): Sizes of the squares
+
+        Returns:
+            list[QRectF]: One rectangle per position
+        """
+        return [QRectF(x, y, size, size) for (x, y), size in zip(positions.tolist(), sizes.tolist())]
+    
+    def extent(
+        self, 
+        positions, 
+        sizes
+    ) -> QRectF:
+        """Gets the rectangle around a packed position array
+
+        Args:
+            positions (np.ndarray): Array of shape (n, 2)
+            sizes (np.ndarray): Sizes of the squares
+
+        Returns:
+            QRectF: Combined bounding rect
+        """
+        if len(positions) == 0:
+            return QRectF()
+        x0, y0 = positions.min(axis=0)
+        x1, y1 = (positions + sizes[:, None]).max(axis=0)
+        return QRectF(x0, y0, x1 - x0, y1 - y0)
+    
+    def record(self) -> None:
+        """Stores the positions of this tick as the newest trail snapshot
+        """
+        if not self.snapshots:
+            return
+        count = self.enemies.count
+        positions = self.enemies.pos[:count]
+        sizes = self.enemies.size[:count]
+        self.snapshots[self.head] = self.rects(positions, sizes)
+        self.snapshotBounds[self.head] = self.extent(positions, sizes)
+        self.head = (self.head + 1) % len(self.snapshots)
+    
+    def setLength(
+        self, 
+        length: int
+    ) -> None:
+        """Changes how many ticks the trail remembers, keeping the newest snapshots
+
+        Args:
+            length (int): New amount of ticks
+        """
+        old = len(self.snapshots)
+        if length == old:
+            return
+        order = [(self.head + i) % old for i in range(max(old - length, 0), old)]
+        snapshots = [self.snapshots[i] for i in order]
+        bounds = [self.snapshotBounds[i] for i in order]
+        missing = length - len(snapshots)
+        self.snapshots = [[] for _ in range(missing)] + snapshots
+        self.snapshotBounds = [QRectF() for _ in range(missing)] + bounds
+        self.head = 0
+        self.update()
+    
+    def setAlpha(
+        self, 
+        alpha: float
+    ) -> None:
+        """Sets the interpolation of this frame and schedules a repaint
+
+        Args:
+            alpha (float): Interpolation between the last two ticks
+        """
+        self.alpha = alpha
+        count = self.enemies.count
+        bounds = self.extent(self.enemies.pos[:count], self.enemies.size[:count])
+        for rect in self.snapshotBounds:
+            bounds = bounds.united(rect)
+        if bounds != self.bounds:
+            self.prepareGeometryChange()
+            self.bounds = bounds
+        self.update()
+    
+    def paint(
+        self, 
+        painter: QPainter, 
+        option, 
+        widget=None
+    ) -> None:
+        """Paints all trail snapshots, oldest first, then all enemies
+        """
+        painter.setPen(QtCore.Qt.NoPen)
+        length = len(self.snapshots)
+        color = QColor(self.trailColor)
+        for i in range(length):
+            rects = self.snapshots[(self.head + i) % length]
+            if rects:
+                color.setAlpha(self.trailColor.alpha() * (i + 1) // length)
+                painter.setBrush(color)
+                painter.drawRects(rects)
+        
+        enemies = self.enemies
+        count = enemies.count
+        if count:
+            prev = enemies.prevPos[:count]
+            positions = prev + (enemies.pos[:count] - prev) * self.alpha
+            painter.setBrush(self.color)
+            painter.drawRects(self.rects(positions, enemies.size[:count]))
+
+class FrameBufferItem(HordeItem):
+    """Draws the whole frame into one reused QImage and blits it.
+    
+    The horde, its trail, the player and the player's trail are painted
+    into the back buffer in a single pass once per frame. The scene
+    only sees one item that never moves, so it has nothing to index or
+    sort, and repainting the view is a single image copy.
+    """
+    def __init__(
+        self, 
+        enemies: EnemyStore, 
+        trailLength: int, 
+        bounds: QRectF
+    ) -> None:
+        """Initiates the FrameBufferItem
+
+        Args:
+            enemies (EnemyStore): The enemies to draw
+            trailLength (int): Amount of ticks the trail remembers
+            bounds (QRectF): Area of the frame (the arena)
+        """
+        super().__init__(enemies, trailLength)
+        self.bounds = QRectF(bounds)
+        self.image = QImage(int(bounds.width()), int(bounds.height()), QImage.Format_ARGB32_Premultiplied)
+        self.image.fill(QtCore.Qt.transparent)
+        self.player: Optional['DynamicPoint'] = None
+        self.setZValue(-1) # above the labels, like the trails
+    
+    def setAlpha(
+        self, 
+        alpha: float
+    ) -> None:
+        """Draws the frame for this interpolation into the back buffer and schedules a repaint
+
+        Args:
+            alpha (float): Interpolation between the last two ticks
+        """
+        self.alpha = alpha
+        self.image.fill(QtCore.Qt.transparent)
+        painter = QPainter(self.image)
+        player = self.player
+        if player and player.graphics['trail'] is not None:
+            player.graphics['trail'].paint(painter, None)
+        super().paint(painter, None)
+        if player and player.graphics['rect'] is not None:
+            x, y = player.body.interpolate(alpha)
+            painter.fillRect(QRectF(x, y, player.size, player.size), player.brush)
+        painter.end()
+        self.update()
+    
+    def paint(
+        self, 
+        painter: QPainter, 
+        option, 
+        widget=None
+    ) -> None:
+        """Copies the back buffer onto the view
+        """
+        painter.drawImage(QtCore.QPointF(self.bounds.x(), self.bounds.y()), self.image)
+
+class StaticTextItem(QGraphicsItem):
+    """A line of text on a solid background with its layout cached.
+    
+    QLabel lays its text out again on every repaint. QStaticText does
+    that once per setText, so a big label that's redrawn every frame
+    but only changes a few times a second costs little.
+    """
+    def __init__(
+        self, 
+        rect: QRectF, 
+        font: QFont, 
+        color: QColor = QColor(255, 255, 255), 
+        background: QColor = QColor(0, 0, 0)
+    ) -> None:
+        """Initiates the StaticTextItem
+
+        Args:
+            rect (QRectF): Area of the background, the text is centered in it
+            font (QFont): Font of the text
+            color (QColor, optional): Color of the text. Defaults to QColor(255, 255, 255).
+            background (QColor, optional): Color of the background. Defaults to QColor(0, 0, 0).
+        """
+        super().__init__()
+        self.rect = QRectF(rect)
+        self.font = QFont(font)
+        self.color = QColor(color)
+        self.background = QColor(background)
+        self.text = QStaticText()
+        self.text.setPerformanceHint(QStaticText.AggressiveCaching)
+        self.offset = QtCore.QPointF()
+    
+    def boundingRect(self) -> QRectF:
+        return self.rect
+    
+    def setText(
+        self, 
+        text: str
+    ) -> None:
+        """Changes the text, laying it out only if it's different
+
+        Args:
+            text (str): The new text
+        """
+        if text == self.text.text():
+            return
+        self.text.setText(text)
+        self.text.prepare(font=self.font)
+        size = self.text.size()
+        self.offset = QtCore.QPointF(
+            self.rect.x() + (self.rect.width() - size.width()) / 2, 
+            self.rect.y() + (self.rect.height() - size.height()) / 2
+        )
+        self.update()
+    
+    def paint(
+        self, 
+        painter: QPainter, 
+        option, 
+        widget=None
+    ) -> None:
+        """Paints the background and the cached text
+        """
+        painter.fillRect(self.rect, self.background)
+        painter.setFont(self.font)
+        painter.setPen(self.color)
+        painter.drawStaticText(self.offset, self.text)
+
+class DynamicPoint:
+    """This is what the Player-class is based on.
+    It's the graphical view of a simulation.Body: the body owns
+    the position, speed and all the physics, while this class
+    draws it as a square with a trail.
+    """
+    def __init__(
+        self, 
+        body: Optional[Body],
         scene: QGraphicsScene,
         brush: QBrush = QBrush(QColor(255, 255, 255)),
-        trailBrush: QBrush = QBrush(QColor(120, 120, 120, 120))
+        trailBrush: QBrush = QBrush(QColor(120, 120, 120, 120)),
+        world: Optional[World] = None
     ) -> None:
         """This initiates the DynamicPoint class
 
         Args:
-            x (int): X-Position
-            y (int): Y-Position
+            body (Optional[Body]): The simulated body this point displays, None to bind one later
             scene (QGraphicsScene): Graphicsscene it should be added to
             brush (QBrush, optional): Color of the square. Defaults to QBrush(QColor(255, 255, 255)).
             trailBrush (QBrush, optional): Color of the trail. Defaults to QBrush(QColor(120, 120, 120, 120)).
+            world (Optional[World], optional): World of the body, only needed without a body. Defaults to None.
         """
-        self.config = Config("player", "enemy")
+        world = body.world if body else world
+        self.config = world.config
+        self.body = body
         self.scene = scene
         
-        self.speed = [0, 0]
-        
-        self.size = self.config.SIZE
-        self.maxSpeed = self.config.MS
-        self.acceleration = self.config.ACC
-        self.frictionAmplifier = self.config.FA
-        self.minimumSpeed = self.config.MST
-        
         self.brush = brush
         self.trailBrush = trailBrush
         
+        size = body.size if body else self.config.ES
         self.graphics = {
-            'rect': QGraphicsRectItem(0, 0, self.size, self.size),
-            'trail': [],
+            'rect': QGraphicsRectItem(0, 0, size, size),
+            'trail': TrailItem(self.config.TA, size, trailBrush.color(), QRectF(0, 0, world.width, world.height)),
         }
         self.graphics['rect'].setBrush(self.brush)
-        
-        super().__init__(x, y)
-        if isinstance(x, str):
-            self.interpretPosition(x)
-        elif isinstance(y, str):
-            self.interpretPosition(y)
+        if body:
+            self.graphics['rect'].setPos(self.pos[0], self.pos[1])
         
         # the lambda evaluates the values even when they change
         self.debugstring = lambda: f"DynamicPoint: {self.pos[0]}, {self.pos[1]} | Velocity: {self.speed[0]}, {self.speed[1]}, Trail-Position: {self.pos[0] - (self.speed[0] * 10)}, {self.pos[1] - (self.speed[1] * 10)}"
     
-    def interpretPosition(
-        self, 
-        types: str
-    ) -> None:
-        """Interprets the position if it's not a numerical value
-        
-        It is able to interpret different strings as a specific position
-        usually relative to the Graphicsscene.
-        
-        Supported types:
-        
-        - CENTER
-        - TOPLEFT
-        - TOPRIGHT
-        - BOTTOMLEFT
-        - BOTTOMRIGHT
-        - RANDOM
-
-        Args:
-            types (str): String to be interpreted
-        """
-        positions = {
-            "CENTER": (
-                self.scene.width() / 2 - self.size / 2,
-                self.scene.height() / 2 - self.size / 2
-            ),
-            "TOPLEFT": (
-                0, 
-                0
-            ),
-            "TOPRIGHT": (
-                self.scene.width() - self.size,
-                0
-            ),
-            "BOTTOMLEFT": (
-                0,
-                self.scene.height() - self.size
-            ),
-            "BOTTOMRIGHT": (
-                self.scene.width() - self.size,
-                self.scene.height() - self.size
-            ),
-            "RANDOM": (
-                random.randint(0, int(self.scene.width())) - self.size,
-                random.randint(0, int(self.scene.height())) - self.size
-            )
-        }
-        x, y = positions.get(types)
-        self.pos = [x, y]
+    @property
+    def pos(self) -> list:
+        return self.body.pos
+    
+    @pos.setter
+    def pos(self, value: list) -> None:
+        self.body.pos = value
+    
+    @property
+    def speed(self) -> list:
+        return self.body.speed
+    
+    @property
+    def size(self) -> int:
+        return self.body.size
     
     def setPosition(
         self, 
@@ -150,7 +588,7 @@ class DynamicPoint(Position):
         self, 
         x_dir: int, 
         y_dir: int
-    ) -> list:
+    ) -> tuple:
         """Validates the speed: is it higher/lower than the maximum/minimum?
 
         Args:
@@ -158,80 +596,16 @@ class DynamicPoint(Position):
             y_dir (int): Direction on the y-axis
 
         Returns:
-            list: List of speeds on the x- and y-axis
+            tuple: Speeds on the x- and y-axis
         """
-        xVel = max(-self.maxSpeed, min(self.speed[0] + x_dir * self.acceleration, self.maxSpeed))
-        yVel = max(-self.maxSpeed, min(self.speed[1] + y_dir * self.acceleration, self.maxSpeed))
-        return xVel, yVel
+        return self.body.validate_speed(x_dir, y_dir)
     
     def slowDownPlayer(self) -> None:
-        """This slows down the player if there's no direction vector given.
-        
-        This can happen when the player is not pressing any keys.
-        
-        This prevents the DynamicPoint to just drift off when you press nothing.
-        Therefore, it slows itself down to stand still.
-        
-        This automatically updates the graphics item.
+        """Slows down the body and updates the graphics item
         """
-        if self.speed[0] > 0:
-            self.speed[0] -= self.frictionAmplifier
-        elif self.speed[0] < 0:
-            self.speed[0] += self.frictionAmplifier
-        
-        if self.speed[1] > 0:
-            self.speed[1] -= self.frictionAmplifier
-        elif self.speed[1] < 0:
-            self.speed[1] += self.frictionAmplifier
-        
-        if abs(self.speed[0]) < self.minimumSpeed:
-            self.speed[0] = 0
-        if abs(self.speed[1]) < self.minimumSpeed:
-            self.speed[1] = 0
-        
+        self.body.slowDownPlayer()
         self.setGraphicsitem()
     
-    def applyFriction(
-        self, 
-        rawXDirection: float, 
-        rawYDirection: float
-    ) -> tuple:
-        """Applies friction to the raw direction vector values
-
-        Args:
-            rawXDirection (float): Direction on the x-axis
-            rawYDirection (float): Direction on the y-axis
-
-        Returns:
-            tuple: Direction in x- and y
-        """
-        if rawXDirection == 0 and rawYDirection == 0:
-            self.slowDownPlayer()
-            return 0, 0
-        
-        frictionX = rawXDirection - self.frictionAmplifier
-        frictionY = rawYDirection - self.frictionAmplifier
-        return frictionX, frictionY
-    
-    def calculateMovementSpeed(
-        self, 
-        XDirection: int, 
-        YDirection: int
-    ) -> list:
-        """Calculates the speed of the DynamicPoint
-
-        Args:
-            XDirection (int): Direction on the x-axis
-            YDirection (int): Direction on the y-axis
-
-        Returns:
-            list: [x, y] move in pixels
-        """
-        if XDirection == 0 and YDirection == 0:
-            self.slowDownPlayer()
-            return self.speed[0], self.speed[1]
-        return self.validate_speed(XDirection, YDirection)
-    
     def checkBounds(
         self, 
         newX: int | float, 
@@ -246,16 +620,7 @@ class DynamicPoint(Position):
         Returns:
             list: Returns rounded value of new position (because fuck floats)
         """
-        if newX < 0:
-            newX = 0
-        elif newX > self.scene.width() - self.size:
-            newX = self.scene.width() - self.size
-        
-        if newY < 0:
-            newY = 0
-        elif newY > self.scene.height() - self.size:
-            newY = self.scene.height() - self.size
-        return [round(newX), round(newY)]
+        return self.body.checkBounds(newX, newY)
     
     def move(
         self, 
@@ -268,49 +633,62 @@ class DynamicPoint(Position):
         direction on the x- and y-axis can only be either -1, 0 or 1
 
         Args:
-            XDirection (int): _description_
-            YDirection (int): _description_
+            XDirection (int): Direction on the x-axis
+            YDirection (int): Direction on the y-axis
+        """
+        self.body.move(XDirection, YDirection)
+        self.render()
+    
+    def render(self) -> None:
+        """Draws the current state of the body: new trail point and rectangle
         """
-        xVel, yVel = self.calculateMovementSpeed(XDirection, YDirection)
-        
-        newX = self.pos[0] + xVel
-        newY = self.pos[1] + yVel
-        
-        self.speed[0] = xVel
-        self.speed[1] = yVel
-        
-        self.pos = self.checkBounds(newX, newY)
         self.addTrajectory()
         self.setGraphicsitem()
     
-    def setGraphicsitem(self) -> None:
+    def setGraphicsitem(
+        self, 
+        alpha: float = 1.0
+    ) -> None:
         """Updates the graphicsitem by updating the rectangle and trail
+
+        Args:
+            alpha (float, optional): Interpolation between the last two ticks. Defaults to 1.0.
         """
-        if self.graphics:
-            self.graphics['rect'].setPos(self.pos[0], self.pos[1])
-            self.graphics['rect'].update()
-            self.renderTrajectory()
+        if self.graphics and self.graphics['rect']:
+            x, y = self.body.interpolate(alpha)
+            self.graphics['rect'].setPos(x, y) # schedules the repaint of the old and new spot
     
     def addTrajectory(self) -> None:
         """Adds a point to the trail
         """
-        x, y = self.pos
-        
-        TP = QGraphicsRectItem(x, y, self.size, self.size) # TP = trajectory point
-        TP.setBrush(self.trailBrush)
-        
-        if len(self.graphics['trail']) >= self.config.TA:
-            deprecatedPoint = self.graphics['trail'].pop(0)
-            self.scene.removeItem(deprecatedPoint)
-        
-        self.graphics['trail'].append(TP)
-        self.scene.addItem(TP)
+        if self.graphics['trail'] is not None:
+            self.graphics['trail'].push(*self.pos)
+    
+    def bind(
+        self, 
+        body: Body
+    ) -> None:
+        """Makes this point display another body and shows it,
+        so its graphics items can be reused instead of rebuilt
+
+        Args:
+            body (Body): The simulated body to display from now on
+        """
+        self.body = body
+        rect = self.graphics['rect']
+        if rect.rect().width() != body.size:
+            rect.setRect(0, 0, body.size, body.size)
+        self.graphics['trail'].clear()
+        self.setGraphicsitem()
+        rect.setVisible(True)
+        self.graphics['trail'].setVisible(True)
     
-    def renderTrajectory(self) -> None:
-        """Renders the trail
+    def unbind(self) -> None:
+        """Hides the point and lets go of its body
         """
-        for point in self.graphics['trail']:
-            point.update()
+        self.body = None
+        self.graphics['rect'].setVisible(False)
+        self.graphics['trail'].setVisible(False)
 
 class DPAI(DynamicPoint, QObject):   # dynamic point artificial intelligence
     """This is the enemy AI, it uses the DynamicPoint and QObject base
@@ -324,41 +702,27 @@ class DPAI(DynamicPoint, QObject):   # dynamic point artificial intelligence
     
     def __init__(
         self, 
-        x: int, 
-        y: int, 
+        body: Optional[EnemyState], 
         scene, 
-        enemies: list[DynamicPoint],
         player: DynamicPoint,
         brush: QBrush = QBrush(QColor(255, 0, 0)),
-        trailBrush: QBrush = QBrush(QColor(255, 0, 0, 120))
+        trailBrush: QBrush = QBrush(QColor(255, 0, 0, 120)),
+        world: Optional[World] = None
     ) -> None:
         """Initiates the Enemy AI
 
         Args:
-            x (int): X-Position
-            y (int): Y-Position
+            body (Optional[EnemyState]): Simulated state of this enemy, None to bind one later
             scene (_type_): Graphicsscene they're drawn to
-            enemies (list[DynamicPoint]): other enemies
             player (DynamicPoint): player
             brush (QBrush, optional): Color of the main rect. Defaults to QBrush(QColor(255, 0, 0)).
             trailBrush (QBrush, optional): Color of the trail. Defaults to QBrush(QColor(255, 0, 0, 120)).
+            world (Optional[World], optional): World of the body, only needed without a body. Defaults to None.
         """
-        super().__init__(x, y, scene, brush, trailBrush)
+        DynamicPoint.__init__(self, body, scene, brush, trailBrush, world)
         QObject.__init__(self)
         
         self.player = player
-        self.otherEnemies = enemies
-        self.maxSpeed = self.config.EMS
-        self.acceleration = self.config.EA
-        self.size = self.config.ES
-        
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.chasePlayer)
-        self.timer.start(25)
-        
-        self.destructionTimer = QTimer()
-        self.destructionTimer.timeout.connect(self.removeSelf)
-        self.destructionTimer.start(15000)  # 15 seconds
     
     def removeSelf(self) -> None:
         """Emits a signal to the Window class to remove 
@@ -366,49 +730,13 @@ class DPAI(DynamicPoint, QObject):   # dynamic point artificial intelligence
         """
         self.removeSelfSignal.emit(self)
     
-    def getDirectionalVector(
-        self, 
-        targetX: int, 
-        targetY: int
-    ) -> list[float]:
-        """Gets the direction vector to a position
-
-        Args:
-            targetX (int): X-Position
-            targetY (int): Y-Position
-
-        Returns:
-            list[float]: direction vector
-        """
-        dx = targetX - self.pos[0]     # difference in x
-        dy = targetY - self.pos[1]     # difference in y
-        distance = math.hypot(dx, dy)  # distance
-
-        if distance == 0:
-            return [0.0, 0.0]
-        return self.addWander(dx / distance, dy / distance)
-    
-    def addWander(
-        self, 
-        xDir: float, 
-        yDir: float
-    ) -> list[float]:
-        """Adds a little bit of wander to the movement
-
-        Args:
-            xDir (float): Raw direction on the x-axis
-            yDir (float): Raw direction on the y-axis
-
-        Returns:
-            list[float]: New x and y directions
-        """
-        return [xDir + random.uniform(-0.25, 0.25), yDir + random.uniform(-0.25, 0.25)]
-    
     def chasePlayer(self) -> None:
-        """Tells the Enemy to chase the player
+        """Tells the Enemy to chase the player for one tick.
+        The game loop does this for all enemies through the World,
+        this is for moving a single enemy by hand.
         """
-        xDir, yDir = self.getDirectionalVector(self.player.pos[0], self.player.pos[1])
-        self.move(xDir, yDir)
+        self.body.chase(self.player.body)
+        self.render()
 
 class Player(DynamicPoint, QObject):
     """This is the Player: it inherits the DynamicPoint 
@@ -418,9 +746,7 @@ class Player(DynamicPoint, QObject):
     
     def __init__(
         self, 
-        x: int, 
-        y: int,
-        enemies: list[DPAI], 
+        body: PlayerState, 
         scene,
         brush = QBrush(QColor(255, 255, 255)),
         trailBrush = QBrush(QColor(255, 255, 255, 120))
@@ -428,24 +754,45 @@ class Player(DynamicPoint, QObject):
         """Initiates the player
 
         Args:
-            x (int): X-Position
-            y (int): Y-Position
-            enemies (list[DPAI]): List of enemies in the game
+            body (PlayerState): Simulated state of the player
             scene (_type_): Graphicsscene it should be drawn to
             brush (_type_, optional): Color of the square. Defaults to QBrush(QColor(255, 255, 255)).
             trailBrush (_type_, optional): Color of the trail. Defaults to QBrush(QColor(255, 255, 255, 120)).
         """
-        super().__init__(x, y, scene, brush, trailBrush)
+        DynamicPoint.__init__(self, body, scene, brush, trailBrush)
         QObject.__init__(self)
-        
-        self.scene = scene
-        self.enemies = lambda: enemies[1:] if len(enemies) > 1 else []
-        
-        self.active = True
-        self.hp = self.config.HP
-        self.maxHP = self.config.MHP
-        self.score = 0
-        self.step = 0.01
+    
+    @property
+    def active(self) -> bool:
+        return self.body.active
+    
+    @active.setter
+    def active(self, value: bool) -> None:
+        self.body.active = value
+    
+    @property
+    def hp(self) -> int:
+        return self.body.hp
+    
+    @property
+    def maxHP(self) -> int:
+        return self.body.maxHP
+    
+    @property
+    def score(self) -> float:
+        return self.body.score
+    
+    @score.setter
+    def score(self, value: float) -> None:
+        self.body.score = value
+    
+    @property
+    def step(self) -> float:
+        return self.body.step
+    
+    @step.setter
+    def step(self, value: float) -> None:
+        self.body.step = value
     
     def collidesWithItem(
         self, 
@@ -459,12 +806,7 @@ class Player(DynamicPoint, QObject):
         Returns:
             bool: True if collides, False if not
         """
-        if (self.pos[0] < item.pos[0] + item.size and
-            self.pos[0] + self.size > item.pos[0] and
-            self.pos[1] < item.pos[1] + item.size and
-            self.pos[1] + self.size > item.pos[1]):
-            return True
-        return False
+        return self.body.collidesWith(item.body)
     
     def checkCollisions(self) -> bool:
         """Checks if there any collisions with other enemies
@@ -472,11 +814,7 @@ class Player(DynamicPoint, QObject):
         Returns:
             bool: True if collides, False if not
         """
-        for obj in self.enemies():
-            if self.collidesWithItem(obj):
-                print(f"Collision detected with {obj} at {self.pos[0]}, {self.pos[1]}")
-                return True
-        return False
+        return self.body.checkCollisions()
     
     def playerMove(
         self, 
@@ -489,11 +827,10 @@ class Player(DynamicPoint, QObject):
             xDir (int): Direction on the x-axis
             yDir (int): Direction on the y-axis
         """
-        self.move(xDir, yDir)
-        if self.checkCollisions():
-            self.hp -= 1
-            if self.hp <= 0:
-                self.died.emit()
+        died = self.body.playerMove(xDir, yDir)
+        self.render()
+        if died:
+            self.died.emit()
 
 class Line:
     def __init__(
@@ -505,12 +842,10 @@ class Line:
         assert size > 0 and isinstance(size, int), "Size must be a positive integer!"
 
 if __name__ == "__main__":
-    point = DynamicPoint(10, 10, None)
-    
-    
-    ai = DPAI(25, 25, None, [None], None)
-    p = Player(10, 10, [ai], None)
+    from simulation import World
     
-    print(f"size ai: {ai.size}, size player: {p.size}")
+    world = World(1000, 640)
+    point = DynamicPoint(world.createPlayer(), None)
+    ai = DPAI(world.spawnEnemy(25, 25), None, point)
     
-    p.checkCollisions()
\ No newline at end of file
+    print(f"size ai: {ai.size}, size player: {point.size}")
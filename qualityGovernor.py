@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """What one step of the QualityGovernor gives up
+    """
+    name: str
+    trailScale: float   # part of TRAIL_AMOUNT the trails keep
+    trailEvery: int     # ticks between two trail updates
+    farEvery: int       # horde moves between two AI updates of far enemies
+    antialiasing: bool
+
+# every level gives up a bit more than the one before
+LEVELS = (
+    QualityLevel("full", 1.0, 1, 1, True),
+    QualityLevel("shorter trails", 0.5, 1, 1, True),
+    QualityLevel("alternate trails", 0.5, 2, 1, True),
+    QualityLevel("slower far AI", 0.25, 2, 2, True),
+    QualityLevel("no antialiasing", 0.25, 2, 4, False),
+)
+
+class QualityGovernor:
+    """Lowers the quality when frames take longer than the budget
+    and raises it again once there is headroom.
+
+    Frame times are averaged over `window` frames. A window over the
+    budget steps down at once. Stepping up needs `restoreAfter` windows
+    in a row below `headroom` times the budget, so the level doesn't
+    flip back and forth around the budget.
+    """
+    def __init__(
+        self,
+        budget: float,
+        window: int = 30,
+        headroom: float = 0.6,
+        restoreAfter: int = 4
+    ) -> None:
+        """Initiates the QualityGovernor
+
+        Args:
+            budget (float): Milliseconds of work a frame may take
+            window (int, optional): Frames averaged before deciding. Defaults to 30.
+            headroom (float, optional): Part of the budget a window has to stay below to step up. Defaults to 0.6.
+            restoreAfter (int, optional): Windows in a row with headroom to step up. Defaults to 4.
+        """
+        self.budget = budget
+        self.window = window
+        self.headroom = headroom
+        self.restoreAfter = restoreAfter
+
+        self.level = 0
+        self.total = 0.0
+        self.frames = 0
+        self.calm = 0       # windows in a row with headroom
+        self.average = 0.0  # mean frame time of the last window
+
+    @property
+    def quality(self) -> QualityLevel:
+        return LEVELS[self.level]
+
+    def update(
+        self,
+        frameTime: float
+    ) -> bool:
+        """Adds the time of a frame and steps the level if needed
+
+        Args:
+            frameTime (float): Milliseconds of work of the last frame
+
+        Returns:
+            bool: True if the level changed
+        """
+        if frameTime <= 0:
+            return False
+        self.total += frameTime
+        self.frames += 1
+        if self.frames < self.window:
+            return False
+        self.average = self.total / self.frames
+        self.total = 0.0
+        self.frames = 0
+
+        if self.average > self.budget:
+            self.calm = 0
+            if self.level < len(LEVELS) - 1:
+                self.level += 1
+                return True
+        elif self.average < self.budget * self.headroom:
+            self.calm += 1
+            if self.calm >= self.restoreAfter and self.level > 0:
+                self.calm = 0
+                self.level -= 1
+                return True
+        else:
+            self.calm = 0
+        return False
+
+    def describe(self) -> str:
+        """Gets the level as text for the HUD and the logs
+
+        Returns:
+            str: e.g. "quality 2/4 (alternate trails)"
+        """
+        return f"quality {self.level}/{len(LEVELS) - 1} ({self.quality.name})"
+
+if __name__ == "__main__":
+    governor = QualityGovernor(budget=10.0, window=5)
+    load = [4.0] * 20 + [14.0] * 30 + [8.0] * 40 + [3.0] * 80
+    for frame, time in enumerate(load):
+        if governor.update(time):
+            print(f"frame {frame:>3}: {time:>4.1f} ms -> {governor.describe()}")
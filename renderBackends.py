@@ -0,0 +1,216 @@
+from PyQt5.QtWidgets import (
+    QGraphicsView,
+    QOpenGLWidget
+)
+from PyQt5.QtGui import (
+    QCursor,
+    QOpenGLContext
+)
+from PyQt5 import QtCore
+from typing import TYPE_CHECKING, Optional
+import models
+
+if TYPE_CHECKING:
+    from main import Window
+
+class ItemsBackend:
+    """Draws every entity as its own scene items on the raster viewport.
+
+    This is the base of every backend. A backend decides how the Window
+    turns the world into pixels: `setup` prepares the view and returns
+    the item that draws the whole horde, if the backend has one.
+    `render` runs once per frame.
+    """
+    name = "items"
+    fullRepaint = False # the viewport has to redraw everything, so dirty regions don't help
+
+    def __init__(
+        self,
+        window: 'Window'
+    ) -> None:
+        """Initiates the backend
+
+        Args:
+            window (Window): The window to draw
+        """
+        self.window = window
+        self.view: QGraphicsView = window.graphicsView
+
+    def setup(self) -> Optional[models.HordeItem]:
+        """Prepares the view
+
+        Returns:
+            Optional[models.HordeItem]: Item that draws every enemy, None if enemies get their own views
+        """
+        return None
+
+    def viewAdded(
+        self,
+        view: models.DynamicPoint
+    ) -> None:
+        """Called for the player's view once it's in the scene
+
+        Args:
+            view (models.DynamicPoint): The new view
+        """
+
+    def render(
+        self,
+        alpha: float
+    ) -> None:
+        """Moves everything to where it is at this point between two ticks
+
+        Args:
+            alpha (float): Interpolation factor from the game loop
+        """
+        for view in self.window.entities:
+            view.setGraphicsitem(alpha)
+        horde = self.window.horde
+        if horde:
+            horde.setAlpha(alpha)
+
+class BatchedBackend(ItemsBackend):
+    """Draws all enemies through one HordeItem with batched drawRects calls
+    """
+    name = "batched"
+
+    def setup(self) -> Optional[models.HordeItem]:
+        horde = models.HordeItem(self.window.world.enemies, self.window.config.TA)
+        self.window.scene.addItem(horde)
+        return horde
+
+class RasterBackend(ItemsBackend):
+    """Paints the whole frame into one reused QImage back buffer in a single pass
+    """
+    name = "raster"
+
+    def setup(self) -> Optional[models.HordeItem]:
+        self.frame = models.FrameBufferItem(self.window.world.enemies, self.window.config.TA, self.window.scene.sceneRect())
+        self.window.scene.addItem(self.frame)
+        return self.frame
+
+    def viewAdded(
+        self,
+        view: models.DynamicPoint
+    ) -> None:
+        # the back buffer draws the player, its own items only keep its state
+        view.graphics['rect'].hide()
+        view.graphics['trail'].hide()
+        self.frame.player = view
+
+    def render(
+        self,
+        alpha: float
+    ) -> None:
+        self.frame.setAlpha(alpha)
+
+class OpenGLBackend(ItemsBackend):
+    """Draws the scene items through a QOpenGLWidget viewport.
+
+    Needs a GL 2 driver and a display to create a context on. Without
+    a GPU, or on the offscreen platform, it isn't supported and the
+    game falls back to items. GL viewports have to redraw everything
+    every frame.
+    """
+    name = "opengl"
+    fullRepaint = True
+
+    def setup(self) -> Optional[models.HordeItem]:
+        if not QOpenGLContext().create():
+            raise RuntimeError("no OpenGL context")
+        view = self.view
+        cursor = view.viewport().cursor()
+        view.setViewport(QOpenGLWidget())
+        view.viewport().setCursor(QCursor(cursor))
+        view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        return None
+
+BACKENDS = {
+    "items": ItemsBackend,
+    "batched": BatchedBackend,
+    "raster": RasterBackend,
+    "opengl": OpenGLBackend,
+}
+
+def create(
+    window: 'Window',
+    name: str = "items"
+) -> tuple:
+    """Builds a backend and sets up the view for it.
+    Falls back to items if it can't be used.
+
+    Args:
+        window (Window): The window to draw
+        name (str, optional): Key of BACKENDS. Defaults to "items".
+
+    Returns:
+        tuple: (backend, horde item or None)
+    """
+    try:
+        backend = BACKENDS[name](window)
+        return backend, backend.setup()
+    except Exception as e:
+        if name == "items":
+            raise
+        print(f"Render backend {name!r} not available ({e!r}), using items")
+        backend = ItemsBackend(window)
+        return backend, backend.setup()
+
+def compare(
+    enemies: int = 500,
+    seconds: float = 3.0,
+    names: Optional[list] = None
+) -> dict:
+    """The comparison scene: the same seeded horde drawn by every backend, unpaced
+
+    Args:
+        enemies (int, optional): Enemies in the scene. Defaults to 500.
+        seconds (float, optional): Seconds each backend runs. Defaults to 3.0.
+        names (Optional[list], optional): Backends to measure. Defaults to all of them.
+
+    Returns:
+        dict: Backend -> fps, render (p50/p95 ms of moving and painting) and frame (p50/p95 ms)
+    """
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+    import main
+    app = QApplication.instance() or QApplication([])
+
+    results = {}
+    for name in names or BACKENDS:
+        form = QMainWindow()
+        window = main.Window(form, seed=1, useKeyboard=False, renderMode=name)
+        form.show()
+        window.player.body.hp = float("inf")
+        window.world.autoSpawn = False
+        window.governor = None
+        window.loop.setTargetFps(0)
+        window.spawnMultipleEnemies([(window.world.rng.randint(0, 990), window.world.rng.randint(0, 630)) for _ in range(enemies)])
+
+        QtCore.QTimer.singleShot(int(seconds * 1000), app.quit)
+        frames = window.profiler.frames
+        app.exec_()
+        window.loop.stop()
+        window.closeScores()
+
+        summary = window.profiler.summary()
+        results[window.backend.name if window.backend.name == name else f"{name} -> {window.backend.name}"] = {
+            "fps": (window.profiler.frames - frames) / seconds,
+            "render": {key: float(summary["render"][key]) for key in ("p50", "p95")},
+            "frame": {key: float(summary["frame"][key]) for key in ("p50", "p95")},
+        }
+        form.close()
+        form.deleteLater()
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Draws the same scene with every render backend and compares them")
+    parser.add_argument("--enemies", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0, help="seconds per backend")
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="only these backends")
+    args = parser.parse_args()
+
+    print(f"{'backend':<18} {'fps':>7} {'render p50':>11} {'render p95':>11} {'frame p50':>10} {'frame p95':>10}")
+    for name, result in compare(args.enemies, args.seconds, args.backend).items():
+        print(f"{name:<18} {result['fps']:>7.0f} {result['render']['p50']:>8.2f} ms {result['render']['p95']:>8.2f} ms "
+              f"{result['frame']['p50']:>7.2f} ms {result['frame']['p95']:>7.2f} ms")
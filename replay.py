@@ -0,0 +1,233 @@
+import bisect
+import gzip
+import json
+import sys
+import time
+from typing import Optional
+import simulation
+from configParser import Settings
+
+REPLAY_VERSION = 2  # 2: waves spawn from the wave timeline
+
+class ReplayRecorder:
+    """Records everything needed to play a session again:
+    the seed, the config snapshot and the keys held on every tick.
+
+    Only changes of the held keys are stored, each with its tick
+    and the wall-clock milliseconds since the recording started, so
+    stutters show up as gaps between tick time and wall time.
+    """
+    def __init__(
+        self,
+        seed: int,
+        config: Settings,
+        tickRate: int
+    ) -> None:
+        """Initiates the ReplayRecorder
+
+        Args:
+            seed (int): Seed of the recorded world
+            config (Settings): Config snapshot of the recorded world
+            tickRate (int): Ticks per second of the recorded world
+        """
+        self.seed = seed
+        self.config = config
+        self.tickRate = tickRate
+        self.inputs: list[list] = []    # [tick, keys, ms]
+        self.lastKeys: Optional[int] = None
+        self.ticks = 0
+        self.start = time.perf_counter()
+
+    def record(
+        self,
+        tick: int,
+        keys: int
+    ) -> None:
+        """Records the keys held on a tick
+
+        Args:
+            tick (int): Number of the tick (World.ticks before stepping)
+            keys (int): Bitmask of simulation.KEY_* values
+        """
+        if keys != self.lastKeys:
+            self.lastKeys = keys
+            self.inputs.append([tick, keys, round((time.perf_counter() - self.start) * 1000, 1)])
+        self.ticks = tick + 1
+
+    def save(
+        self,
+        path: str
+    ) -> None:
+        """Writes the replay as gzipped JSON
+
+        Args:
+            path (str): File to write
+        """
+        data = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "tickRate": self.tickRate,
+            "ticks": self.ticks,
+            "config": self.config.asDict(),
+            "inputs": self.inputs,
+        }
+        with gzip.open(path, "wt", encoding="UTF-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+
+class Replay:
+    """A recorded session that can drive a World tick by tick
+    """
+    def __init__(
+        self,
+        data: dict
+    ) -> None:
+        """Initiates the Replay
+
+        Args:
+            data (dict): Contents of a replay file
+
+        Raises:
+            ValueError: If the replay was written by an unknown version
+        """
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version {data.get('version')}")
+        self.seed = data["seed"]
+        self.tickRate = data["tickRate"]
+        self.ticks = data["ticks"]
+        self.config = Settings.fromDict(data["config"]) # older replays may have retired values
+        self.inputs = data["inputs"]
+        self.inputTicks = [entry[0] for entry in self.inputs]
+
+    @classmethod
+    def load(
+        cls,
+        path: str
+    ) -> 'Replay':
+        """Reads a replay file
+
+        Args:
+            path (str): File written by ReplayRecorder.save
+
+        Returns:
+            Replay: The loaded replay
+        """
+        with gzip.open(path, "rt", encoding="UTF-8") as file:
+            return cls(json.load(file))
+
+    def keysAt(
+        self,
+        tick: int
+    ) -> int:
+        """Gets the keys that were held on a tick
+
+        Args:
+            tick (int): Number of the tick
+
+        Returns:
+            int: Bitmask of simulation.KEY_* values
+        """
+        index = bisect.bisect_right(self.inputTicks, tick) - 1
+        return self.inputs[index][1] if index >= 0 else 0
+
+    def createWorld(self) -> simulation.World:
+        """Builds a world in the same state the recording started in
+
+        Returns:
+            simulation.World: World with the recorded config, seed and player
+        """
+        world = simulation.World(config=self.config, seed=self.seed)
+        world.createPlayer()
+        return world
+
+def summarize(
+    durations: list[float]
+) -> dict:
+    """Gets the usual statistics of a list of durations
+
+    Args:
+        durations (list[float]): Durations in seconds
+
+    Returns:
+        dict: mean, p50, p95, p99 and max in milliseconds
+    """
+    if not durations:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(durations)
+    pick = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+    return {
+        "mean": sum(ordered) / len(ordered) * 1000,
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1] * 1000,
+    }
+
+def playback(
+    replay: Replay
+) -> dict:
+    """Plays a replay headless at unlimited speed and measures every tick
+
+    Args:
+        replay (Replay): The replay to play
+
+    Returns:
+        dict: Tick cost statistics, throughput and the final game state
+    """
+    world = replay.createWorld()
+    dt = 1 / replay.tickRate
+    durations = []
+
+    start = time.perf_counter()
+    for tick in range(replay.ticks):
+        t0 = time.perf_counter()
+        world.step(dt, replay.keysAt(tick))
+        durations.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ticks": replay.ticks,
+        "ticksPerSecond": replay.ticks / elapsed if elapsed else 0.0,
+        "tick": summarize(durations),
+        "score": world.player.score,
+        "hp": world.player.hp,
+        "enemies": len(world.enemies),
+    }
+
+def compare(
+    old: dict,
+    new: dict
+) -> dict:
+    """Compares the tick costs of two playbacks of the same replay
+
+    Args:
+        old (dict): Result of playback() on the old build
+        new (dict): Result of playback() on the new build
+
+    Returns:
+        dict: Ratio new / old for every tick statistic (below 1 is faster)
+    """
+    return {key: (new["tick"][key] / old["tick"][key] if old["tick"][key] else float("inf"))
+            for key in old["tick"]}
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Plays DotEXE replays headless")
+    sub = parser.add_subparsers(dest="command", required=True)
+    play = sub.add_parser("play", help="play a replay and print its tick costs")
+    play.add_argument("replay")
+    play.add_argument("--out", help="also write the results as JSON")
+    diff = sub.add_parser("compare", help="compare two results written by play --out")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    args = parser.parse_args()
+
+    if args.command == "play":
+        result = playback(Replay.load(args.replay))
+        if args.out:
+            with open(args.out, "w", encoding="UTF-8") as file:
+                json.dump(result, file, indent=4)
+        json.dump(result, sys.stdout, indent=4)
+    else:
+        with open(args.old, encoding="UTF-8") as a, open(args.new, encoding="UTF-8") as b:
+            json.dump(compare(json.load(a), json.load(b)), sys.stdout, indent=4)
+    print()
@@ -0,0 +1,331 @@
+import functools
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+import configParser
+from configParser import Settings
+
+SCORE_PATH = "_player.db"
+LEGACY_PATH = "_player.data"    # the single highscore float of older versions
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score REAL NOT NULL,
+    duration REAL NOT NULL,
+    waves INTEGER NOT NULL,
+    configHash TEXT NOT NULL,
+    ranked INTEGER NOT NULL,
+    seed INTEGER,
+    playedAt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runsByScore ON runs (ranked, score DESC);
+CREATE INDEX IF NOT EXISTS runsByTop ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runsByConfig ON runs (configHash, score DESC);
+"""
+
+# values that only change how the game looks or runs, not how it plays
+PRESENTATION = {"FPSLS", "FI", "TFPS", "RM", "PO", "QG", "QB", "DR", "SI", "SB", "IB", "EPS"}
+
+def configHash(
+    config: Settings
+) -> str:
+    """Gets a short fingerprint of the values of a config that change the game
+
+    Args:
+        config (Settings): The snapshot
+
+    Returns:
+        str: 12 hex digits, equal for configs that play the same
+    """
+    values = {key: value for key, value in config.asDict().items() if key not in PRESENTATION}
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode("UTF-8")).hexdigest()[:12]
+
+# the _player.cfg the game ships with, only runs with it count for the ranked list
+SHIPPED_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin", configParser.CONFIG_PATH)
+
+def shippedConfig(
+    path: str = SHIPPED_CONFIG
+) -> Optional[Settings]:
+    """Parses the shipped config like the game parses _player.cfg, without replacing the game's snapshot
+
+    Args:
+        path (str, optional): The shipped file. Defaults to SHIPPED_CONFIG.
+
+    Returns:
+        Optional[Settings]: The snapshot, None if the file is missing
+    """
+    if not os.path.exists(path):
+        print(f"Shipped config {path!r} not found, no run can be ranked")
+        return None
+    return configParser.Config(path).settings()
+
+@functools.lru_cache(maxsize=None)
+def rankedConfig() -> Optional[Settings]:
+    """Gets the config of ranked runs, parsed when the first run is scored instead of on startup
+
+    Returns:
+        Optional[Settings]: The shipped snapshot, None if the file is missing
+    """
+    return shippedConfig()
+
+@functools.lru_cache(maxsize=None)
+def rankedHash() -> Optional[str]:
+    """Gets the fingerprint of the config of ranked runs
+
+    Returns:
+        Optional[str]: configHash of rankedConfig, None if there is none
+    """
+    config = rankedConfig()
+    return configHash(config) if config else None
+
+def isRanked(
+    config: Settings,
+    seeded: bool = False,
+    deterministic: bool = False,
+    realTime: bool = True
+) -> bool:
+    """Checks if a run counts for the ranked list
+
+    Args:
+        config (Settings): Config the run was played with
+        seeded (bool, optional): The seed was picked, so it could be practiced. Defaults to False.
+        deterministic (bool, optional): The run was recorded or replayed. Defaults to False.
+        realTime (bool, optional): The game ran at the speed of the wall clock. Defaults to True.
+
+    Returns:
+        bool: True if it's ranked
+    """
+    return not seeded and not deterministic and realTime and configHash(config) == rankedHash()
+
+@dataclass
+class RunRecord:
+    """One finished game
+    """
+    score: float
+    duration: float             # seconds of game time
+    waves: int
+    configHash: str
+    ranked: bool
+    seed: Optional[int] = None
+    playedAt: float = field(default_factory=time.time)
+
+class ScoreStore:
+    """Every finished run in a SQLite database.
+
+    The top-K and per-config queries read straight from an index
+    sorted by score, so they don't get slower with more runs. Every
+    write is one transaction, so a crash never leaves half a record.
+    A connection belongs to the thread that opened it.
+    """
+    def __init__(
+        self,
+        path: str = SCORE_PATH
+    ) -> None:
+        """Initiates the ScoreStore, creating the database if needed
+
+        Args:
+            path (str, optional): Database file. Defaults to SCORE_PATH.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def add(
+        self,
+        *records: RunRecord
+    ) -> None:
+        """Writes records in one transaction
+
+        Args:
+            records (RunRecord): The finished runs
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO runs (score, duration, waves, configHash, ranked, seed, playedAt) "
+                "VALUES (:score, :duration, :waves, :configHash, :ranked, :seed, :playedAt)",
+                [asdict(record) for record in records]
+            )
+
+    def top(
+        self,
+        k: int = 10,
+        ranked: Optional[bool] = None
+    ) -> list[RunRecord]:
+        """Gets the best runs
+
+        Args:
+            k (int, optional): Amount of runs. Defaults to 10.
+            ranked (Optional[bool], optional): Only ranked (True) or unranked (False) runs. Defaults to both.
+
+        Returns:
+            list[RunRecord]: Best first
+        """
+        if ranked is None:
+            rows = self.connection.execute("SELECT * FROM runs ORDER BY score DESC LIMIT ?", (k,))
+        else:
+            rows = self.connection.execute(
+                "SELECT * FROM runs WHERE ranked = ? ORDER BY score DESC LIMIT ?", (int(ranked), k))
+        return [self.record(row) for row in rows]
+
+    def forConfig(
+        self,
+        hash: str,
+        k: int = 10
+    ) -> list[RunRecord]:
+        """Gets the best runs played with one config
+
+        Args:
+            hash (str): Result of configHash
+            k (int, optional): Amount of runs. Defaults to 10.
+
+        Returns:
+            list[RunRecord]: Best first
+        """
+        rows = self.connection.execute(
+            "SELECT * FROM runs WHERE configHash = ? ORDER BY score DESC LIMIT ?", (hash, k))
+        return [self.record(row) for row in rows]
+
+    def best(
+        self,
+        ranked: Optional[bool] = None
+    ) -> float:
+        """Gets the highscore
+
+        Args:
+            ranked (Optional[bool], optional): Only ranked (True) or unranked (False) runs. Defaults to both.
+
+        Returns:
+            float: The best score, 0 without any runs
+        """
+        runs = self.top(1, ranked)
+        return runs[0].score if runs else 0
+
+    def migrate(
+        self,
+        path: str = LEGACY_PATH
+    ) -> bool:
+        """Imports the highscore of an old _player.data file once, as an unranked run
+
+        Args:
+            path (str, optional): The old file. Defaults to LEGACY_PATH.
+
+        Returns:
+            bool: True if a score was imported
+        """
+        if not os.path.exists(path) or self.connection.execute("SELECT 1 FROM runs WHERE configHash = 'legacy'").fetchone():
+            return False
+        with open(path, "r", encoding="UTF-8") as file:
+            content = file.read().strip()
+        if not content:
+            return False
+        self.add(RunRecord(float(content), 0.0, 0, "legacy", False, playedAt=os.path.getmtime(path)))
+        return True
+
+    def close(self) -> None:
+        """Closes the database
+        """
+        self.connection.close()
+
+    @staticmethod
+    def record(
+        row: sqlite3.Row
+    ) -> RunRecord:
+        """Turns a row back into a RunRecord
+        """
+        return RunRecord(row["score"], row["duration"], row["waves"], row["configHash"], bool(row["ranked"]), row["seed"], row["playedAt"])
+
+class ScoreWriter:
+    """Writes runs into a ScoreStore on its own thread.
+
+    `submit` only puts the record into a queue, so dying never waits
+    for the disk. The thread opens its own connection and writes
+    whatever queued up in one transaction.
+    """
+    def __init__(
+        self,
+        path: str = SCORE_PATH
+    ) -> None:
+        """Initiates the ScoreWriter and starts its thread
+
+        Args:
+            path (str, optional): Database file. Defaults to SCORE_PATH.
+        """
+        self.path = path
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="ScoreWriter", daemon=True)
+        self.thread.start()
+
+    def submit(
+        self,
+        record: RunRecord
+    ) -> None:
+        """Queues a run to be written
+
+        Args:
+            record (RunRecord): The finished run
+        """
+        self.queue.put(record)
+
+    def run(self) -> None:
+        """Writes queued runs until close() is called
+        """
+        store = ScoreStore(self.path)
+        store.migrate()
+        try:
+            while True:
+                record = self.queue.get()
+                records = []
+                while record is not None:
+                    records.append(record)
+                    try:
+                        record = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if records:
+                    try:
+                        store.add(*records)
+                    except sqlite3.Error as e:
+                        print(f"Couldn't save {len(records)} run(s): {e!r}")
+                if record is None:
+                    return
+        finally:
+            store.close()
+
+    def close(
+        self,
+        timeout: float = 2.0
+    ) -> None:
+        """Writes everything that's still queued and stops the thread
+
+        Args:
+            timeout (float, optional): Seconds to wait for the last write. Defaults to 2.0.
+        """
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Shows the DotEXE highscores")
+    parser.add_argument("--top", type=int, default=10, help="amount of runs")
+    parser.add_argument("--ranked", action="store_true", help="only ranked runs")
+    parser.add_argument("--config", metavar="HASH", help="only runs with this config hash")
+    parser.add_argument("--db", default=SCORE_PATH)
+    args = parser.parse_args()
+
+    store = ScoreStore(args.db)
+    store.migrate()
+    runs = store.forConfig(args.config, args.top) if args.config else store.top(args.top, True if args.ranked else None)
+    for rank, run in enumerate(runs, 1):
+        played = time.strftime("%Y-%m-%d %H:%M", time.localtime(run.playedAt))
+        print(f"{rank:>3}. {run.score:>20,.2f}  {run.duration:>7.1f}s  wave {run.waves:>3}  "
+              f"{run.configHash}  {'ranked' if run.ranked else 'unranked':<8}  {played}")
+    store.close()
@@ -0,0 +1,732 @@
+import random
+import time
+import numpy as np
+import utils
+from typing import Optional, Union
+import configParser
+from configParser import Settings
+from enemyStore import EnemyState, EnemyStore
+from frameProfiler import NULL_PROFILER
+from spatialHash import SpatialHash
+from waveScheduler import WaveScheduler
+
+SCORE_INTERVAL = 0.25   # seconds between score increments
+ENEMY_LIFETIME = 15.0   # seconds until an enemy removes itself
+CHASE_INTERVAL = 0.025  # seconds between two enemy moves, their own timer used to fire every 25 ms
+
+# keys held during a tick, as a bitmask
+KEY_UP = 1
+KEY_DOWN = 2
+KEY_LEFT = 4
+KEY_RIGHT = 8
+KEY_QUIT = 16
+
+def directionFromKeys(keys: int) -> tuple:
+    """Turns a key bitmask into an 8-bit direction vector
+
+    Args:
+        keys (int): Bitmask of KEY_* values
+
+    Returns:
+        tuple: (x, y) direction, each -1, 0 or 1
+    """
+    return (
+        bool(keys & KEY_RIGHT) - bool(keys & KEY_LEFT),
+        bool(keys & KEY_DOWN) - bool(keys & KEY_UP)
+    )
+
+def keysFromDirection(
+    x: int,
+    y: int
+) -> int:
+    """Turns an 8-bit direction vector into a key bitmask
+
+    Args:
+        x (int): Direction on the x-axis
+        y (int): Direction on the y-axis
+
+    Returns:
+        int: Bitmask of KEY_* values
+    """
+    return ((KEY_LEFT if x < 0 else KEY_RIGHT if x > 0 else 0) |
+            (KEY_UP if y < 0 else KEY_DOWN if y > 0 else 0))
+
+class Body:
+    """The pure-Python state of a moving square.
+
+    This is everything the old DynamicPoint did with physics, minus
+    the QGraphicsRectItem, so it can be stepped without a Qt display.
+    """
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        size: int,
+        maxSpeed: float,
+        acceleration: float,
+        frictionAmplifier: float,
+        minimumSpeed: float,
+        world: 'World'
+    ) -> None:
+        """Initiates the Body
+
+        Args:
+            x (float): X-Position
+            y (float): Y-Position
+            size (int): Width and height of the square
+            maxSpeed (float): Maximum speed on each axis
+            acceleration (float): Speed gained per tick
+            frictionAmplifier (float): Speed lost per tick when standing still
+            minimumSpeed (float): Speeds below this are rounded down to 0
+            world (World): The world this body lives in
+        """
+        self.pos = [x, y]
+        self.prevPos = self.pos
+        self.speed = [0, 0]
+        self.size = size
+        self.maxSpeed = maxSpeed
+        self.acceleration = acceleration
+        self.frictionAmplifier = frictionAmplifier
+        self.minimumSpeed = minimumSpeed
+        self.world = world
+        self.maxX = world.width - size   # right-most position inside the arena
+        self.maxY = world.height - size  # bottom-most position inside the arena
+
+    def validate_speed(
+        self,
+        x_dir: float,
+        y_dir: float
+    ) -> tuple:
+        """Validates the speed: is it higher/lower than the maximum/minimum?
+
+        Args:
+            x_dir (float): Direction on the x-axis
+            y_dir (float): Direction on the y-axis
+
+        Returns:
+            tuple: Speeds on the x- and y-axis
+        """
+        xVel = max(-self.maxSpeed, min(self.speed[0] + x_dir * self.acceleration, self.maxSpeed))
+        yVel = max(-self.maxSpeed, min(self.speed[1] + y_dir * self.acceleration, self.maxSpeed))
+        return xVel, yVel
+
+    def slowDownPlayer(self) -> None:
+        """Slows the body down when no direction vector is given,
+        so it doesn't just drift off.
+        """
+        if self.speed[0] > 0:
+            self.speed[0] -= self.frictionAmplifier
+        elif self.speed[0] < 0:
+            self.speed[0] += self.frictionAmplifier
+
+        if self.speed[1] > 0:
+            self.speed[1] -= self.frictionAmplifier
+        elif self.speed[1] < 0:
+            self.speed[1] += self.frictionAmplifier
+
+        if abs(self.speed[0]) < self.minimumSpeed:
+            self.speed[0] = 0
+        if abs(self.speed[1]) < self.minimumSpeed:
+            self.speed[1] = 0
+
+    def calculateMovementSpeed(
+        self,
+        XDirection: float,
+        YDirection: float
+    ) -> tuple:
+        """Calculates the speed of the body
+
+        Args:
+            XDirection (float): Direction on the x-axis
+            YDirection (float): Direction on the y-axis
+
+        Returns:
+            tuple: (x, y) move in pixels
+        """
+        if XDirection == 0 and YDirection == 0:
+            self.slowDownPlayer()
+            return self.speed[0], self.speed[1]
+        return self.validate_speed(XDirection, YDirection)
+
+    def checkBounds(
+        self,
+        newX: int | float,
+        newY: int | float
+    ) -> list:
+        """Clamps a position to the world
+
+        Args:
+            newX (int | float): New x-position
+            newY (int | float): New y-position
+
+        Returns:
+            list: Rounded value of the new position
+        """
+        maxX = self.maxX
+        maxY = self.maxY
+
+        if newX < 0:
+            newX = 0
+        elif newX > maxX:
+            newX = maxX
+
+        if newY < 0:
+            newY = 0
+        elif newY > maxY:
+            newY = maxY
+        return [round(newX), round(newY)]
+
+    def resize(
+        self,
+        size: int,
+        maxX: float,
+        maxY: float
+    ) -> None:
+        """Changes the size and the bounds, keeping the body inside them
+
+        Args:
+            size (int): New width and height of the square
+            maxX (float): Right-most position inside the arena
+            maxY (float): Bottom-most position inside the arena
+        """
+        self.size = size
+        self.maxX = maxX
+        self.maxY = maxY
+        self.prevPos = self.checkBounds(*self.prevPos)
+        self.pos = self.checkBounds(*self.pos)
+
+    def move(
+        self,
+        XDirection: float,
+        YDirection: float
+    ) -> None:
+        """Moves the body with a direction vector given
+
+        Args:
+            XDirection (float): Direction on the x-axis
+            YDirection (float): Direction on the y-axis
+        """
+        xVel, yVel = self.calculateMovementSpeed(XDirection, YDirection)
+        self.speed[0] = xVel
+        self.speed[1] = yVel
+        self.pos = self.checkBounds(self.pos[0] + xVel, self.pos[1] + yVel)
+
+    def interpolate(
+        self,
+        alpha: float
+    ) -> tuple:
+        """Gets the position between the last two ticks for rendering
+
+        Args:
+            alpha (float): 0 is the previous tick, 1 the current one
+
+        Returns:
+            tuple: (x, y) position
+        """
+        x0, y0 = self.prevPos
+        x1, y1 = self.pos
+        return x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha
+
+    def collidesWith(
+        self,
+        other: 'Body'
+    ) -> bool:
+        """Checks if the AABBs of two bodies overlap
+
+        Args:
+            other (Body): The other body
+
+        Returns:
+            bool: True if collides, False if not
+        """
+        return (self.pos[0] < other.pos[0] + other.size and
+                self.pos[0] + self.size > other.pos[0] and
+                self.pos[1] < other.pos[1] + other.size and
+                self.pos[1] + self.size > other.pos[1])
+
+class PlayerState(Body):
+    """The state of the player: a body with HP and a score
+    """
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        world: 'World'
+    ) -> None:
+        """Initiates the player with the player section of the config
+
+        Args:
+            x (float): X-Position
+            y (float): Y-Position
+            world (World): The world this player lives in
+        """
+        config = world.config
+        super().__init__(x, y, config.SIZE, config.MS, config.ACC, config.FA, config.MST, world)
+        self.active = True
+        self.hp = config.HP
+        self.maxHP = config.MHP
+        self.score = 0
+        self.step = 0.01
+
+    def checkCollisions(self) -> bool:
+        """Checks if the player collides with any enemy
+
+        Returns:
+            bool: True if collides, False if not
+        """
+        return bool(self.world.enemies.collide(self))
+
+    def playerMove(
+        self,
+        xDir: int,
+        yDir: int
+    ) -> bool:
+        """Moves the player and takes damage on collision
+
+        Args:
+            xDir (int): Direction on the x-axis
+            yDir (int): Direction on the y-axis
+
+        Returns:
+            bool: True if the player died during this move
+        """
+        profiler = self.world.profiler
+        self.move(xDir, yDir)
+        profiler.lap("playerMove")
+        hit = self.checkCollisions()
+        profiler.lap("collision")
+        if hit:
+            self.hp -= 1
+            if self.hp <= 0 and self.active:
+                self.active = False
+                return True
+        return False
+
+class World:
+    """The headless game: owns positions, velocities, HP, score and wave state.
+
+    Everything Qt does is reading from this. `step` can be called
+    as fast as the CPU allows, no display needed.
+    """
+    def __init__(
+        self,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        config: Optional[Settings] = None,
+        seed: Optional[int] = None
+    ) -> None:
+        """Initiates the World
+
+        Args:
+            width (Optional[float], optional): Width of the arena. Defaults to the config's.
+            height (Optional[float], optional): Height of the arena. Defaults to the config's.
+            config (Optional[Settings], optional): Config to use. Defaults to the shared snapshot.
+            seed (Optional[int], optional): Seed of the random generator. Defaults to None.
+        """
+        config = config or configParser.load()
+        width = config.AW if width is None else int(width)
+        height = config.AH if height is None else int(height)
+        if (width, height) != (config.AW, config.AH):
+            config = config.override(AW=width, AH=height)
+        self.width = width
+        self.height = height
+        self.config = config
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.npRng = np.random.default_rng(seed)
+
+        self.player: Optional[PlayerState] = None
+        maxSize = max(self.config.SIZE, self.config.ES)
+        self.grid = SpatialHash(max(self.config.CS, maxSize), maxSize)
+        self.enemies = EnemyStore(self, self.grid)
+
+        self.time = 0.0
+        self.ticks = 0
+        self.scoreTimer = 0.0
+        self.chaseTimer = 0.0
+        self.waveTimer = 0.0
+        self.waveType = self.config.IW
+        self.enemyCount = self.config.IE
+        self.autoSpawn = True           # start waves when the wave timer runs out
+        self.waveOrder: Optional[list[int]] = None  # indices into WAVE_PATTERNS, None plays them in order
+        self.waves = WaveScheduler()
+        self.profiler = NULL_PROFILER   # a FrameProfiler gets the phases of every step
+
+    def applyConfig(
+        self,
+        config: Settings
+    ) -> None:
+        """Swaps in a new config while the game is running.
+        The arena keeps its size, everything else follows the new values,
+        including the size, bounds and speed of the player and enemies alive now.
+
+        Args:
+            config (Settings): The new snapshot
+        """
+        self.config = config = config.override(AW=self.width, AH=self.height)
+        self.enemies.applyConfig(config)
+
+        player = self.player
+        if player:
+            player.maxSpeed = config.MS
+            player.speed = [max(-config.MS, min(speed, config.MS)) for speed in player.speed]
+            player.acceleration = config.ACC
+            player.frictionAmplifier = config.FA
+            player.minimumSpeed = config.MST
+            player.maxHP = config.MHP
+            player.resize(config.SIZE, config.PMAXX, config.PMAXY)
+        self.rebuildGrid()
+
+    def rebuildGrid(
+        self,
+        size: int = 0
+    ) -> None:
+        """Builds a new grid if the cell size or the largest entity size changed,
+        and moves every enemy alive now into it
+
+        Args:
+            size (int, optional): Size of an entity about to be added. Defaults to 0.
+        """
+        enemies = self.enemies
+        maxSize = max(self.config.SIZE, self.config.ES, size, enemies.largest())
+        cellSize = max(self.config.CS, maxSize)
+        if (cellSize, maxSize) == (self.grid.cellSize, self.grid.maxSize):
+            return
+        self.grid = SpatialHash(cellSize, maxSize)
+        enemies.setGrid(self.grid)
+
+    def resolvePosition(
+        self,
+        x: Union[float, str],
+        y: Union[float, str],
+        size: int
+    ) -> tuple:
+        """Interprets a position if it's not a numerical value
+
+        Supported types:
+
+        - CENTER
+        - TOPLEFT
+        - TOPRIGHT
+        - BOTTOMLEFT
+        - BOTTOMRIGHT
+        - RANDOM
+
+        Args:
+            x (Union[float, str]): X-Position or a position type
+            y (Union[float, str]): Y-Position or a position type
+            size (int): Size of the body being placed
+
+        Returns:
+            tuple: (x, y) position
+        """
+        types = x if isinstance(x, str) else y if isinstance(y, str) else None
+        if types is None:
+            return x, y
+
+        if types == "RANDOM":
+            return (
+                self.rng.randint(0, int(self.width)) - size,
+                self.rng.randint(0, int(self.height)) - size
+            )
+        positions = {
+            "CENTER": (self.width / 2 - size / 2, self.height / 2 - size / 2),
+            "TOPLEFT": (0, 0),
+            "TOPRIGHT": (self.width - size, 0),
+            "BOTTOMLEFT": (0, self.height - size),
+            "BOTTOMRIGHT": (self.width - size, self.height - size),
+        }
+        return positions.get(types)
+
+    def createPlayer(
+        self,
+        x: Union[float, str] = "CENTER",
+        y: Union[float, str] = "CENTER"
+    ) -> PlayerState:
+        """Creates the player
+
+        Args:
+            x (Union[float, str], optional): X-Position. Defaults to "CENTER".
+            y (Union[float, str], optional): Y-Position. Defaults to "CENTER".
+
+        Returns:
+            PlayerState: The new player
+        """
+        x, y = self.resolvePosition(x, y, self.config.SIZE)
+        self.player = PlayerState(x, y, self)
+        return self.player
+
+    def spawnEnemy(
+        self,
+        x: Union[float, str],
+        y: Union[float, str]
+    ) -> EnemyState:
+        """Spawns an enemy
+
+        Args:
+            x (Union[float, str]): X-Position
+            y (Union[float, str]): Y-Position
+
+        Raises:
+            RuntimeError: If the player hasn't been created yet
+
+        Returns:
+            EnemyState: The new enemy
+        """
+        if self.player is None:
+            raise RuntimeError("Player not created yet!")
+        x, y = self.resolvePosition(x, y, self.config.ES)
+        return self.enemies.add(x, y)
+
+    def spawnEnemies(
+        self,
+        positions: list[tuple]
+    ) -> list[EnemyState]:
+        """Spawns a whole batch of enemies in one pass
+
+        Args:
+            positions (list[tuple]): List of (x, y) positions
+
+        Raises:
+            RuntimeError: If the player hasn't been created yet
+
+        Returns:
+            list[EnemyState]: The new enemies
+        """
+        if self.player is None:
+            raise RuntimeError("Player not created yet!")
+        return self.enemies.addMany(positions)
+
+    def removeEnemy(
+        self,
+        enemy: EnemyState
+    ) -> None:
+        """Removes an enemy from the world
+
+        Args:
+            enemy (EnemyState): The enemy to remove
+        """
+        self.enemies.remove(enemy)
+
+    def killPlayer(self) -> None:
+        """Kills the player. The enemies keep chasing the spot where it died.
+        """
+        if self.player:
+            self.player.active = False
+
+    def collisions(
+        self,
+        includeEnemyPairs: bool = False
+    ) -> list[tuple]:
+        """Gets every overlapping pair of this tick in one call
+
+        Args:
+            includeEnemyPairs (bool, optional): Also check enemies against each other. Defaults to False.
+
+        Returns:
+            list[tuple]: (PlayerState, EnemyState) pairs first, then (EnemyState, EnemyState) pairs
+        """
+        pairs = []
+        if self.player and self.player.active:
+            pairs = [(self.player, enemy) for enemy in self.enemies.collide(self.player)]
+        if includeEnemyPairs:
+            pairs += self.enemies.pairs()
+        return pairs
+
+    def advanceWave(self) -> tuple:
+        """Moves on to the next wave and makes the game harder
+
+        Returns:
+            tuple: (waveType, enemyCount) of the wave that should be spawned now
+        """
+        order = self.waveOrder
+        if self.waveType > len(order or WAVE_PATTERNS) - 1:
+            self.waveType = 0
+        wave = (order[self.waveType] if order else self.waveType, self.enemyCount)
+
+        self.waveType += 1
+        self.enemyCount += 1
+        if self.player:
+            self.player.step *= 2
+        return wave
+
+    def scheduleWave(self) -> tuple:
+        """Moves on to the next wave and puts its warning and spawns on the timeline
+
+        Returns:
+            tuple: (waveType, enemyCount) of the scheduled wave
+        """
+        waveType, enemyCount = self.advanceWave()
+        positions = wavePositions(waveType, enemyCount, self.width, self.height, self.rng)
+        self.waves.compile(
+            self.time,
+            positions,
+            waveWarnings(waveType, positions, self.width, self.height),
+            WAVE_DELAYS[waveType % len(WAVE_DELAYS)]
+        )
+        return waveType, enemyCount
+
+    def spawnWave(self) -> tuple:
+        """Spawns the next wave at once (no warnings, no delays)
+
+        Returns:
+            tuple: (waveType, enemyCount, list of the spawned EnemyStates)
+        """
+        waveType, enemyCount = self.advanceWave()
+        positions = wavePositions(waveType, enemyCount, self.width, self.height, self.rng)
+        return waveType, enemyCount, self.enemies.addMany(positions)
+
+    def step(
+        self,
+        dt: float,
+        keys: int = 0
+    ) -> list[tuple]:
+        """Advances the whole game by one tick
+
+        Args:
+            dt (float): Seconds this tick represents
+            keys (int, optional): Bitmask of the KEY_* values held this tick. Defaults to 0.
+
+        Returns:
+            list[tuple]: Events that happened in this tick:
+                ("died",), ("expired", enemy), ("wave", waveType, enemyCount) when a wave is scheduled,
+                ("warning", wave, centers) and ("warningDone", wave) around its warning circles
+                and ("spawned", enemies) for every batch of enemies it spawns.
+        """
+        events = []
+        self.time += dt
+        self.ticks += 1
+
+        player = self.player
+        if player:
+            player.prevPos = player.pos
+        if player and player.active:
+            if keys & KEY_QUIT:
+                self.killPlayer()
+                events.append(("died",))
+            elif player.playerMove(*directionFromKeys(keys)):
+                events.append(("died",))
+
+        enemies = self.enemies
+        enemies.prevPos[:enemies.count] = enemies.pos[:enemies.count]
+        for enemy in enemies.advanceAge(dt, ENEMY_LIFETIME):
+            events.append(("expired", enemy))
+        self.chaseTimer += dt
+        while self.chaseTimer >= CHASE_INTERVAL:
+            self.chaseTimer -= CHASE_INTERVAL
+            if player:
+                enemies.chase(player.pos[0], player.pos[1])
+
+        if player and player.active:
+            self.scoreTimer += dt
+            while self.scoreTimer >= SCORE_INTERVAL:
+                self.scoreTimer -= SCORE_INTERVAL
+                player.score = round(player.score + player.step, 2)
+
+        self.waveTimer += dt
+        if self.waveTimer >= self.config.WC / 1000:
+            self.waveTimer -= self.config.WC / 1000 # keep the overshoot, so waves don't drift with the tick rate
+            if self.autoSpawn and player and player.active:
+                events.append(("wave", *self.scheduleWave()))
+
+        for kind, payload in self.waves.due(self.time):
+            if kind != "spawn":
+                events.append((kind, payload) if kind == "warningDone" else (kind, *payload))
+            elif player and player.active:
+                events.append(("spawned", self.enemies.addMany(payload)))
+        self.profiler.lap("enemyAI")
+        return events
+
+def corners(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies in the corners."""
+    x = [0, width] * 2
+    y = [0, height, height, 0]
+    return [(round(x[i % len(x)]), round(y[i % len(y)])) for i in range(count)]
+
+def horizontalLine(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies in a horizontal line in the middle of the screen"""
+    spacing = width / (count + 1)
+    return [(int((i + 1) * spacing), int(height / 2)) for i in range(count)]
+
+def center(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies in the center of the screen"""
+    x, y = int(width / 2), int(height / 2)
+    return [(rng.randint(x - 100, x + 100), rng.randint(y - 100, y + 100)) for _ in range(count)]
+
+def top(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies at the top of the screen in a horizontal line"""
+    spacing = width / (count + 1)
+    return [(int((i + 1) * spacing), 0) for i in range(count)]
+
+def seperate(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies in a tilted line from the top to bottom"""
+    x = utils.rangespace(width / 2 - 100, width / 2 + 100, count)
+    y = utils.rangespace(height, 0, count)
+    return [(int(pos[0]), int(pos[1])) for pos in zip(x, y)]
+
+def randomPositions(count: int, width: float, height: float, rng: random.Random) -> list[tuple]:
+    """Spawns enemies anywhere"""
+    x = [rng.randint(0, int(width)) for _ in range(count)]
+    y = [rng.randint(0, int(height)) for _ in range(count)]
+    return list(zip(x, y))
+
+WAVE_PATTERNS = [corners, horizontalLine, center, top, seperate, randomPositions]
+WAVE_DELAYS = [0.25, 0.15, 0.5, 0.15, 0.0, 0.0] # seconds between two spawns of each pattern
+
+def wavePositions(
+    waveType: int,
+    count: int,
+    width: float,
+    height: float,
+    rng: random.Random
+) -> list[tuple]:
+    """Gets the spawn positions of a wave
+
+    Args:
+        waveType (int): Index into WAVE_PATTERNS
+        count (int): Amount of enemies
+        width (float): Width of the arena
+        height (float): Height of the arena
+        rng (random.Random): Random generator to use
+
+    Returns:
+        list[tuple]: List of (x, y) positions
+    """
+    return WAVE_PATTERNS[waveType % len(WAVE_PATTERNS)](count, width, height, rng)
+
+def waveWarnings(
+    waveType: int,
+    positions: list[tuple],
+    width: float,
+    height: float
+) -> list[tuple]:
+    """Gets the centers of the warning circles of a wave
+
+    Args:
+        waveType (int): Index into WAVE_PATTERNS
+        positions (list[tuple]): Spawn positions of the wave
+        width (float): Width of the arena
+        height (float): Height of the arena
+
+    Returns:
+        list[tuple]: List of (x, y) centers
+    """
+    pattern = WAVE_PATTERNS[waveType % len(WAVE_PATTERNS)]
+    if pattern is corners:
+        return [(0, 0), (width, height), (0, height), (width, 0)]
+    if pattern is center:
+        return [(int(width / 2), int(height / 2))]
+    return list(positions)
+
+if __name__ == "__main__":
+    world = World(1000, 640, seed=1)
+    world.createPlayer()
+    for _ in range(500):
+        world.spawnEnemy("RANDOM", "RANDOM")
+
+    start = time.perf_counter()
+    ticks = 500
+    for _ in range(ticks):
+        world.step(0.025, KEY_RIGHT)
+    elapsed = time.perf_counter() - start
+    print(f"{ticks / elapsed:,.0f} ticks/s with {len(world.enemies)} enemies")
@@ -0,0 +1,167 @@
+import numpy as np
+from typing import Hashable, Iterator
+
+CELL_BITS = 16  # cell keys are (cx << CELL_BITS) | cy
+
+class SpatialHash:
+    """A uniform grid over the arena that buckets entities by cell.
+
+    Every entity lives in exactly one cell, the one holding its top-left
+    corner (clamped to the arena). Queries widen their range by the
+    largest entity size so nothing overlapping is missed. As long as the
+    cells are at least as big as the entities, a query only looks at a
+    handful of buckets.
+    """
+    def __init__(
+        self,
+        cellSize: int,
+        maxSize: int
+    ) -> None:
+        """Initiates the SpatialHash
+
+        Args:
+            cellSize (int): Width and height of a cell in pixels
+            maxSize (int): Largest entity size that will be inserted
+        """
+        self.cellSize = cellSize
+        self.maxSize = maxSize
+        self.cells: dict[int, set] = {}
+
+    def cellKey(
+        self,
+        x: float,
+        y: float
+    ) -> int:
+        """Gets the key of the cell containing a point
+
+        Args:
+            x (float): X-Position
+            y (float): Y-Position
+
+        Returns:
+            int: Cell key
+        """
+        return (int(max(x, 0) // self.cellSize) << CELL_BITS) | int(max(y, 0) // self.cellSize)
+
+    def cellKeys(
+        self,
+        positions: np.ndarray
+    ) -> np.ndarray:
+        """Gets the cell keys of many points at once
+
+        Args:
+            positions (np.ndarray): Array of shape (n, 2)
+
+        Returns:
+            np.ndarray: int64 cell keys
+        """
+        cells = (np.maximum(positions, 0) // self.cellSize).astype(np.int64)
+        return (cells[:, 0] << CELL_BITS) | cells[:, 1]
+
+    def insert(
+        self,
+        key: Hashable,
+        cell: int
+    ) -> None:
+        """Puts an entity into a cell
+
+        Args:
+            key (Hashable): ID of the entity
+            cell (int): Cell key
+        """
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = set()
+        bucket.add(key)
+
+    def remove(
+        self,
+        key: Hashable,
+        cell: int
+    ) -> None:
+        """Takes an entity out of a cell
+
+        Args:
+            key (Hashable): ID of the entity
+            cell (int): Cell key it was inserted with
+        """
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(
+        self,
+        key: Hashable,
+        oldCell: int,
+        newCell: int
+    ) -> None:
+        """Moves an entity to another cell
+
+        Args:
+            key (Hashable): ID of the entity
+            oldCell (int): Cell it is in now
+            newCell (int): Cell it should be in
+        """
+        if oldCell != newCell:
+            self.remove(key, oldCell)
+            self.insert(key, newCell)
+
+    def clear(self) -> None:
+        """Removes everything
+        """
+        self.cells.clear()
+
+    def query(
+        self,
+        x0: float,
+        y0: float,
+        x1: float,
+        y1: float
+    ) -> Iterator:
+        """Yields every entity whose cell could overlap the box.
+        This is the broadphase only, callers still do the exact test.
+
+        Args:
+            x0 (float): Left edge
+            y0 (float): Top edge
+            x1 (float): Right edge
+            y1 (float): Bottom edge
+
+        Yields:
+            Hashable: IDs of candidate entities
+        """
+        cs = self.cellSize
+        cx0 = max(int((x0 - self.maxSize) // cs), 0)
+        cy0 = max(int((y0 - self.maxSize) // cs), 0)
+        cx1 = int(x1 // cs)
+        cy1 = int(y1 // cs)
+
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx << CELL_BITS) | cy)
+                if bucket:
+                    yield from bucket
+
+    def neighbourCells(self) -> Iterator[tuple]:
+        """Yields every occupied cell with the occupied cells after it
+        (right and below), so each pair of cells shows up only once.
+
+        Yields:
+            tuple: (bucket, list of neighbouring buckets)
+        """
+        cells = self.cells
+        for cell, bucket in cells.items():
+            cx, cy = cell >> CELL_BITS, cell & ((1 << CELL_BITS) - 1)
+            neighbours = []
+            for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+                nx, ny = cx + dx, cy + dy
+                if ny < 0:
+                    continue
+                other = cells.get((nx << CELL_BITS) | ny)
+                if other:
+                    neighbours.append(other)
+            yield bucket, neighbours
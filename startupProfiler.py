@@ -0,0 +1,240 @@
+import time
+IMPORTED = time.perf_counter() # main imports this first, so everything after it counts as its imports
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Callable, Optional
+from PyQt5.QtCore import (
+    QEvent,
+    QObject,
+    QTimer
+)
+from PyQt5.QtWidgets import QWidget
+
+def processAge() -> Optional[float]:
+    """Gets how long ago the process was started
+
+    Returns:
+        Optional[float]: Seconds, None if the OS doesn't tell
+    """
+    try:
+        import psutil # optional, the only way on Windows
+        return time.time() - psutil.Process().create_time()
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/stat", encoding="UTF-8") as file:
+            started = int(file.read().rpartition(")")[2].split()[19]) # starttime, in clock ticks after boot
+        with open("/proc/uptime", encoding="UTF-8") as file:
+            uptime = float(file.read().split()[0])
+        return uptime - started / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class FirstPaint(QObject):
+    """Waits for the first paint event of a widget and calls back once it's painted
+    """
+    def __init__(
+        self,
+        widget: QWidget,
+        onPaint: Callable[[], None],
+        onPainted: Callable[[], None]
+    ) -> None:
+        """Initiates the FirstPaint
+
+        Args:
+            widget (QWidget): The widget, usually a viewport
+            onPaint (Callable[[], None]): Called right before the first paint
+            onPainted (Callable[[], None]): Called once the first paint is done
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.onPaint = onPaint
+        self.onPainted = onPainted
+        widget.installEventFilter(self)
+
+    def eventFilter(
+        self,
+        watched: QObject,
+        event: QEvent
+    ) -> bool:
+        if event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            self.onPaint()
+            QTimer.singleShot(0, self.onPainted) # runs once the paint event is handled
+        return False
+
+class StartupProfiler:
+    """Splits the time from process start to the first painted frame into phases.
+
+    `mark` ends the current phase under a name. `watch` ends the last
+    two on the first paint of the game's view: everything up to the
+    paint event, and the paint itself. The first phase, "interpreter",
+    is only known where the OS tells how old the process is.
+    """
+    def __init__(
+        self,
+        started: float = IMPORTED
+    ) -> None:
+        """Initiates the StartupProfiler
+
+        Args:
+            started (float, optional): perf_counter at which the first phase after
+                the interpreter starts. Defaults to when this module was imported.
+        """
+        age = processAge()
+        self.origin = time.perf_counter() - age if age is not None else started
+        self.phases: dict[str, float] = {}  # name -> seconds
+        if started > self.origin:
+            self.phases["interpreter"] = started - self.origin
+        self.last = started
+        self.total: Optional[float] = None  # seconds to the first painted frame
+        self.watcher = None
+        self.callbacks: list[Callable[['StartupProfiler'], None]] = []
+
+    @property
+    def done(self) -> bool:
+        return self.total is not None
+
+    def mark(
+        self,
+        name: str
+    ) -> None:
+        """Ends the current phase. Does nothing after the first frame
+
+        Args:
+            name (str): Name of the phase that just ended
+        """
+        if self.done:
+            return
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self.last
+        self.last = now
+
+    def watch(
+        self,
+        widget: QWidget,
+        callback: Optional[Callable[['StartupProfiler'], None]] = None
+    ) -> None:
+        """Ends the startup once the widget is painted for the first time
+
+        Args:
+            widget (QWidget): The widget, usually the viewport of the game's view
+            callback (Optional[Callable[[StartupProfiler], None]], optional): Called with
+                the profiler once the startup is over, dropped if it already is. Defaults to None.
+        """
+        if self.done:
+            return # later windows aren't part of the startup
+        if callback:
+            self.callbacks.append(callback)
+        if self.watcher:
+            return
+        self.watcher = FirstPaint(widget, lambda: self.mark("first frame"), self.finish)
+
+    def finish(self) -> None:
+        """Ends the startup with the first paint
+        """
+        self.mark("first paint")
+        self.total = self.last - self.origin
+        self.watcher = None
+        callbacks, self.callbacks = self.callbacks, [] # don't keep anybody alive after the startup
+        for callback in callbacks:
+            callback(self)
+
+    def report(self) -> dict:
+        """Gets the phases
+
+        Returns:
+            dict: phases (name -> ms, in order) and total ms to the first painted frame, None until then
+        """
+        return {
+            "phases": {name: seconds * 1000 for name, seconds in self.phases.items()},
+            "total": self.total * 1000 if self.done else None,
+        }
+
+    def format(
+        self,
+        budget: float = 0
+    ) -> str:
+        """Gets the phases as a table
+
+        Args:
+            budget (float, optional): Milliseconds the startup may take, 0 for none. Defaults to 0.
+
+        Returns:
+            str: One line per phase and the total
+        """
+        report = self.report()
+        lines = [f"  {name:<16} {ms:>7.1f} ms" for name, ms in report["phases"].items()]
+        total = f"  {'total':<16} {report['total'] or 0:>7.1f} ms"
+        if budget > 0:
+            total += f" of {budget:.0f} ms"
+        return "\n".join(lines + [total])
+
+STARTUP = StartupProfiler()
+
+def runChild() -> None:
+    """Starts the game window like main does and prints the startup report as JSON after the first frame
+    """
+    import main
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+    app = QApplication(sys.argv[:1])
+    STARTUP.mark("qt")
+    form = QMainWindow()
+    window = main.Window(form, useKeyboard=False)
+    form.show()
+    STARTUP.mark("show")
+
+    def done(profiler: StartupProfiler) -> None:
+        print(json.dumps(profiler.report()))
+        window.loop.stop()
+        app.quit()
+    STARTUP.watch(window.graphicsView.viewport(), done)
+    app.exec_()
+
+def measure(
+    runs: int = 5
+) -> list[dict]:
+    """Starts the game in fresh processes on the offscreen platform, one cold start each
+
+    Args:
+        runs (int, optional): Amount of processes. Defaults to 5.
+
+    Returns:
+        list[dict]: The report of every run
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    reports = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", "import startupProfiler; startupProfiler.runChild()"],
+            cwd=root, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+    return reports
+
+if __name__ == "__main__":
+    import argparse
+    import configParser
+    parser = argparse.ArgumentParser(description="Measures where the time goes between starting DotEXE and its first painted frame")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to start")
+    args = parser.parse_args()
+
+    reports = measure(args.runs)
+    budget = configParser.load().SB
+    phases = {}
+    for report in reports:
+        for name, ms in report["phases"].items():
+            phases.setdefault(name, []).append(ms)
+    totals = [report["total"] for report in reports]
+    print(f"{'phase':<16} {'median':>9} {'max':>9}")
+    for name, values in phases.items():
+        print(f"{name:<16} {statistics.median(values):>6.1f} ms {max(values):>6.1f} ms")
+    print(f"{'total':<16} {statistics.median(totals):>6.1f} ms {max(totals):>6.1f} ms   budget {budget} ms")
+    if statistics.median(totals) > budget > 0:
+        sys.exit(1)
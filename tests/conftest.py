@@ -0,0 +1,15 @@
+import os
+import sys
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # has to happen before Qt is imported
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT) # the modules live flat in the repository root
+
+@pytest.fixture(scope="session")
+def qapp():
+    """One QApplication for every test that needs Qt
+    """
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
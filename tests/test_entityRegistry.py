@@ -0,0 +1,79 @@
+import pytest
+from entityRegistry import ENEMY, PLAYER, EntityRegistry
+
+class Entity:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+def makeRegistry(count: int = 4) -> tuple:
+    registry = EntityRegistry()
+    entities = [Entity(f"e{i}") for i in range(count)]
+    for entity in entities:
+        registry.add(entity, ENEMY)
+    return registry, registry.view(ENEMY), entities
+
+def test_ids_are_stable_after_swap_removes():
+    registry, enemies, (a, b, c, d) = makeRegistry()
+    registry.remove(a)
+    assert registry.get(d.entityId) is d
+    assert list(enemies) == [d, b, c]
+    assert registry.get(a.entityId) is None
+
+def test_removing_while_iterating_neither_skips_nor_repeats():
+    registry, enemies, entities = makeRegistry()
+    seen = []
+    for entity in enemies:
+        seen.append(entity)
+        registry.remove(entity)
+    assert seen == entities
+    assert len(enemies) == 0
+    assert list(enemies) == []
+
+def test_indexing_and_len_skip_pending_removals():
+    registry, enemies, (a, b, c, d) = makeRegistry()
+    for entity in enemies:
+        if entity is a:
+            registry.remove(b)
+            assert len(enemies) == 3
+            assert [enemies[i] for i in range(len(enemies))] == [a, c, d]
+            assert enemies[-1] is d
+            with pytest.raises(IndexError):
+                enemies[3]
+    assert list(enemies) == [a, d, c]
+
+def test_adding_during_iteration_waits_for_the_next_one():
+    registry, enemies, entities = makeRegistry(2)
+    late = Entity("late")
+    seen = []
+    for entity in enemies:
+        seen.append(entity)
+        if entity is entities[0]:
+            registry.add(late, ENEMY)
+    assert seen == entities
+    assert list(enemies) == entities + [late]
+
+def test_readding_a_pending_entity_cancels_its_removal():
+    registry, enemies, (a, b, c, d) = makeRegistry()
+    seen = []
+    for entity in enemies:
+        seen.append(entity)
+        if entity is a:
+            id = b.entityId
+            registry.remove(b)
+            assert b not in registry
+            assert registry.add(b, ENEMY) == id
+            assert b in registry
+    assert seen == [a, b, c, d]
+    assert list(enemies) == [a, b, c, d]
+    assert len(registry) == 4
+
+def test_readding_a_pending_entity_as_another_kind_is_refused():
+    registry, enemies, (a, b, c, d) = makeRegistry()
+    for entity in enemies:
+        registry.remove(a)
+        with pytest.raises(ValueError):
+            registry.add(a, PLAYER)
+        break
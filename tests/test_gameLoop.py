@@ -0,0 +1,66 @@
+import pytest
+from configParser import Settings
+from gameClock import FastClock, FixedStepClock, RealTimeClock
+from gameLoop import FixedTimestep, GameLoop
+from simulation import World
+
+class ManualClock(RealTimeClock):
+    """A real time clock whose wall clock only moves when told to
+    """
+    def __init__(self, scale: float = 1.0) -> None:
+        self.wall = 0.0
+        super().__init__(scale)
+
+    def real(self) -> float:
+        return self.wall
+
+def makeLoop(clock: RealTimeClock, qapp) -> GameLoop:
+    world = World(1000, 640, Settings(IE=0), seed=1)
+    world.autoSpawn = False
+    return GameLoop(world, lambda: 0, 40, clock=clock)
+
+def test_fixedTimestep_keeps_the_remainder():
+    timestep = FixedTimestep(40)
+    assert timestep.advance(0.06) == 2
+    assert timestep.alpha == pytest.approx(0.4)
+    assert timestep.advance(0.02) == 1
+
+def test_fixedTimestep_drops_late_time_unless_told_not_to():
+    timestep = FixedTimestep(40)
+    assert timestep.advance(1.0) == 5
+    assert timestep.accumulator == 0.0
+    assert timestep.advance(1.0, dropLate=False) == 5
+    assert timestep.accumulator == pytest.approx(1.0 - 5 / 40)
+
+@pytest.mark.parametrize("scale", [1.0, 4.0, 8.0, 20.0])
+def test_fixedStepClock_plays_the_scaled_game_time(qapp, scale):
+    loop = makeLoop(FixedStepClock(1 / 60, scale), qapp)
+    loop.running = True
+    for _ in range(60):
+        loop.runFrame()
+    # one second of frames is `scale` game seconds, nothing may be dropped
+    assert abs(loop.world.ticks - 40 * scale) <= 1
+
+@pytest.mark.parametrize("scale", [1.0, 8.0])
+def test_realTimeClock_keeps_up_with_its_scale(qapp, scale):
+    clock = ManualClock(scale)
+    loop = makeLoop(clock, qapp)
+    loop.running = True
+    for _ in range(60):
+        clock.wall += 1 / 60
+        loop.runFrame()
+    assert abs(loop.world.ticks - 40 * scale) <= 1
+
+def test_realTimeClock_still_drops_a_stall(qapp):
+    clock = ManualClock()
+    loop = makeLoop(clock, qapp)
+    loop.running = True
+    clock.wall += 10.0
+    loop.runFrame()
+    assert loop.world.ticks == 5
+
+def test_fastClock_runs_scaled_ticks_per_frame(qapp):
+    loop = makeLoop(FastClock(3.0), qapp)
+    loop.running = True
+    loop.runFrame()
+    assert loop.world.ticks == 15
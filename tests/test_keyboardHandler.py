@@ -0,0 +1,35 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QLineEdit, QMainWindow
+import keyboardHandler
+import simulation
+
+def test_keys_reach_the_game_window_through_its_view(qapp):
+    form = QMainWindow()
+    scene = QGraphicsScene(0, 0, 100, 100) # like the game's, nothing in it takes keys
+    view = QGraphicsView(scene, form)
+    form.setCentralWidget(view)
+    state = keyboardHandler.KeyState()
+    keyboard = keyboardHandler.listen(state, view.window())
+
+    QTest.keyPress(view, Qt.Key_W)
+    assert state.held == simulation.KEY_UP
+    QTest.keyRelease(view, Qt.Key_W)
+    assert state.held == 0
+    assert state.sample() == simulation.KEY_UP # the tap still counts once
+
+    keyboard.stop()
+    QTest.keyPress(view, Qt.Key_D)
+    assert state.held == 0
+    form.deleteLater()
+
+def test_keys_of_other_windows_are_ignored(qapp):
+    form = QMainWindow()
+    other = QLineEdit()
+    state = keyboardHandler.KeyState()
+    keyboard = keyboardHandler.listen(state, form)
+    QTest.keyPress(other, Qt.Key_W)
+    assert state.held == 0
+    keyboard.stop()
+    form.deleteLater()
+    other.deleteLater()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QMainWindow
+import batchSimulation
+import configParser
+import gameClock
+from configParser import Settings
+import replay
+import simulation
+
+TICKS = 1500
+LONG_GAME = {"IE": 3, "WC": 2000, "HP": 100000, "MHP": 100000} # lots of waves and a player that stays alive
+
+def state(world: simulation.World) -> dict:
+    """Everything that has to come out the same when a session is played again
+    """
+    enemies = world.enemies
+    return {
+        "ticks": world.ticks,
+        "score": world.player.score,
+        "hp": world.player.hp,
+        "player": list(world.player.pos),
+        "waves": world.waves.waves,
+        "enemies": np.array(enemies.pos[:len(enemies)]).tolist(),
+    }
+
+def test_headless_recording_plays_back_the_same(tmp_path):
+    world = simulation.World(config=Settings(**LONG_GAME), seed=11)
+    world.createPlayer()
+    recorder = replay.ReplayRecorder(world.seed, world.config, world.config.TR)
+    policy = batchSimulation.FleePolicy(11)
+    for _ in range(TICKS):
+        keys = policy(world)
+        recorder.record(world.ticks, keys)
+        world.step(1 / world.config.TR, keys)
+    path = str(tmp_path / "session.replay")
+    recorder.save(path)
+
+    loaded = replay.Replay.load(path)
+    played = loaded.createWorld()
+    for tick in range(loaded.ticks):
+        played.step(1 / loaded.tickRate, loaded.keysAt(tick))
+    assert world.player.hp > 0 and world.waves.waves > 3 and len(world.enemies)
+    assert state(played) == state(world)
+
+    result = replay.playback(loaded)
+    assert (result["score"], result["hp"], result["enemies"]) == (world.player.score, world.player.hp, len(world.enemies))
+
+def test_replays_with_retired_config_values_still_load():
+    recorder = replay.ReplayRecorder(3, Settings(**LONG_GAME), 40)
+    data = {"version": replay.REPLAY_VERSION, "seed": 3, "tickRate": 40, "ticks": 0,
+            "config": dict(recorder.config.asDict(), TOUT=0.05), "inputs": []}
+    assert replay.Replay(data).config == recorder.config
+
+def runWindow(window) -> None:
+    window.loop.timer.stop() # frames are run by hand, not by the event loop
+    while window.loop.running and window.world.ticks < TICKS:
+        window.loop.runFrame()
+
+@pytest.mark.parametrize("renderMode", ["items", "raster"])
+def test_window_recording_plays_back_the_same(qapp, tmp_path, renderMode, monkeypatch):
+    import main
+    config = configParser.load().override(**LONG_GAME)
+    monkeypatch.setattr(configParser, "load", lambda path=None: config)
+    path = str(tmp_path / "window.replay")
+    form = QMainWindow()
+    recording = main.Window(form, seed=5, recordPath=path, useKeyboard=False, renderMode=renderMode,
+                            clock=gameClock.FastClock())
+    recording.keepScores = False
+    policy = batchSimulation.FleePolicy(5)
+    recording.loop.ticked.connect(lambda events: setattr(recording.keys, "held", policy(recording.world)))
+    runWindow(recording)
+    recording.saveRecording()
+    recorded = state(recording.world)
+    assert recorded["hp"] > 0 and recorded["waves"] > 3 and recorded["enemies"]
+    recording.loop.stop()
+
+    playing = main.Window(QMainWindow(), replayPath=path, useKeyboard=False, renderMode=renderMode)
+    runWindow(playing)
+    assert state(playing.world) == recorded
+
+    loaded = replay.Replay.load(path)
+    headless = loaded.createWorld()
+    for tick in range(loaded.ticks):
+        headless.step(1 / loaded.tickRate, loaded.keysAt(tick))
+    assert state(headless) == recorded
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import configParser
+import scoreStore
+from conftest import ROOT
+
+def test_shipped_config_is_the_ranked_one():
+    shipped = configParser.Config(os.path.join(ROOT, "bin", configParser.CONFIG_PATH)).settings()
+    assert scoreStore.configHash(shipped) == scoreStore.rankedHash()
+
+def test_repository_config_is_the_shipped_one():
+    config = configParser.Config(os.path.join(ROOT, configParser.CONFIG_PATH)).settings()
+    assert scoreStore.configHash(config) == scoreStore.rankedHash()
+
+def test_ranked_config_is_parsed_on_first_use():
+    check = "import scoreStore; print(scoreStore.rankedConfig.cache_info().currsize)"
+    output = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "0" # importing it, like main does, doesn't parse anything
+    assert scoreStore.isRanked(scoreStore.rankedConfig())
+    assert scoreStore.rankedConfig.cache_info().currsize == 1
+
+def test_presentation_values_keep_a_run_ranked():
+    config = scoreStore.rankedConfig().override(RM="raster", TFPS=144, QG=False, SI="bsp", EPS=16)
+    assert scoreStore.isRanked(config)
+
+def test_gameplay_values_make_a_run_unranked():
+    assert not scoreStore.isRanked(scoreStore.rankedConfig().override(MS=7))
+    assert not scoreStore.isRanked(configParser.Settings())
+
+def test_practice_and_test_runs_are_unranked():
+    config = scoreStore.rankedConfig()
+    assert not scoreStore.isRanked(config, seeded=True)
+    assert not scoreStore.isRanked(config, deterministic=True)
+    assert not scoreStore.isRanked(config, realTime=False)
+
+def test_store_keeps_ranked_and_unranked_apart(tmp_path):
+    store = scoreStore.ScoreStore(str(tmp_path / "scores.db"))
+    store.add(
+        scoreStore.RunRecord(30.0, 12.0, 2, scoreStore.rankedHash(), True),
+        scoreStore.RunRecord(90.0, 40.0, 5, "0123456789ab", False),
+        scoreStore.RunRecord(10.0, 5.0, 1, scoreStore.rankedHash(), True),
+    )
+    assert [run.score for run in store.top(ranked=True)] == [30.0, 10.0]
+    assert store.best() == 90.0
+    assert [run.score for run in store.forConfig(scoreStore.rankedHash())] == [30.0, 10.0]
+    store.close()
+
+def test_top_runs_read_an_index(tmp_path):
+    store = scoreStore.ScoreStore(str(tmp_path / "scores.db"))
+    for query in ("SELECT * FROM runs ORDER BY score DESC LIMIT 10",
+                  "SELECT * FROM runs WHERE ranked = 1 ORDER BY score DESC LIMIT 10"):
+        plan = " ".join(row[-1] for row in store.connection.execute("EXPLAIN QUERY PLAN " + query))
+        assert "INDEX" in plan and "TEMP B-TREE" not in plan, plan
+    store.close()
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from configParser import Settings
+from simulation import World
+
+def makeWorld() -> World:
+    world = World(1000, 640, Settings(IE=0), seed=1)
+    world.createPlayer(990, 630)
+    world.player.speed = [6, -6]
+    return world
+
+def test_reload_resizes_the_live_player():
+    world = makeWorld()
+    world.applyConfig(world.config.override(SIZE=30, MS=4))
+    player = world.player
+    config = world.config
+    assert (player.size, player.maxX, player.maxY) == (30, config.PMAXX, config.PMAXY)
+    assert player.pos == [config.PMAXX, config.PMAXY]
+    assert player.prevPos[0] <= config.PMAXX and player.prevPos[1] <= config.PMAXY
+    assert player.speed == [4, -4]
+
+def test_reload_updates_the_enemies_alive_now():
+    world = makeWorld()
+    default = world.enemies.add(990, 630)
+    custom = world.enemies.add(100, 100, size=40)
+    world.enemies.speed[:2] = 10
+    world.applyConfig(world.config.override(ES=25, EMS=3))
+    enemies = world.enemies
+    config = world.config
+    assert default.size == 25
+    assert custom.size == 40
+    assert enemies.limit[default.row].tolist() == [config.EMAXX, config.EMAXY]
+    assert enemies.limit[custom.row].tolist() == [1000 - 40, 640 - 40]
+    assert default.pos == [config.EMAXX, config.EMAXY]
+    assert np.all(enemies.speed[:2] == 3)
+
+def test_reloaded_enemies_stay_inside_the_arena_while_chasing():
+    world = makeWorld()
+    world.enemies.add(990, 630)
+    world.applyConfig(world.config.override(ES=25))
+    for _ in range(20):
+        world.step(1 / world.config.TR, 0)
+        assert np.all(world.enemies.pos[:len(world.enemies)] <= world.enemies.limit[:len(world.enemies)])
+
+def test_reload_to_larger_enemies_rebuilds_the_grid():
+    world = makeWorld()
+    world.player.pos = [90, 90]
+    enemy = world.enemies.add(60, 60) # a cell left of the player, too far to touch at size 10
+    assert world.enemies.collide(world.player) == []
+    world.applyConfig(world.config.override(ES=40))
+    assert world.grid.maxSize == 40 and world.enemies.grid is world.grid
+    assert world.enemies.collide(world.player) == [enemy]
+
+def test_reload_to_another_cell_size_keeps_every_enemy():
+    world = makeWorld()
+    world.player.pos = [500, 300]
+    enemies = [world.enemies.add(x, 300) for x in (100, 498, 900)]
+    world.applyConfig(world.config.override(CS=16))
+    assert world.grid.cellSize == 16
+    assert sum(len(bucket) for bucket in world.grid.cells.values()) == 3
+    assert world.enemies.collide(world.player) == [enemies[1]]
+
+def test_adding_a_larger_enemy_widens_the_grid():
+    world = makeWorld()
+    world.player.pos = [90, 90]
+    small = world.enemies.add(300, 300)
+    big = world.enemies.add(60, 60, size=40)
+    assert world.grid.maxSize == 40
+    assert world.enemies.collide(world.player) == [big]
+    assert small.id in world.grid.cells[world.grid.cellKey(300, 300)]
+
+@pytest.mark.parametrize("tickRate", [40, 50, 60, 120])
+def test_enemies_move_at_their_own_rate_whatever_the_tick_rate(tickRate):
+    world = World(1000, 640, Settings(IE=0, TR=tickRate), seed=1)
+    world.createPlayer()
+    world.enemies.add(10, 10)
+    for _ in range(tickRate * 2):
+        world.step(1 / tickRate)
+    assert world.enemies.moves in (79, 80) # 2 seconds of 25 ms moves, give or take float rounding
+
+def test_wave_timer_keeps_the_overshoot():
+    world = World(1000, 640, Settings(IE=0, WC=1000), seed=1)
+    world.createPlayer()
+    for _ in range(4):
+        world.step(0.3)
+    assert world.waveTimer == pytest.approx(0.2)
@@ -0,0 +1,45 @@
+import gc
+import weakref
+import pytest
+from PyQt5.QtWidgets import QWidget
+from startupProfiler import StartupProfiler
+
+class Owner:
+    """Stands in for a Window that watches the startup
+    """
+    def __init__(self) -> None:
+        self.reports = []
+
+    def startupDone(self, profiler: StartupProfiler) -> None:
+        self.reports.append(profiler.report())
+
+def test_phases_add_up_to_the_total(qapp):
+    profiler = StartupProfiler()
+    profiler.mark("imports")
+    profiler.mark("window")
+    profiler.finish()
+    report = profiler.report()
+    assert list(report["phases"])[-3:] == ["imports", "window", "first paint"]
+    assert sum(report["phases"].values()) == pytest.approx(report["total"])
+
+def test_callbacks_are_released_after_the_startup(qapp):
+    profiler = StartupProfiler()
+    widget = QWidget()
+    owner = Owner()
+    profiler.watch(widget, owner.startupDone)
+    profiler.finish()
+    assert len(owner.reports) == 1
+    assert profiler.callbacks == []
+
+    reference = weakref.ref(owner)
+    del owner
+    gc.collect()
+    assert reference() is None
+
+def test_later_watchers_are_not_kept(qapp):
+    profiler = StartupProfiler()
+    profiler.finish()
+    late = Owner()
+    profiler.watch(QWidget(), late.startupDone)
+    assert late.reports == []
+    assert profiler.callbacks == []
@@ -0,0 +1,50 @@
+import random
+import pytest
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QGraphicsScene
+import dirtyRegion
+from models import TrailItem
+
+ARENA = QRectF(0, 0, 1000, 640)
+
+def scanned(trail: TrailItem) -> QRectF:
+    """The covered area the slow way, from every stored position
+    """
+    positions = list(trail.positions())
+    xs, ys = [x for x, _ in positions], [y for _, y in positions]
+    return QRectF(min(xs), min(ys), max(xs) - min(xs) + trail.size, max(ys) - min(ys) + trail.size).intersected(ARENA)
+
+@pytest.mark.parametrize("length", [1, 3, 25])
+def test_extent_follows_the_trail(qapp, length):
+    trail = TrailItem(length, 10, QColor(0, 0, 255), ARENA)
+    rng = random.Random(length)
+    x, y = 500.0, 300.0
+    for _ in range(500):
+        x = min(max(x + rng.choice((-6, 0, 6)), 0), 990)
+        y = min(max(y + rng.choice((-6, 0, 6)), 0), 630)
+        trail.push(x, y)
+        assert trail.extent == scanned(trail)
+    trail.setLength(length + 2)
+    assert trail.extent == scanned(trail)
+    trail.clear()
+    assert trail.extent.isEmpty()
+
+def test_bounding_rect_stays_put_with_a_bsp_index(qapp):
+    scene = QGraphicsScene(ARENA)
+    dirtyRegion.setIndexMethod(scene, "none")
+    trail = TrailItem(5, 10, QColor(0, 0, 255), ARENA)
+    scene.addItem(trail)
+    trail.push(100, 100)
+    assert trail.boundingRect() == QRectF(100, 100, 10, 10)
+
+    dirtyRegion.setIndexMethod(scene, "bsp")
+    trail.push(110, 100)
+    assert trail.boundingRect() == ARENA
+    assert trail.extent == QRectF(100, 100, 20, 10)
+
+    bsp = QGraphicsScene(ARENA)
+    dirtyRegion.setIndexMethod(bsp, "bsp")
+    late = TrailItem(5, 10, QColor(0, 0, 255), ARENA)
+    bsp.addItem(late)
+    assert late.boundingRect() == ARENA
@@ -0,0 +1,103 @@
+import heapq
+from typing import Iterator
+
+WARNING_TIME = 1.5  # seconds the warning circles show before a wave spawns
+
+class WaveScheduler:
+    """A timeline of everything a wave does, on the game clock.
+
+    A wave is compiled once into timestamped entries: its warning,
+    the end of the warning and its spawn batches. Every tick the world
+    pops the entries that are due. Spawns that share a timestamp form
+    one batch, so a wave of thousands without delays is a single entry.
+    Nothing sleeps and nothing runs on another thread.
+    """
+    def __init__(self) -> None:
+        """Initiates the WaveScheduler
+        """
+        self.entries: list[tuple] = []  # heap of (time, order, kind, payload)
+        self.order = 0                  # keeps entries with the same time in insertion order
+        self.waves = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def schedule(
+        self,
+        time: float,
+        kind: str,
+        payload
+    ) -> None:
+        """Puts one entry on the timeline
+
+        Args:
+            time (float): Game time it's due at
+            kind (str): "warning", "warningDone" or "spawn"
+            payload (Any): Data of the entry
+        """
+        heapq.heappush(self.entries, (time, self.order, kind, payload))
+        self.order += 1
+
+    def compile(
+        self,
+        start: float,
+        positions: list[tuple],
+        warnings: list[tuple],
+        delay: float = 0.0,
+        warningTime: float = WARNING_TIME
+    ) -> int:
+        """Turns a wave into entries on the timeline
+
+        Args:
+            start (float): Game time the warning shows up
+            positions (list[tuple]): Spawn positions in spawn order
+            warnings (list[tuple]): Centers of the warning circles
+            delay (float, optional): Seconds between two spawns, 0 spawns all at once. Defaults to 0.0.
+            warningTime (float, optional): Seconds between the warning and the first spawn. Defaults to WARNING_TIME.
+
+        Returns:
+            int: ID of the wave, it's the payload of the warning entries
+        """
+        wave = self.waves
+        self.waves += 1
+        spawnAt = start + warningTime
+        self.schedule(start, "warning", (wave, warnings))
+        self.schedule(spawnAt, "warningDone", wave)
+        if delay:
+            for i, position in enumerate(positions):
+                self.schedule(spawnAt + i * delay, "spawn", [position])
+        elif positions:
+            self.schedule(spawnAt, "spawn", list(positions))
+        return wave
+
+    def due(
+        self,
+        now: float
+    ) -> Iterator[tuple]:
+        """Pops every entry that is due, oldest first.
+        Consecutive spawns are merged into one batch.
+
+        Args:
+            now (float): Current game time
+
+        Yields:
+            tuple: (kind, payload)
+        """
+        entries = self.entries
+        batch = []
+        while entries and entries[0][0] <= now:
+            _, _, kind, payload = heapq.heappop(entries)
+            if kind == "spawn":
+                batch.extend(payload)
+                continue
+            if batch:
+                yield "spawn", batch
+                batch = []
+            yield kind, payload
+        if batch:
+            yield "spawn", batch
+
+    def clear(self) -> None:
+        """Forgets everything that's still scheduled
+        """
+        self.entries.clear()